@@ -10,7 +10,7 @@ from skillfarm.api import skillfarm
 
 api = NinjaAPI(
     title="AA Skillfarm API",
-    version="0.5.0",
+    version="0.7.0",
     urls_namespace="skillfarm:api",
     auth=django_auth,
     openapi_url=settings.DEBUG and "/openapi.json" or "",
@@ -1,6 +1,8 @@
 # Django
 from django.core.exceptions import ObjectDoesNotExist
+from django.http import HttpResponse
 from django.template.loader import render_to_string
+from django.utils.cache import patch_cache_control
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
 
@@ -21,6 +23,30 @@ def arabic_number_to_roman(value) -> str:
         return "-"
 
 
+def is_not_modified(request, response: HttpResponse, etag: str) -> bool:
+    """
+    Set the ETag of a response and check it against `If-None-Match`
+
+    The browser has to revalidate the response on every request, an
+    unchanged response is then answered with 304 Not Modified.
+
+    Args:
+        request: Django Request Object
+        response: Temporal response of the API operation
+        etag: ETag of the current response
+    Returns:
+        True if the client already has the current response
+    """
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    # Compare weak, the GZip middleware weakens the ETag of compressed responses
+    client_etags = [
+        client_etag.strip().removeprefix("W/")
+        for client_etag in request.headers.get("If-None-Match", "").split(",")
+    ]
+    return etag in client_etags or "*" in client_etags
+
+
 def get_auth_character_or_main(request, character_id) -> tuple[bool, EveCharacter]:
     """
     Get Character and check permissions
@@ -33,7 +59,6 @@ def get_auth_character_or_main(request, character_id) -> tuple[bool, EveCharacte
     Returns:
         Tuple of (has_permissions: bool, EveCharacter)
     """
-    perms = True
     try:
         main_char = EveCharacter.objects.get(character_id=character_id)
     except EveCharacter.DoesNotExist:
@@ -44,9 +69,7 @@ def get_auth_character_or_main(request, character_id) -> tuple[bool, EveCharacte
         ).get(character_id=request.user.profile.main_character.character_id)
 
     # check access
-    visible = SkillFarmAudit.objects.visible_eve_characters(request.user)
-    if main_char not in visible:
-        perms = False
+    perms = SkillFarmAudit.objects.can_view(request.user, main_char.character_id)
     return perms, main_char
 
 
@@ -60,16 +83,13 @@ def get_skillfarm_character(request, character_id):
     Returns:
         Tuple of (has_permissions: bool, SkillFarmAudit | None)
     """
-    perms = True
     try:
         character = SkillFarmAudit.objects.get(character__character_id=character_id)
     except SkillFarmAudit.DoesNotExist:
         return False, None
 
     # check access
-    visible = SkillFarmAudit.objects.visible_to(request.user)
-    if character not in visible:
-        perms = False
+    perms = SkillFarmAudit.objects.can_view(request.user, character_id)
     return perms, character
 
 
@@ -0,0 +1,126 @@
+"""Server-side paging, sorting and filtering of the API tables."""
+
+# Standard Library
+import base64
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any
+
+# Django
+from django.db.models import F, Q, QuerySet
+
+# AA Skillfarm
+from skillfarm.api.schema import TableQuery
+
+
+class InvalidCursorError(ValueError):
+    """The cursor of a table request can not be decoded."""
+
+
+@dataclass
+class TablePage:
+    """A page of table rows with the number of rows that match the search."""
+
+    rows: list[Any]
+    records_filtered: int
+    next_cursor: str | None = None
+
+
+def encode_cursor(value: Any, pk: int) -> str:
+    """Encode the position after a row into an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps([value, pk]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[Any, int]:
+    """
+    Decode a cursor into the sort value and the pk of the last row.
+
+    Raises:
+        InvalidCursorError: If the cursor has been tampered with.
+    """
+    try:
+        value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return value, int(pk)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursorError(f"Invalid cursor {cursor!r}") from exc
+
+
+def get_query_key(query: TableQuery) -> str:
+    """Return a short key of the table request for the response cache."""
+    params = query.model_dump(exclude={"draw"})
+    return hashlib.md5(
+        json.dumps(params, sort_keys=True).encode(), usedforsecurity=False
+    ).hexdigest()
+
+
+def paginate(
+    queryset: QuerySet,
+    query: TableQuery,
+    search_fields: list[str],
+    order_fields: dict[str, list[str]],
+    cursor_field: str,
+) -> TablePage:
+    """
+    Apply the search, the order and the page of a table request to a queryset.
+
+    Only the rows of the requested page are loaded. The pk is always the last
+    order field, so rows with the same sort value keep a stable order.
+
+    The cursor pages by `cursor_field` and ignores `start` and `order`, rows
+    added or removed between two requests do not shift the following pages.
+    A next cursor is returned while more rows follow in this order.
+
+    Args:
+        queryset (QuerySet): All rows of the table.
+        query (TableQuery): The table request.
+        search_fields (list[str]): Fields searched case-insensitive.
+        order_fields (dict[str, list[str]]): Fields to order by per table column, a leading "-" reverses a field.
+        cursor_field (str): Unique enough field of the default order, used for the cursor.
+    Returns:
+        TablePage: The rows of the page.
+    Raises:
+        InvalidCursorError: If the cursor can not be decoded.
+    """
+    if query.search:
+        search = Q()
+        for field in search_fields:
+            search |= Q(**{f"{field}__icontains": query.search})
+        queryset = queryset.filter(search)
+    records_filtered = queryset.count()
+
+    queryset = queryset.annotate(cursor_value=F(cursor_field))
+    if query.cursor:
+        value, pk = decode_cursor(query.cursor)
+        queryset = queryset.filter(
+            Q(**{f"{cursor_field}__gt": value})
+            | Q(**{cursor_field: value, "pk__gt": pk})
+        ).order_by(cursor_field, "pk")
+        start = 0
+        is_cursor_order = True
+    else:
+        fields = order_fields.get(query.order, [cursor_field])
+        ordering = []
+        for field in fields:
+            # A leading "-" sorts the field against the column direction
+            descending = (query.direction == "desc") != field.startswith("-")
+            expression = F(field.removeprefix("-"))
+            ordering.append(
+                expression.desc(nulls_last=True)
+                if descending
+                else expression.asc(nulls_first=True)
+            )
+        queryset = queryset.order_by(*ordering, "pk")
+        start = query.start
+        is_cursor_order = fields == [cursor_field] and query.direction == "asc"
+
+    # Load one more row to know if another page follows
+    rows = list(queryset[start : start + query.length + 1])
+    next_cursor = None
+    if len(rows) > query.length:
+        rows = rows[: query.length]
+        if is_cursor_order:
+            next_cursor = encode_cursor(rows[-1].cursor_value, rows[-1].pk)
+    return TablePage(
+        rows=rows, records_filtered=records_filtered, next_cursor=next_cursor
+    )
@@ -47,6 +47,19 @@ def calculate_single_progress_bar(skill: CharacterSkillqueueEntry) -> float:
     return round(progress, 2)
 
 
+def calculate_sum_progress(skillqueue: list[CharacterSkillqueueEntry]) -> float:
+    """Calculate the average progress of a skillqueue"""
+    if not skillqueue:
+        return 0
+
+    total_progress_percent = sum(
+        calculate_single_progress_bar(skill)
+        for skill in skillqueue
+        if skill.finish_date is not None
+    )
+    return round(total_progress_percent / len(skillqueue), 2)
+
+
 def _calculate_sum_progress_bar(
     skillqueue_response: list["SkillFarmQueueSchema"],
 ) -> str:
@@ -1,9 +1,9 @@
 # Standard Library
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
 # Third Party
-from ninja import Schema
+from ninja import Field, Schema
 
 
 class Message(Schema):
@@ -38,3 +38,12 @@ class SkillFarm(Schema):
 class SkillFarmFilter(Schema):
     characters: list[Any]
     skills: list[Any]
+
+
+class TableQuery(Schema):
+    start: int = Field(0, ge=0)
+    length: int = Field(25, ge=1, le=100)
+    search: str = ""
+    order: str | None = None
+    direction: Literal["asc", "desc"] = "asc"
+    cursor: str | None = None
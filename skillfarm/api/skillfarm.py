@@ -2,14 +2,17 @@
 from typing import Any
 
 # Third Party
-from ninja import NinjaAPI, Schema
+from ninja import NinjaAPI, Query, Schema
 
 # Django
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.handlers.wsgi import WSGIRequest
+from django.db.models import Min, Prefetch, Q
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from django.template.loader import render_to_string
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 
@@ -31,16 +34,26 @@ from skillfarm.api.helpers.core import (
     get_alts_queryset,
     get_auth_character_or_main,
     get_skillfarm_character,
+    is_not_modified,
+)
+from skillfarm.api.helpers.paging import (
+    InvalidCursorError,
+    get_query_key,
+    paginate,
 )
 from skillfarm.api.helpers.skilldetails import (
     _calculate_sum_progress_bar,
     calculate_single_progress_bar,
+    calculate_sum_progress,
 )
-from skillfarm.api.schema import CharacterSchema
+from skillfarm.api.schema import CharacterSchema, TableQuery
 from skillfarm.helpers import lazy
+from skillfarm.helpers.api_cache import api_cache
+from skillfarm.models.helpers.update_manager import UpdateStatus
 from skillfarm.models.skillfarmaudit import (
     CharacterSkill,
     CharacterSkillqueueEntry,
+    CharacterUpdateStatus,
     SkillFarmAudit,
     SkillFarmSetup,
 )
@@ -81,6 +94,55 @@ class SkillFarmDetailsResponse(Schema):
     skill_extraction_count: int | None = None
 
 
+class OverviewDataSchema(Schema):
+    portrait_url: str
+    character: CharacterSchema
+
+
+class OverviewDataResponse(Schema):
+    characters: list[OverviewDataSchema] | None = None
+
+
+class SkillFarmDetailDataSchema(Schema):
+    update_status: str
+    update_status_description: str
+    notification: bool
+    last_update: str | None
+    extraction_ready: bool
+    extraction_ready_in_queue: bool
+    is_filter: bool
+    is_read: bool
+    is_training: bool
+    progress: float | None = None
+
+
+class SkillFarmDetailsDataSchema(Schema):
+    portrait_url: str
+    character: CharacterSchema
+    details: SkillFarmDetailDataSchema
+
+
+class SkillFarmDetailsDataResponse(Schema):
+    active_characters: list[SkillFarmDetailsDataSchema] | None = None
+    inactive_characters: list[SkillFarmDetailsDataSchema] | None = None
+    skill_extraction_count: int | None = None
+
+
+class OverviewPageResponse(Schema):
+    records_total: int
+    records_filtered: int
+    next_cursor: str | None = None
+    characters: list[OverviewDataSchema]
+
+
+class SkillFarmDetailsPageResponse(Schema):
+    records_total: int
+    records_filtered: int
+    next_cursor: str | None = None
+    skill_extraction_count: int
+    characters: list[SkillFarmDetailsDataSchema]
+
+
 class SkillFarmSetupSchema(Schema):
     character_id: int
     character_name: str
@@ -115,6 +177,26 @@ class SkillFarmInfoResponse(Schema):
     skills: list[SkillFarmSkillSchema] | None = None
 
 
+# Searched fields and order fields per table column of the paged endpoints
+OVERVIEW_SEARCH_FIELDS = [
+    "main_character__character_name",
+    "main_character__corporation_name",
+]
+OVERVIEW_ORDER_FIELDS = {
+    "character_name": ["main_character__character_name"],
+    "corporation_name": ["main_character__corporation_name"],
+}
+DETAILS_SEARCH_FIELDS = ["character__character_name"]
+DETAILS_ORDER_FIELDS = {
+    "character_name": ["character__character_name"],
+    # The queue that finishes last has the lowest progress
+    "progress": ["-queue_finish_at"],
+    "extraction": ["extraction_ready_count", "extraction_ready_in_queue"],
+    "last_update": ["last_update_finished_at"],
+    "is_filter": ["has_skillset"],
+}
+
+
 def get_skillqueue_data(skill: CharacterSkillqueueEntry):
     """Get skillqueue data for a single skill"""
     level = arabic_number_to_roman(skill.finished_level)
@@ -142,6 +224,41 @@ def get_skillqueue_data(skill: CharacterSkillqueueEntry):
     return skillqueue_response
 
 
+def get_farm_characters(
+    main,
+) -> tuple[list[SkillFarmAudit], dict[int, UpdateStatus], dict[int, str]]:
+    """
+    Get the skillfarm characters of a main with their update status.
+
+    Loads the characters, their skillqueue and the update status of all
+    characters with a constant number of queries.
+
+    Returns:
+        tuple: The characters, the update status and the last update status per character pk.
+    """
+    # Get all alts for the main character (including the main itself)
+    characters = get_alts_queryset(main)
+    skillfarm_characters = list(
+        SkillFarmAudit.objects.filter(character__in=characters)
+        .select_related("character")
+        .prefetch_related(
+            Prefetch(
+                "skillfarm_skillqueue",
+                queryset=CharacterSkillqueueEntry.objects.select_related("eve_type"),
+            )
+        )
+    )
+    # Load the update status of all characters at once
+    update_status_qs = CharacterUpdateStatus.objects.filter(
+        character__in=skillfarm_characters
+    )
+    return (
+        skillfarm_characters,
+        update_status_qs.get_statuses(),
+        update_status_qs.last_update_statuses(),
+    )
+
+
 def get_filtered_skills_data(skill: CharacterSkill) -> list[dict[str, Any]] | None:
     """Get all Skills for the current character"""
     if skill.active_skill_level == 0:
@@ -155,18 +272,376 @@ def get_filtered_skills_data(skill: CharacterSkill) -> list[dict[str, Any]] | No
     return skills_response
 
 
+def get_visible_mains(chars_visible):
+    """Get the profiles of the visible main characters"""
+    # Get Character IDs from visible Users
+    chars_ids = chars_visible.values_list("character_id", flat=True)
+    return UserProfile.objects.filter(
+        main_character__isnull=False, main_character__character_id__in=chars_ids
+    ).select_related("main_character")
+
+
+def get_overview_response(chars_visible) -> OverviewResponse:
+    """Get the overview of the visible main characters"""
+    response_characters: list[OverviewSchema] = []
+    for character in get_visible_mains(chars_visible):
+        try:
+            template = "skillfarm/partials/buttons/view.html"
+            button = format_html(
+                render_to_string(
+                    template_name=template,
+                    context={
+                        "url": reverse(
+                            "skillfarm:index",
+                            kwargs={
+                                "character_id": character.main_character.character_id
+                            },
+                        )
+                    },
+                )
+            )
+
+            portrait = lazy.get_character_portrait_url(
+                character_id=character.main_character.character_id,
+                character_name=character.main_character.character_name,
+                as_html=True,
+            )
+
+            response_characters.append(
+                OverviewSchema(
+                    portrait=portrait,
+                    character=CharacterSchema(
+                        character_id=character.main_character.character_id,
+                        character_name=character.main_character.character_name,
+                        corporation_id=character.main_character.corporation_id,
+                        corporation_name=character.main_character.corporation_name,
+                    ),
+                    action=button,
+                )
+            )
+        except AttributeError:
+            continue
+    return OverviewResponse(characters=response_characters)
+
+
+def get_overview_data_schema(profile: UserProfile) -> OverviewDataSchema:
+    """Get the overview data of a main character"""
+    return OverviewDataSchema(
+        portrait_url=lazy.get_character_portrait_url(
+            character_id=profile.main_character.character_id
+        ),
+        character=CharacterSchema(
+            character_id=profile.main_character.character_id,
+            character_name=profile.main_character.character_name,
+            corporation_id=profile.main_character.corporation_id,
+            corporation_name=profile.main_character.corporation_name,
+        ),
+    )
+
+
+def get_overview_data_response(chars_visible) -> OverviewDataResponse:
+    """Get the overview of the visible main characters without markup"""
+    response_characters: list[OverviewDataSchema] = [
+        get_overview_data_schema(profile)
+        for profile in get_visible_mains(chars_visible)
+    ]
+    return OverviewDataResponse(characters=response_characters)
+
+
+def get_overview_page_response(
+    chars_visible, query: TableQuery
+) -> OverviewPageResponse:
+    """Get a page of the visible main characters"""
+    profiles = get_visible_mains(chars_visible)
+    page = paginate(
+        profiles,
+        query,
+        search_fields=OVERVIEW_SEARCH_FIELDS,
+        order_fields=OVERVIEW_ORDER_FIELDS,
+        cursor_field="main_character__character_name",
+    )
+    return OverviewPageResponse(
+        records_total=profiles.count(),
+        records_filtered=page.records_filtered,
+        next_cursor=page.next_cursor,
+        characters=[get_overview_data_schema(profile) for profile in page.rows],
+    )
+
+
+def get_details_response(main) -> SkillFarmDetailsResponse:
+    """Get the skillfarm details of all characters of a main"""
+    skillfarm_characters, update_statuses, last_update_statuses = get_farm_characters(
+        main
+    )
+
+    active_characters: list[SkillFarmDetailsSchema] = []
+    inactive_characters: list[SkillFarmDetailsSchema] = []
+    skills_ready = 0
+
+    for character in skillfarm_characters:
+        char_portrait = lazy.get_character_portrait_url(
+            character_id=character.character.character_id,
+            character_name=character.character.character_name,
+            as_html=True,
+        )
+
+        update_status = update_statuses.get(character.pk, UpdateStatus.INCOMPLETE)
+        char = f"{char_portrait} {character.character.character_name} {update_status.bootstrap_icon()} - {character.notification_icon}"
+        is_training = character.is_training_active
+
+        # Create the skillfarm action buttons
+        actions = []
+        actions.append(generate_skillinfo_button(character=character))
+        actions.append(generate_toggle_notification_button(character=character))
+        actions.append(generate_edit_skillsetup_button(character=character))
+        actions.append(generate_delete_character_button(character=character))
+        if is_training is False or character.is_read is True:
+            actions.append(generate_mark_as_read_character_button(character=character))
+        actions_html = format_html(
+            f'<div class="d-flex justify-content-end">{format_html("".join(actions))}</div>'
+        )
+
+        skillfarm_details = SkillFarmDetailsSchema(
+            character=CharacterSchema(
+                character_html=char,
+                character_id=character.character.character_id,
+                character_name=character.character.character_name,
+            ),
+            details=SkillFarmDetailSchema(
+                update_status=update_status,
+                notification=character.notification,
+                last_update=last_update_statuses.get(
+                    character.pk,
+                    UpdateStatus.description(UpdateStatus.INCOMPLETE),
+                ),
+                is_extraction_ready=character.extraction_icon,
+                is_filter=generate_status_icon_html(character=character),
+                is_read=character.is_read,
+            ),
+            actions=actions_html,
+        )
+
+        # Generate the progress bar for the skill queue
+        if is_training is False:
+            skillfarm_details.details.progress = str(_("No Active Training"))
+            inactive_characters.append(skillfarm_details)
+        else:
+            skillqueue_response: list[SkillFarmQueueSchema] = []
+            # Get skillqueue data for each skill
+            c_skillqueue = character.skillfarm_skillqueue.all()
+            for skill in c_skillqueue:  # retrieve all skillqueue entries from character
+                skillqueue_response.append(get_skillqueue_data(skill))
+
+            # Calculate sum progress bar
+            skillfarm_details.details.progress = _calculate_sum_progress_bar(
+                skillqueue_response=skillqueue_response
+            )
+            active_characters.append(skillfarm_details)
+
+        # Count skills ready for extraction
+        if character.extraction_ready_count or character.extraction_ready_in_queue:
+            skills_ready += 1
+
+    return SkillFarmDetailsResponse(
+        active_characters=active_characters,
+        inactive_characters=inactive_characters,
+        skill_extraction_count=skills_ready,
+    )
+
+
+def get_details_data_schema(
+    character: SkillFarmAudit,
+    update_statuses: dict[int, UpdateStatus],
+    last_update_statuses: dict[int, str],
+) -> SkillFarmDetailsDataSchema:
+    """Get the skillfarm details of a character without markup"""
+    update_status = update_statuses.get(character.pk, UpdateStatus.INCOMPLETE)
+    is_training = character.is_training_active
+
+    skillfarm_details = SkillFarmDetailsDataSchema(
+        portrait_url=lazy.get_character_portrait_url(
+            character_id=character.character.character_id
+        ),
+        character=CharacterSchema(
+            character_id=character.character.character_id,
+            character_name=character.character.character_name,
+        ),
+        details=SkillFarmDetailDataSchema(
+            update_status=update_status,
+            update_status_description=str(update_status.description()),
+            notification=character.notification,
+            last_update=last_update_statuses.get(
+                character.pk,
+                str(UpdateStatus.description(UpdateStatus.INCOMPLETE)),
+            ),
+            extraction_ready=character.extraction_ready_count > 0,
+            extraction_ready_in_queue=character.extraction_ready_in_queue > 0,
+            is_filter=character.is_filtered,
+            is_read=character.is_read,
+            is_training=is_training,
+        ),
+    )
+    if is_training is True:
+        skillfarm_details.details.progress = calculate_sum_progress(
+            list(character.skillfarm_skillqueue.all())
+        )
+    return skillfarm_details
+
+
+def get_details_data_response(main) -> SkillFarmDetailsDataResponse:
+    """Get the skillfarm details of all characters of a main without markup"""
+    skillfarm_characters, update_statuses, last_update_statuses = get_farm_characters(
+        main
+    )
+
+    active_characters: list[SkillFarmDetailsDataSchema] = []
+    inactive_characters: list[SkillFarmDetailsDataSchema] = []
+    skills_ready = 0
+
+    for character in skillfarm_characters:
+        skillfarm_details = get_details_data_schema(
+            character, update_statuses, last_update_statuses
+        )
+        if skillfarm_details.details.is_training is False:
+            inactive_characters.append(skillfarm_details)
+        else:
+            active_characters.append(skillfarm_details)
+
+        # Count skills ready for extraction
+        if character.extraction_ready_count or character.extraction_ready_in_queue:
+            skills_ready += 1
+
+    return SkillFarmDetailsDataResponse(
+        active_characters=active_characters,
+        inactive_characters=inactive_characters,
+        skill_extraction_count=skills_ready,
+    )
+
+
+def get_details_page_response(
+    main, query: TableQuery, training: bool | None = None
+) -> SkillFarmDetailsPageResponse:
+    """
+    Get a page of the skillfarm details of the characters of a main
+
+    The search, the order and the page are applied in the database, only
+    the characters of the page are loaded with their skillqueue.
+
+    Args:
+        main: Main character of the skillfarm
+        query: The table request
+        training: Only characters with (True) or without (False) active training
+    Returns:
+        SkillFarmDetailsPageResponse: The characters of the page
+    """
+    characters = SkillFarmAudit.objects.filter(character__in=get_alts_queryset(main))
+    skills_ready = characters.filter(
+        Q(extraction_ready_count__gt=0) | Q(extraction_ready_in_queue__gt=0)
+    ).count()
+    if training is not None:
+        is_training = Q(is_training=True, queue_finish_at__gt=timezone.now())
+        characters = characters.filter(is_training if training else ~is_training)
+
+    page = paginate(
+        characters.annotate(
+            last_update_finished_at=Min(
+                "skillfarm_update_status__last_update_finished_at"
+            )
+        )
+        .select_related("character")
+        .prefetch_related(
+            Prefetch(
+                "skillfarm_skillqueue",
+                queryset=CharacterSkillqueueEntry.objects.select_related("eve_type"),
+            )
+        ),
+        query,
+        search_fields=DETAILS_SEARCH_FIELDS,
+        order_fields=DETAILS_ORDER_FIELDS,
+        cursor_field="character__character_name",
+    )
+    # Load the update status of the page characters at once
+    update_status_qs = CharacterUpdateStatus.objects.filter(character__in=page.rows)
+    update_statuses = update_status_qs.get_statuses()
+    last_update_statuses = update_status_qs.last_update_statuses()
+
+    return SkillFarmDetailsPageResponse(
+        records_total=characters.count(),
+        records_filtered=page.records_filtered,
+        next_cursor=page.next_cursor,
+        skill_extraction_count=skills_ready,
+        characters=[
+            get_details_data_schema(character, update_statuses, last_update_statuses)
+            for character in page.rows
+        ],
+    )
+
+
+def get_skillqueue_response(character: SkillFarmAudit) -> SkillFarmInfoResponse:
+    """Get the skills and the skillqueue of a character"""
+    response_skillqueue: list[SkillFarmQueueSchema] = []
+    response_skillqueue_filtered: list[SkillFarmQueueSchema] = []
+    c_skillqueue = character.skillfarm_skillqueue.all().select_related("eve_type")
+    # retrieve all skillqueue entries from character
+    for skill in c_skillqueue:
+        # Get skillqueue data for each skill
+        skillqueue_response = get_skillqueue_data(skill)
+        # Check if skill is filtered
+        if character.is_filtered:
+            response_skillqueue_filtered.append(skillqueue_response)
+        else:
+            response_skillqueue.append(skillqueue_response)
+
+    response_skills: list[SkillFarmSkillSchema] = []
+
+    is_training = character.is_training_active
+    # Get all Skills for the current character
+    try:
+        skillsetup = character.skillfarm_setup
+    except ObjectDoesNotExist:
+        skillsetup = None
+
+    if (character.is_filtered and skillsetup is not None) or is_training is False:
+        # retrieve all skill entries from character
+        c_skills = character.skillfarm_skills.all().select_related("eve_type")
+        c_skillsetup = skillsetup.skillset_type_ids if skillsetup is not None else []
+        for skill in c_skills:
+            if is_training is True and skill.eve_type_id in c_skillsetup:
+                # Get skill data for each skill
+                skill_data = get_filtered_skills_data(skill)
+                if skill_data is not None:
+                    response_skills.append(skill_data)
+            elif is_training is False:
+                skill_data = get_filtered_skills_data(skill)
+                if skill_data is not None:
+                    response_skills.append(skill_data)
+
+    return SkillFarmInfoResponse(
+        title=str(_("Skill Info")),
+        character=CharacterSchema(
+            character_id=character.character.character_id,
+            character_name=character.character.character_name,
+        ),
+        skillqueue=response_skillqueue,
+        skillqueue_filtered=response_skillqueue_filtered,
+        skills=response_skills,
+    )
+
+
 class SkillFarmApiEndpoints:
     tags = ["SkillFarm"]
 
-    # pylint: disable=too-many-statements, too-many-locals
+    # pylint: disable=too-many-statements
     def __init__(self, api: NinjaAPI):
 
         @api.get(
-            "/overview/", response={200: OverviewResponse, 403: dict}, tags=self.tags
+            "/overview/",
+            response={200: OverviewResponse, 304: None, 403: dict},
+            tags=self.tags,
         )
         def get_character_overview(
-            request: WSGIRequest,
-        ) -> OverviewResponse | tuple[int, dict]:
+            request: WSGIRequest, response: HttpResponse
+        ) -> OverviewResponse | tuple[int, dict | None]:
             """Get Character SkillFarm Overview"""
             logger.info(f"User {request.user} requested SkillFarm overview.")
             # Get visible characters
@@ -179,64 +654,31 @@ class SkillFarmApiEndpoints:
                 )
                 return 403, {"error": "Permission Denied"}
 
-            # Get Character IDs from visible Users
-            chars_ids = chars_visible.values_list("character_id", flat=True)
-            characters = UserProfile.objects.filter(
-                main_character__isnull=False, main_character__character_id__in=chars_ids
-            ).select_related("main_character")
-
-            response_characters: list[OverviewSchema] = []
-            for character in characters:
-                try:
-                    template = "skillfarm/partials/buttons/view.html"
-                    button = format_html(
-                        render_to_string(
-                            template_name=template,
-                            context={
-                                "url": reverse(
-                                    "skillfarm:index",
-                                    kwargs={
-                                        "character_id": character.main_character.character_id
-                                    },
-                                )
-                            },
-                        )
-                    )
-
-                    portrait = lazy.get_character_portrait_url(
-                        character_id=character.main_character.character_id,
-                        character_name=character.main_character.character_name,
-                        as_html=True,
-                    )
-
-                    response_characters.append(
-                        OverviewSchema(
-                            portrait=portrait,
-                            character=CharacterSchema(
-                                character_id=character.main_character.character_id,
-                                character_name=character.main_character.character_name,
-                                corporation_id=character.main_character.corporation_id,
-                                corporation_name=character.main_character.corporation_name,
-                            ),
-                            action=button,
-                        )
-                    )
-                except AttributeError:
-                    continue
-
+            scope = api_cache.OVERVIEW_SCOPE
+            etag = api_cache.get_etag("overview", request.user.pk, 0, scope)
+            if is_not_modified(request, response, etag):
+                return 304, None
+
+            data = api_cache.get_or_set(
+                endpoint="overview",
+                user_id=request.user.pk,
+                target=0,
+                scope=scope,
+                compute=lambda: get_overview_response(chars_visible),
+            )
             logger.info(
-                f"User {request.user} successfully retrieved SkillFarm overview with {len(response_characters)} characters."
+                f"User {request.user} successfully retrieved SkillFarm overview."
             )
-            return OverviewResponse(characters=response_characters)
+            return data
 
         @api.get(
             "{character_id}/details/",
-            response={200: SkillFarmDetailsResponse, 403: dict},
+            response={200: SkillFarmDetailsResponse, 304: None, 403: dict},
             tags=self.tags,
         )
         def get_details(
-            request: WSGIRequest, character_id: int
-        ) -> SkillFarmDetailsResponse | tuple[int, dict]:
+            request: WSGIRequest, response: HttpResponse, character_id: int
+        ) -> SkillFarmDetailsResponse | tuple[int, dict | None]:
             """Get Character SkillFarm Details"""
             logger.info(
                 f"User {request.user} requested SkillFarm details for character ID {character_id}."
@@ -251,98 +693,196 @@ class SkillFarmApiEndpoints:
                 )
                 return 403, {"error": "Permission Denied"}
 
-            # Get all alts for the main character (including the main itself)
-            characters = get_alts_queryset(main)
-            skillfarm_characters = (
-                SkillFarmAudit.objects.filter(character__in=characters)
-                .select_related("character")
-                .prefetch_related("skillfarm_skills", "skillfarm_skillqueue")
+            scope = api_cache.character_scope(main)
+            etag = api_cache.get_etag(
+                "details", request.user.pk, main.character_id, scope
             )
+            if is_not_modified(request, response, etag):
+                return 304, None
+
+            data = api_cache.get_or_set(
+                endpoint="details",
+                user_id=request.user.pk,
+                target=main.character_id,
+                scope=scope,
+                compute=lambda: get_details_response(main),
+            )
+            logger.info(
+                f"User {request.user} successfully retrieved SkillFarm details for character ID {character_id}."
+            )
+            return data
 
-            active_characters: list[SkillFarmDetailsSchema] = []
-            inactive_characters: list[SkillFarmDetailsSchema] = []
-            skills_ready = 0
+        @api.get(
+            "v2/overview/",
+            response={200: OverviewDataResponse, 304: None, 403: dict},
+            tags=self.tags,
+        )
+        def get_character_overview_data(
+            request: WSGIRequest, response: HttpResponse
+        ) -> OverviewDataResponse | tuple[int, dict | None]:
+            """Get Character SkillFarm Overview without markup"""
+            logger.info(f"User {request.user} requested SkillFarm overview data.")
+            # Get visible characters
+            chars_visible = SkillFarmAudit.objects.visible_eve_characters(request.user)
 
-            for character in skillfarm_characters:
-                char_portrait = lazy.get_character_portrait_url(
-                    character_id=character.character.character_id,
-                    character_name=character.character.character_name,
-                    as_html=True,
+            # Check permissions
+            if chars_visible is None:
+                logger.warning(
+                    f"User {request.user} tried to access SkillFarm overview data without permissions."
                 )
+                return 403, {"error": "Permission Denied"}
 
-                update_status = character.skillfarm_update_status.get_status()
-                char = f"{char_portrait} {character.character.character_name} {update_status.bootstrap_icon()} - {character.notification_icon}"
-                is_training = (
-                    character.skillfarm_skillqueue.skill_in_training().exists()
-                )
+            scope = api_cache.OVERVIEW_SCOPE
+            etag = api_cache.get_etag("overview_data", request.user.pk, 0, scope)
+            if is_not_modified(request, response, etag):
+                return 304, None
+
+            data = api_cache.get_or_set(
+                endpoint="overview_data",
+                user_id=request.user.pk,
+                target=0,
+                scope=scope,
+                compute=lambda: get_overview_data_response(chars_visible),
+            )
+            logger.info(
+                f"User {request.user} successfully retrieved SkillFarm overview data."
+            )
+            return data
+
+        @api.get(
+            "v2/{character_id}/details/",
+            response={200: SkillFarmDetailsDataResponse, 304: None, 403: dict},
+            tags=self.tags,
+        )
+        def get_details_data(
+            request: WSGIRequest, response: HttpResponse, character_id: int
+        ) -> SkillFarmDetailsDataResponse | tuple[int, dict | None]:
+            """Get Character SkillFarm Details without markup"""
+            logger.info(
+                f"User {request.user} requested SkillFarm details data for character ID {character_id}."
+            )
+            # Get Main Character and check permissions
+            perm, main = get_auth_character_or_main(request, character_id)
 
-                # Create the skillfarm action buttons
-                actions = []
-                actions.append(generate_skillinfo_button(character=character))
-                actions.append(generate_toggle_notification_button(character=character))
-                actions.append(generate_edit_skillsetup_button(character=character))
-                actions.append(generate_delete_character_button(character=character))
-                if is_training is False or character.is_read is True:
-                    actions.append(
-                        generate_mark_as_read_character_button(character=character)
-                    )
-                actions_html = format_html(
-                    f'<div class="d-flex justify-content-end">{format_html("".join(actions))}</div>'
+            # Check permissions
+            if perm is False:
+                logger.warning(
+                    f"User {request.user} tried to access SkillFarm details data for character ID {character_id} without permissions."
                 )
+                return 403, {"error": "Permission Denied"}
 
-                skillfarm_details = SkillFarmDetailsSchema(
-                    character=CharacterSchema(
-                        character_html=char,
-                        character_id=character.character.character_id,
-                        character_name=character.character.character_name,
-                    ),
-                    details=SkillFarmDetailSchema(
-                        update_status=update_status,
-                        notification=character.notification,
-                        last_update=character.skillfarm_update_status.last_update_status(),
-                        is_extraction_ready=character.extraction_icon,
-                        is_filter=generate_status_icon_html(character=character),
-                        is_read=character.is_read,
-                    ),
-                    actions=actions_html,
+            scope = api_cache.character_scope(main)
+            etag = api_cache.get_etag(
+                "details_data", request.user.pk, main.character_id, scope
+            )
+            if is_not_modified(request, response, etag):
+                return 304, None
+
+            data = api_cache.get_or_set(
+                endpoint="details_data",
+                user_id=request.user.pk,
+                target=main.character_id,
+                scope=scope,
+                compute=lambda: get_details_data_response(main),
+            )
+            logger.info(
+                f"User {request.user} successfully retrieved SkillFarm details data for character ID {character_id}."
+            )
+            return data
+
+        @api.get(
+            "v2/overview/page/",
+            response={200: OverviewPageResponse, 304: None, 400: dict, 403: dict},
+            tags=self.tags,
+        )
+        def get_character_overview_page(
+            request: WSGIRequest, response: HttpResponse, query: Query[TableQuery]
+        ) -> OverviewPageResponse | tuple[int, dict | None]:
+            """Get a page of the Character SkillFarm Overview"""
+            logger.info(f"User {request.user} requested SkillFarm overview page.")
+            # Get visible characters
+            chars_visible = SkillFarmAudit.objects.visible_eve_characters(request.user)
+
+            # Check permissions
+            if chars_visible is None:
+                logger.warning(
+                    f"User {request.user} tried to access SkillFarm overview page without permissions."
                 )
+                return 403, {"error": "Permission Denied"}
 
-                # Generate the progress bar for the skill queue
-                if is_training is False:
-                    skillfarm_details.details.progress = str(_("No Active Training"))
-                    inactive_characters.append(skillfarm_details)
-                else:
-                    skillqueue_response: list[SkillFarmQueueSchema] = []
-                    # Get skillqueue data for each skill
-                    c_skillqueue = character.skillfarm_skillqueue.all().select_related(
-                        "eve_type"
-                    )
-                    for (
-                        skill
-                    ) in c_skillqueue:  # retrieve all skillqueue entries from character
-                        skillqueue_response.append(get_skillqueue_data(skill))
-
-                    # Calculate sum progress bar
-                    skillfarm_details.details.progress = _calculate_sum_progress_bar(
-                        skillqueue_response=skillqueue_response
-                    )
-                    active_characters.append(skillfarm_details)
-
-                # Count skills ready for extraction
-                if (
-                    character.skillfarm_skills.extractions(character).exists()
-                    or character.skillfarm_skillqueue.extractions(character).exists()
-                ):
-                    skills_ready += 1
+            target = get_query_key(query)
+            etag = api_cache.get_etag(
+                "overview_page", request.user.pk, target, api_cache.OVERVIEW_SCOPE
+            )
+            if is_not_modified(request, response, etag):
+                return 304, None
 
+            try:
+                data = api_cache.get_or_set(
+                    endpoint="overview_page",
+                    user_id=request.user.pk,
+                    target=target,
+                    scope=api_cache.OVERVIEW_SCOPE,
+                    compute=lambda: get_overview_page_response(chars_visible, query),
+                )
+            except InvalidCursorError:
+                return 400, {"error": "Invalid cursor"}
             logger.info(
-                f"User {request.user} successfully retrieved SkillFarm details for character ID {character_id}."
+                f"User {request.user} successfully retrieved SkillFarm overview page."
             )
-            return SkillFarmDetailsResponse(
-                active_characters=active_characters,
-                inactive_characters=inactive_characters,
-                skill_extraction_count=skills_ready,
+            return data
+
+        @api.get(
+            "v2/{character_id}/details/page/",
+            response={
+                200: SkillFarmDetailsPageResponse,
+                304: None,
+                400: dict,
+                403: dict,
+            },
+            tags=self.tags,
+        )
+        def get_details_page(
+            request: WSGIRequest,
+            response: HttpResponse,
+            character_id: int,
+            query: Query[TableQuery],
+            training: bool | None = None,
+        ) -> SkillFarmDetailsPageResponse | tuple[int, dict | None]:
+            """Get a page of the Character SkillFarm Details"""
+            logger.info(
+                f"User {request.user} requested SkillFarm details page for character ID {character_id}."
             )
+            # Get Main Character and check permissions
+            perm, main = get_auth_character_or_main(request, character_id)
+
+            # Check permissions
+            if perm is False:
+                logger.warning(
+                    f"User {request.user} tried to access SkillFarm details page for character ID {character_id} without permissions."
+                )
+                return 403, {"error": "Permission Denied"}
+
+            scope = api_cache.character_scope(main)
+            target = f"{main.character_id}:{training}:{get_query_key(query)}"
+            etag = api_cache.get_etag("details_page", request.user.pk, target, scope)
+            if is_not_modified(request, response, etag):
+                return 304, None
+
+            try:
+                data = api_cache.get_or_set(
+                    endpoint="details_page",
+                    user_id=request.user.pk,
+                    target=target,
+                    scope=scope,
+                    compute=lambda: get_details_page_response(main, query, training),
+                )
+            except InvalidCursorError:
+                return 400, {"error": "Invalid cursor"}
+            logger.info(
+                f"User {request.user} successfully retrieved SkillFarm details page for character ID {character_id}."
+            )
+            return data
 
         @api.get(
             "{character_id}/skillsetup/",
@@ -382,10 +922,10 @@ class SkillFarmApiEndpoints:
 
         @api.get(
             "{character_id}/skillqueue/",
-            response={200: SkillFarmInfoResponse, 403: dict},
+            response={200: SkillFarmInfoResponse, 304: None, 403: dict},
             tags=self.tags,
         )
-        def get_skillqueue(request, character_id: int):
+        def get_skillqueue(request, response: HttpResponse, character_id: int):
             """Get Character Skills and SkillQueue"""
             logger.info(
                 f"User {request.user} requested SkillFarm skill info for character ID {character_id}."
@@ -399,58 +939,21 @@ class SkillFarmApiEndpoints:
                 )
                 return 403, {"error": "Permission Denied"}
 
-            response_skillqueue: list[SkillFarmQueueSchema] = []
-            response_skillqueue_filtered: list[SkillFarmQueueSchema] = []
-            c_skillqueue = character.skillfarm_skillqueue.all().select_related(
-                "eve_type"
+            scope = api_cache.character_scope(character.character)
+            etag = api_cache.get_etag(
+                "skillqueue", request.user.pk, character.character.character_id, scope
+            )
+            if is_not_modified(request, response, etag):
+                return 304, None
+
+            data = api_cache.get_or_set(
+                endpoint="skillqueue",
+                user_id=request.user.pk,
+                target=character.character.character_id,
+                scope=scope,
+                compute=lambda: get_skillqueue_response(character),
             )
-            # retrieve all skillqueue entries from character
-            for skill in c_skillqueue:
-                # Get skillqueue data for each skill
-                skillqueue_response = get_skillqueue_data(skill)
-                # Check if skill is filtered
-                if character.is_filtered:
-                    response_skillqueue_filtered.append(skillqueue_response)
-                else:
-                    response_skillqueue.append(skillqueue_response)
-
-            response_skills: list[SkillFarmSkillSchema] = []
-
-            is_training = character.skillfarm_skillqueue.skill_in_training().exists()
-            # Get all Skills for the current character
-            try:
-                skillsetup = character.skillfarm_setup
-            except ObjectDoesNotExist:
-                skillsetup = None
-
-            if (
-                character.is_filtered and skillsetup is not None
-            ) or is_training is False:
-                # retrieve all skill entries from character
-                c_skills = character.skillfarm_skills.all().select_related("eve_type")
-                c_skillsetup = (
-                    character.skillfarm_setup.skillset if skillsetup is not None else []
-                )
-                for skill in c_skills:
-                    if is_training is True and skill.eve_type.name in c_skillsetup:
-                        # Get skill data for each skill
-                        skill_data = get_filtered_skills_data(skill)
-                        if skill_data is not None:
-                            response_skills.append(skill_data)
-                    elif is_training is False:
-                        skill_data = get_filtered_skills_data(skill)
-                        if skill_data is not None:
-                            response_skills.append(skill_data)
             logger.info(
                 f"User {request.user} successfully retrieved SkillFarm skill info for character ID {character_id}."
             )
-            return SkillFarmInfoResponse(
-                title=str(_("Skill Info")),
-                character=CharacterSchema(
-                    character_id=character.character.character_id,
-                    character_name=character.character.character_name,
-                ),
-                skillqueue=response_skillqueue,
-                skillqueue_filtered=response_skillqueue_filtered,
-                skills=response_skills,
-            )
+            return data
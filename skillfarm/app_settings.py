@@ -21,6 +21,19 @@ SKILLFARM_BULK_METHODS_BATCH_SIZE = getattr(
     settings, "SKILLFARM_BULK_METHODS_BATCH_SIZE", 500
 )
 
+# Number of characters updated together in one section task
+SKILLFARM_TASKS_BATCH_SIZE = getattr(settings, "SKILLFARM_TASKS_BATCH_SIZE", 50)
+
+# Max concurrent ESI requests within one batch task
+SKILLFARM_ESI_CONCURRENCY = getattr(settings, "SKILLFARM_ESI_CONCURRENCY", 10)
+
+# Run the section tasks of a single character in parallel instead of one after another
+SKILLFARM_PARALLEL_SECTIONS = getattr(settings, "SKILLFARM_PARALLEL_SECTIONS", True)
+
+# Celery queue per task lane (interactive, scheduled, notifications, prices),
+# lanes without a queue use the default Celery queue
+SKILLFARM_TASK_QUEUES = getattr(settings, "SKILLFARM_TASK_QUEUES", {})
+
 # Set Notification Cooldown in Days
 SKILLFARM_NOTIFICATION_COOLDOWN = getattr(
     settings, "SKILLFARM_NOTIFICATION_COOLDOWN", 3
@@ -31,6 +44,36 @@ SKILLFARM_TASKS_TIME_LIMIT = getattr(settings, "SKILLFARM_TASKS_TIME_LIMIT", 720
 # Price Source default is Jita
 SKILLFARM_PRICE_SOURCE_ID = getattr(settings, "SKILLFARM_PRICE_SOURCE_ID", 60003760)
 
+# Max ESI requests per second for all workers, 0 disables the pacing
+SKILLFARM_ESI_RATE_LIMIT = getattr(settings, "SKILLFARM_ESI_RATE_LIMIT", 20)
+
+# Pause all ESI requests when the remaining ESI error budget drops to this value
+SKILLFARM_ESI_ERROR_BUDGET_MIN = getattr(settings, "SKILLFARM_ESI_ERROR_BUDGET_MIN", 20)
+
+# Open the ESI circuit breaker after this many ESI outage errors within a minute
+SKILLFARM_ESI_BREAKER_THRESHOLD = getattr(
+    settings, "SKILLFARM_ESI_BREAKER_THRESHOLD", 5
+)
+
+# Time in seconds the ESI circuit breaker stays open before probe requests are allowed
+SKILLFARM_ESI_BREAKER_COOLDOWN = getattr(
+    settings, "SKILLFARM_ESI_BREAKER_COOLDOWN", 300
+)
+
+# Max time in minutes between two updates of a section,
+# characters are refreshed earlier when a skill in their queue finishes
+SKILLFARM_MAX_UPDATE_INTERVAL = getattr(settings, "SKILLFARM_MAX_UPDATE_INTERVAL", 360)
+
+# Time in seconds the API responses are cached, 0 disables the cache,
+# the responses are invalidated earlier when a character is updated
+SKILLFARM_API_CACHE_TIMEOUT = getattr(settings, "SKILLFARM_API_CACHE_TIMEOUT", 300)
+
+# Time in seconds the visible characters of a user are cached, 0 disables the cache,
+# the cache is invalidated earlier when permissions or characters of a user change
+SKILLFARM_VISIBILITY_CACHE_TIMEOUT = getattr(
+    settings, "SKILLFARM_VISIBILITY_CACHE_TIMEOUT", 3600
+)
+
 SKILLFARM_STALE_TYPES = {
     "skills": 30,
     "skillqueue": 30,
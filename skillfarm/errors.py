@@ -3,3 +3,11 @@
 
 class DownTimeError(Exception):
     """Custom exception to indicate ESI is in daily downtime."""
+
+
+class ESICircuitOpenError(Exception):
+    """Custom exception to indicate the ESI circuit breaker is open."""
+
+    def __init__(self, reset: float):
+        self.reset = reset
+        super().__init__(f"ESI circuit breaker is open. Retry in {reset:.0f} seconds.")
@@ -0,0 +1,130 @@
+"""Versioned cache of the API responses."""
+
+# Standard Library
+import hashlib
+import time
+from collections.abc import Callable
+
+# Third Party
+from ninja import Schema
+
+# Django
+from django.core.cache import cache
+
+# Alliance Auth
+from allianceauth.services.hooks import get_extension_logger
+
+# AA Skillfarm
+from skillfarm import __title__, app_settings
+from skillfarm.providers import AppLogger
+
+logger = AppLogger(my_logger=get_extension_logger(__name__), prefix=__title__)
+
+
+class ApiResponseCache:
+    """
+    Cache the API responses per requesting user and target.
+
+    Every response belongs to a scope, e.g. all characters of one owner.
+    The scope version is part of the cache key, bumping the version
+    invalidates all cached responses of the scope at once without having
+    to know their keys. Scopes that are not bumped expire with the timeout.
+    """
+
+    RESPONSE_KEY = "skillfarm:api_cache:{endpoint}:{user_id}:{target}:{version}"
+    VERSION_KEY = "skillfarm:api_cache:version:{scope}"
+    OVERVIEW_SCOPE = "overview"
+    # Seconds an ETag stays valid, the responses contain relative times,
+    # progress and training states that change without a write
+    ETAG_WINDOW = 300
+
+    @staticmethod
+    def owner_scope(user_id: int | None) -> str:
+        """Return the scope of the characters owned by a user."""
+        return f"owner:{user_id}"
+
+    def character_scope(self, eve_character) -> str:
+        """Return the scope of the owner of an EveCharacter."""
+        ownership = getattr(eve_character, "character_ownership", None)
+        return self.owner_scope(ownership.user_id if ownership else None)
+
+    def get_version(self, scope: str) -> int:
+        """Return the current version of a scope."""
+        key = self.VERSION_KEY.format(scope=scope)
+        version = cache.get(key)
+        if version is None:
+            # Start at the current time, so an evicted version never
+            # matches the version of a response that is still cached
+            cache.add(key, time.time_ns(), timeout=None)
+            version = cache.get(key)
+        return version
+
+    def bump(self, *scopes: str) -> None:
+        """Invalidate all cached responses of the given scopes."""
+        for scope in scopes:
+            key = self.VERSION_KEY.format(scope=scope)
+            cache.add(key, time.time_ns(), timeout=None)
+            try:
+                cache.incr(key)
+            except ValueError:
+                # The version has been evicted in between
+                pass
+            logger.debug("Invalidated API cache scope %s", scope)
+
+    def get_etag(
+        self, endpoint: str, user_id: int, target: int | str, scope: str
+    ) -> str:
+        """
+        Return the ETag of a response without building it.
+
+        The ETag changes with the scope version and after each ETAG_WINDOW,
+        it does not depend on the response cache and also validates
+        responses while the cache is disabled.
+        """
+        window = int(time.time() // self.ETAG_WINDOW)
+        digest = hashlib.md5(
+            f"{endpoint}:{user_id}:{target}:{self.get_version(scope)}:{window}".encode(),
+            usedforsecurity=False,
+        ).hexdigest()
+        return f'"{digest}"'
+
+    def get_or_set(
+        self,
+        endpoint: str,
+        user_id: int,
+        target: int | str,
+        scope: str,
+        compute: Callable[[], Schema],
+    ) -> Schema | dict:
+        """
+        Return the cached response or compute and cache it.
+
+        Args:
+            endpoint (str): Name of the API endpoint.
+            user_id (int): ID of the requesting user.
+            target (int | str): The requested character id or table page.
+            scope (str): Scope the response depends on.
+            compute (Callable): Builds the response schema on a cache miss.
+        Returns:
+            Schema | dict: The computed schema or the cached response data.
+        """
+        timeout = app_settings.SKILLFARM_API_CACHE_TIMEOUT
+        if not timeout:
+            return compute()
+
+        key = self.RESPONSE_KEY.format(
+            endpoint=endpoint,
+            user_id=user_id,
+            target=target,
+            version=self.get_version(scope),
+        )
+        response = cache.get(key)
+        if response is not None:
+            return response
+
+        response = compute()
+        cache.set(key, response.model_dump(), timeout=timeout)
+        return response
+
+
+api_cache = ApiResponseCache()
@@ -0,0 +1,123 @@
+"""Concurrent ESI fetch engine for the character sections."""
+
+# Standard Library
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any
+
+# Django
+from django.db import connections
+
+# Alliance Auth
+from allianceauth.eveonline.models import Token
+from allianceauth.services.hooks import get_extension_logger
+from esi.errors import TokenError
+
+# AA Skillfarm
+from skillfarm import __title__, app_settings
+from skillfarm.models.helpers.update_manager import CharacterUpdateSection
+from skillfarm.models.skillfarmaudit import SkillFarmAudit
+from skillfarm.providers import AppLogger, get_esi_retry_info
+
+logger = AppLogger(my_logger=get_extension_logger(__name__), prefix=__title__)
+
+
+def _run_limited(jobs: list[Callable[[], Any]], limit: int) -> list[Any]:
+    """
+    Run blocking jobs in threads with at most `limit` jobs in flight.
+
+    A limit of 1 runs the jobs inline in the calling thread. Exceptions are returned as results. After the first retryable ESI error
+    the jobs that did not start yet return that error instead of running,
+    so we stop hitting ESI while it is limited or down.
+    """
+    retry_errors: list[Exception] = []
+
+    def run(job: Callable[[], Any]) -> Any:
+        if retry_errors:
+            return retry_errors[0]
+        try:
+            return job()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            if get_esi_retry_info(exc) is not None:
+                retry_errors.append(exc)
+            return exc
+
+    if limit <= 1:
+        return [run(job) for job in jobs]
+
+    def run_in_thread(job: Callable[[], Any]) -> Any:
+        try:
+            return run(job)
+        finally:
+            # The ESI client checks the token scopes, close the thread connection
+            connections.close_all()
+
+    with ThreadPoolExecutor(max_workers=limit) as executor:
+        return list(executor.map(run_in_thread, jobs))
+
+
+def fetch_characters_sections(
+    characters: list[SkillFarmAudit],
+    sections: list[CharacterUpdateSection],
+    force_refresh: bool = False,
+    limit: int = None,
+    tokens: dict[int, Token] = None,
+) -> dict[CharacterUpdateSection, dict[SkillFarmAudit, Any]]:
+    """
+    Fetch the ESI data of several sections for many characters concurrently.
+
+    Tokens are resolved for all characters at once and refreshed upfront in
+    the calling thread, so the worker threads only run the ESI requests.
+
+    Args:
+        characters (list[SkillFarmAudit]): Characters with `character` selected.
+        sections (list[CharacterUpdateSection]): Sections to fetch.
+        force_refresh (bool): Whether to force a refresh of the data.
+        limit (int): Max concurrent ESI requests, defaults to `SKILLFARM_ESI_CONCURRENCY`.
+        tokens (dict[int, Token]): Prefetched tokens per character pk, see `SkillFarmAudit.get_tokens()`.
+    Returns:
+        dict: The fetched items or the raised exception per section and character.
+    """
+    if limit is None:
+        limit = app_settings.SKILLFARM_ESI_CONCURRENCY
+
+    if tokens is None:
+        tokens = SkillFarmAudit.get_tokens(characters)
+
+    fetched = {section: {} for section in sections}
+    jobs = []
+    keys = []
+    for character in characters:
+        try:
+            token = tokens.get(character.pk)
+            if token is None:
+                raise TokenError(
+                    f"Token does not exist for {character} with scopes {SkillFarmAudit.get_esi_scopes()}"
+                )
+            token.valid_access_token()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            for section in sections:
+                fetched[section][character] = exc
+            continue
+
+        for section in sections:
+            manager = SkillFarmAudit.get_section_manager(section)
+            jobs.append(
+                partial(
+                    manager._fetch_esi_items,
+                    character=character,
+                    force_refresh=force_refresh,
+                    token=token,
+                )
+            )
+            keys.append((section, character))
+
+    if jobs:
+        logger.debug(
+            "Fetching %s ESI requests with a concurrency of %s", len(jobs), limit
+        )
+        results = _run_limited(jobs, limit)
+        for (section, character), result in zip(keys, results):
+            fetched[section][character] = result
+    return fetched
@@ -0,0 +1,105 @@
+"""Batched resolution of EVE types for the skill writers."""
+
+# Standard Library
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+
+# Django
+from django.core.cache import cache
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+# Alliance Auth
+from allianceauth.services.hooks import get_extension_logger
+
+# Alliance Auth (External Libs)
+from eve_sde.models import EveSDE
+from eve_sde.models.types import ItemType as EveType
+
+# AA Skillfarm
+from skillfarm import __title__
+from skillfarm.providers import AppLogger
+
+logger = AppLogger(my_logger=get_extension_logger(__name__), prefix=__title__)
+
+
+class EveTypeResolver:
+    """
+    Process-local LRU of the EVE type ids that exist in the SDE.
+
+    The skill writers only need to know which type ids can be used as
+    foreign key, so all unknown ids of a write are loaded with one query.
+    Only existing ids are cached, a type added by a new SDE is found on its
+    first use.
+
+    The SDE is only reloaded in one process, so its version is kept in the
+    shared Django cache. Every process clears its own ids as soon as it sees
+    a new version.
+    """
+
+    VERSION_KEY = "skillfarm:eve_types:sde_version"
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._ids: OrderedDict[int, None] = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+
+    @classmethod
+    def get_version(cls) -> int:
+        """Return the current SDE version shared by all processes."""
+        version = cache.get(cls.VERSION_KEY)
+        if version is None:
+            cache.add(cls.VERSION_KEY, time.time_ns(), timeout=None)
+            version = cache.get(cls.VERSION_KEY)
+        return version
+
+    @classmethod
+    def bump_version(cls) -> None:
+        """Tell all processes that a new SDE has been loaded."""
+        cache.set(cls.VERSION_KEY, time.time_ns(), timeout=None)
+
+    def resolve_ids(self, type_ids: Iterable[int]) -> set[int]:
+        """Return the given type ids that exist as EveType."""
+        type_ids = set(type_ids)
+        version = self.get_version()
+        with self._lock:
+            if version != self._version:
+                self._ids.clear()
+                self._version = version
+            known = {type_id for type_id in type_ids if type_id in self._ids}
+            for type_id in known:
+                self._ids.move_to_end(type_id)
+
+        missing = type_ids - known
+        if not missing:
+            return known
+
+        found = set(EveType.objects.filter(id__in=missing).values_list("id", flat=True))
+        with self._lock:
+            for type_id in found:
+                self._ids[type_id] = None
+            while len(self._ids) > self.maxsize:
+                self._ids.popitem(last=False)
+
+        for type_id in missing - found:
+            logger.warning("EveType with id %s not found.", type_id)
+        return known | found
+
+    def clear(self) -> None:
+        """Forget all cached type ids."""
+        with self._lock:
+            self._ids.clear()
+
+
+eve_type_resolver = EveTypeResolver()
+
+
+# pylint: disable=unused-argument
+@receiver(post_save, sender=EveSDE)
+def clear_eve_type_resolver(sender, **kwargs):
+    """Clear the cached type ids of all processes when a new SDE has been loaded."""
+    EveTypeResolver.bump_version()
+    eve_type_resolver.clear()
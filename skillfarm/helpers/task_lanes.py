@@ -0,0 +1,66 @@
+"""Task lanes to route interactive and background tasks to their own queues and priorities."""
+
+# Django
+from django.db import models
+
+# AA Skillfarm
+from skillfarm import app_settings
+
+
+class TaskLane(models.TextChoices):
+    """A lane groups tasks that are dispatched with the same queue and priority."""
+
+    INTERACTIVE = "interactive"  # Updates a user is waiting for, e.g. a new character
+    SCHEDULED = "scheduled"  # Periodic background updates
+    NOTIFICATIONS = "notifications"
+    PRICES = "prices"
+
+
+# Celery priority per lane, lower numbers are processed first
+TASK_LANE_PRIORITIES = {
+    TaskLane.INTERACTIVE: 3,
+    TaskLane.SCHEDULED: 7,
+    TaskLane.NOTIFICATIONS: 5,
+    TaskLane.PRICES: 8,
+}
+
+# Lane of each task when it is not dispatched with explicit lane options
+TASK_LANE_ROUTES = {
+    "skillfarm.tasks.update_all_skillfarm": TaskLane.SCHEDULED,
+    "skillfarm.tasks.update_character": TaskLane.SCHEDULED,
+    "skillfarm.tasks.update_char_skills": TaskLane.SCHEDULED,
+    "skillfarm.tasks.update_char_skillqueue": TaskLane.SCHEDULED,
+    "skillfarm.tasks.update_characters_sections": TaskLane.SCHEDULED,
+    "skillfarm.tasks.check_skillfarm_notifications": TaskLane.NOTIFICATIONS,
+    "skillfarm.helpers.discord.send_user_notification": TaskLane.NOTIFICATIONS,
+    "skillfarm.tasks.update_all_prices": TaskLane.PRICES,
+}
+
+
+def get_lane_options(lane: str) -> dict:
+    """
+    Return the Celery dispatch options of a lane.
+
+    Args:
+        lane (str): The TaskLane to dispatch in.
+    Returns:
+        dict: The `priority` and, if configured in `SKILLFARM_TASK_QUEUES`, the `queue` of the lane.
+    """
+    options = {"priority": TASK_LANE_PRIORITIES[lane]}
+    queue = app_settings.SKILLFARM_TASK_QUEUES.get(lane)
+    if queue:
+        options["queue"] = queue
+    return options
+
+
+def route_task(name, args, kwargs, options, task=None, **kw):
+    """
+    Celery router for the Skillfarm tasks.
+
+    Routes tasks that are sent without lane options, e.g. by Celery Beat, into their lane.
+    Add it to `CELERY_TASK_ROUTES` to use it.
+    """
+    lane = TASK_LANE_ROUTES.get(name)
+    if lane is None:
+        return None
+    return get_lane_options(lane)
@@ -0,0 +1,224 @@
+"""Cached per-user scope of the visible characters."""
+
+# Standard Library
+import time
+from dataclasses import dataclass
+
+# Django
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+# Alliance Auth
+from allianceauth.authentication.models import CharacterOwnership, State, UserProfile
+from allianceauth.eveonline.models import EveCharacter
+from allianceauth.services.hooks import get_extension_logger
+
+# AA Skillfarm
+from skillfarm import __title__, app_settings
+from skillfarm.helpers.api_cache import api_cache
+from skillfarm.providers import AppLogger
+
+logger = AppLogger(my_logger=get_extension_logger(__name__), prefix=__title__)
+
+# Fields of a main character that are shown in the overview or define the visibility
+MAIN_CHARACTER_FIELDS = {"character_name", "corporation_id", "corporation_name"}
+
+
+@dataclass(frozen=True)
+class VisibilityScope:
+    """The characters a user can view."""
+
+    see_all: bool = False
+    character_ids: frozenset[int] = frozenset()
+    corporation_ids: frozenset[int] = frozenset()
+
+    def filter(self, queryset: QuerySet, prefix: str = "") -> QuerySet:
+        """
+        Filter a queryset to the visible characters.
+
+        Args:
+            queryset (QuerySet): Queryset to filter.
+            prefix (str): Lookup path to the EveCharacter, e.g. "character__".
+        Returns:
+            QuerySet: The visible rows.
+        """
+        if self.see_all:
+            return queryset
+
+        query = Q()
+        if self.character_ids:
+            query |= Q(**{f"{prefix}character_id__in": self.character_ids})
+        if self.corporation_ids:
+            query |= Q(**{f"{prefix}corporation_id__in": self.corporation_ids})
+        if not query:
+            return queryset.none()
+        return queryset.filter(query)
+
+
+class VisibilityScopeCache:
+    """
+    Cache the visibility scope of each user.
+
+    The scope is computed once from the permissions, the main character and
+    the owned characters of a user. It is deleted when one of them changes.
+    Changes of group and state permissions can affect many users, they bump
+    a global version that is part of every key instead.
+    """
+
+    SCOPE_KEY = "skillfarm:visibility:{user_id}:{version}"
+    VERSION_KEY = "skillfarm:visibility:version"
+
+    def get_version(self) -> int:
+        """Return the current global version."""
+        version = cache.get(self.VERSION_KEY)
+        if version is None:
+            cache.add(self.VERSION_KEY, time.time_ns(), timeout=None)
+            version = cache.get(self.VERSION_KEY)
+        return version
+
+    def _key(self, user_id: int) -> str:
+        return self.SCOPE_KEY.format(user_id=user_id, version=self.get_version())
+
+    @staticmethod
+    def compute(user) -> VisibilityScope:
+        """Compute the visibility scope of a user from the database."""
+        if user.is_superuser:
+            logger.debug("Returning all characters for superuser %s.", user)
+            return VisibilityScope(see_all=True)
+
+        if user.has_perm("skillfarm.admin_access"):
+            logger.debug("Returning all characters for admin %s.", user)
+            return VisibilityScope(see_all=True)
+
+        main_character = user.profile.main_character
+        if not main_character:
+            logger.debug("User %s has no main character. Nothing visible.", user)
+            return VisibilityScope()
+
+        character_ids = CharacterOwnership.objects.filter(user=user).values_list(
+            "character__character_id", flat=True
+        )
+        corporation_ids = []
+        if user.has_perm("skillfarm.corp_access"):
+            corporation_ids.append(main_character.corporation_id)
+        return VisibilityScope(
+            character_ids=frozenset(character_ids),
+            corporation_ids=frozenset(corporation_ids),
+        )
+
+    def get(self, user) -> VisibilityScope:
+        """Return the cached visibility scope of a user or compute it."""
+        timeout = app_settings.SKILLFARM_VISIBILITY_CACHE_TIMEOUT
+        if not timeout:
+            return self.compute(user)
+
+        key = self._key(user.pk)
+        scope = cache.get(key)
+        if scope is None:
+            scope = self.compute(user)
+            cache.set(key, scope, timeout=timeout)
+        return scope
+
+    def invalidate(self, *user_ids: int) -> None:
+        """Forget the visibility scope of the given users."""
+        if user_ids:
+            version = self.get_version()
+            cache.delete_many(
+                [
+                    self.SCOPE_KEY.format(user_id=user_id, version=version)
+                    for user_id in user_ids
+                ]
+            )
+            logger.debug("Invalidated visibility scope of users %s", user_ids)
+
+    def invalidate_all(self) -> None:
+        """Forget the visibility scope of all users."""
+        cache.add(self.VERSION_KEY, time.time_ns(), timeout=None)
+        try:
+            cache.incr(self.VERSION_KEY)
+        except ValueError:
+            # The version has been evicted in between
+            pass
+        logger.debug("Invalidated visibility scope of all users")
+
+
+visibility_cache = VisibilityScopeCache()
+
+
+def invalidate_visibility(*user_ids: int) -> None:
+    """
+    Invalidate the visibility scope of the given users, or of all users without ids.
+
+    The overview lists the main characters of all visible users, so the
+    cached overview responses are invalidated as well.
+    """
+    if user_ids:
+        visibility_cache.invalidate(*user_ids)
+    else:
+        visibility_cache.invalidate_all()
+    transaction.on_commit(lambda: api_cache.bump(api_cache.OVERVIEW_SCOPE))
+
+
+# pylint: disable=unused-argument
+@receiver(post_save, sender=CharacterOwnership)
+@receiver(post_delete, sender=CharacterOwnership)
+@receiver(post_save, sender=UserProfile)
+def invalidate_owner_visibility(sender, instance, **kwargs):
+    """Invalidate the scope when a character or the main character of a user changes."""
+    invalidate_visibility(instance.user_id)
+    # The cached details list the characters owned by the user
+    scope = api_cache.owner_scope(instance.user_id)
+    transaction.on_commit(lambda: api_cache.bump(scope))
+
+
+# pylint: disable=unused-argument
+@receiver(post_save, sender=User)
+def invalidate_user_visibility(sender, instance, **kwargs):
+    """Invalidate the scope when the superuser status of a user changes."""
+    update_fields = kwargs.get("update_fields")
+    # Logins only update the last login
+    if update_fields is not None and "is_superuser" not in update_fields:
+        return
+    invalidate_visibility(instance.pk)
+
+
+# pylint: disable=unused-argument
+@receiver(post_save, sender=EveCharacter)
+def invalidate_main_character_visibility(sender, instance, **kwargs):
+    """Invalidate the scope of the users whose main character has been updated."""
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and not MAIN_CHARACTER_FIELDS & set(update_fields):
+        return
+    user_ids = list(
+        UserProfile.objects.filter(main_character=instance).values_list(
+            "user_id", flat=True
+        )
+    )
+    if user_ids:
+        invalidate_visibility(*user_ids)
+
+
+# pylint: disable=unused-argument
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_user_permissions_visibility(sender, instance, action, reverse, **kwargs):
+    """Invalidate the scope when the groups or permissions of a user change."""
+    if not action.startswith("post_"):
+        return
+    if reverse:
+        invalidate_visibility()
+    else:
+        invalidate_visibility(instance.pk)
+
+
+# pylint: disable=unused-argument
+@receiver(m2m_changed, sender=Group.permissions.through)
+@receiver(m2m_changed, sender=State.permissions.through)
+def invalidate_group_permissions_visibility(sender, action, **kwargs):
+    """Invalidate the scope of all users when the permissions of a group or state change."""
+    if action.startswith("post_"):
+        invalidate_visibility()
@@ -1,26 +1,26 @@
 # Standard Library
+from collections import defaultdict
 from typing import TYPE_CHECKING
 
 # Django
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import models, transaction
+from django.db import connections, models, transaction
 
 # Alliance Auth
 from allianceauth.services.hooks import get_extension_logger
 
-# Alliance Auth (External Libs)
-from eve_sde.models.types import ItemType as EveType
-
 # AA Skillfarm
 from skillfarm import __title__
 from skillfarm.app_settings import SKILLFARM_BULK_METHODS_BATCH_SIZE
 from skillfarm.decorators import log_timing
+from skillfarm.helpers.eve_types import eve_type_resolver
 from skillfarm.models.helpers.update_manager import CharacterUpdateSection
-from skillfarm.providers import AppLogger, esi
+from skillfarm.providers import AppLogger, esi, esi_breaker, esi_governor
 
 if TYPE_CHECKING:
     # Alliance Auth
-    from esi.stubs import CharactersSkills, CharactersSkillsSkill
+    from esi.models import Token
+    from esi.stubs import CharactersSkills
 
     # AA Skillfarm
     from skillfarm.models.general import UpdateSectionResult
@@ -40,13 +40,13 @@ class SkillManagerQuerySet(models.QuerySet["CharacterSkill"]):
             if not skillsetup or not skillsetup.skillset:
                 skillset = []
             else:
-                skillset = skillsetup.skillset
+                skillset = skillsetup.skillset_type_ids
         except ObjectDoesNotExist:
             skillset = []
 
         extraction = self.filter(
             trained_skill_level=5,
-            eve_type__name__in=skillset,
+            eve_type_id__in=skillset,
         )
 
         return extraction
@@ -61,17 +61,24 @@ class SkillManagerQuerySet(models.QuerySet["CharacterSkill"]):
             if not skillsetup or not skillsetup.skillset:
                 skillset = []
             else:
-                skillset = skillsetup.skillset
+                skillset = skillsetup.skillset_type_ids
         except ObjectDoesNotExist:
             skillset = []
 
         skills = self.filter(
-            eve_type__name__in=skillset,
+            eve_type_id__in=skillset,
         )
         return skills
 
 
 class SkillManager(models.Manager["CharacterSkill"]):
+    # Fields that are refreshed from ESI on existing skills
+    SKILL_VALUE_FIELDS = (
+        "active_skill_level",
+        "skillpoints_in_skill",
+        "trained_skill_level",
+    )
+
     def get_queryset(self):
         """Get the base QuerySet for Skill entries."""
         return SkillManagerQuerySet(self.model, using=self._db)
@@ -93,129 +100,140 @@ class SkillManager(models.Manager["CharacterSkill"]):
         self, character: "SkillFarmAudit", force_refresh: bool = False
     ) -> "UpdateSectionResult":
         """Update or Create skills for a character from ESI."""
-        return character.update_manager.update_section_if_changed(
+        result = character.update_manager.update_section_if_changed(
             section=CharacterUpdateSection.SKILLS,
-            fetch_func=self._fetch_esi_data,
+            fetch_func=self._fetch_esi_items,
             force_refresh=force_refresh,
         )
+        if result.is_changed:
+            changed_rows = self._update_or_create_objs(
+                character=character, character_skills_items=result.data
+            )
+            result = result._replace(changed_rows=changed_rows, data=None)
+        return result
 
-    def _fetch_esi_data(
-        self, character: "SkillFarmAudit", force_refresh: bool = False
-    ) -> dict:
-        token = character.get_token()
+    def _fetch_esi_items(
+        self,
+        character: "SkillFarmAudit",
+        force_refresh: bool = False,
+        token: "Token" = None,
+    ) -> list["CharactersSkills"]:
+        """Fetch skills from ESI without storing them."""
+        if token is None:
+            token = character.get_token()
+
+        # Wait for a free slot of the shared rate governor
+        esi_governor.acquire()
 
         # Make the ESI request
         character_skills = esi.client.Skills.GetCharactersCharacterIdSkills(
             character_id=character.character.character_id,
             token=token,
         )
-        character_skills_items = character_skills.results(force_refresh=force_refresh)
-
-        self._update_or_create_objs(
-            character=character, character_skills_items=character_skills_items
-        )
+        with esi_breaker.guard():
+            return character_skills.results(force_refresh=force_refresh)
 
-    @transaction.atomic()
     def _update_or_create_objs(
         self,
         character: "SkillFarmAudit",
         character_skills_items: list["CharactersSkills"],
-    ) -> None:
+    ) -> int:
         """Update or Create skill entries from objs data."""
-        for character_skills in character_skills_items:
-            skills_list = [skill.skill_id for skill in character_skills.skills]
-            if len(skills_list) >= 1:
-                incoming_ids = set(skills_list)
-                existing_ids = set(
-                    self.filter(character=character).values_list(
-                        "eve_type_id", flat=True
-                    )
-                )
+        changed_rows = self._bulk_update_or_create_objs(
+            {character: character_skills_items}
+        )
+        return changed_rows.get(character.pk, 0)
 
-                obsolete_ids = existing_ids.difference(incoming_ids)
-                if obsolete_ids:
-                    logger.debug(
-                        "%s: Deleting %s obsolete skill/s", character, len(obsolete_ids)
-                    )
-                    self.filter(
-                        character=character, eve_type_id__in=obsolete_ids
-                    ).delete()
-
-                create_ids = incoming_ids.difference(existing_ids)
-                if create_ids:
-                    self._create_from_list(
-                        character=character,
-                        skills_list=character_skills.skills,
-                        create_ids=create_ids,
-                    )
-
-                update_ids = incoming_ids.intersection(existing_ids)
-                if update_ids:
-                    self._update_from_list(
-                        character=character,
-                        skills_list=character_skills.skills,
-                        update_ids=update_ids,
-                    )
-
-    def _create_from_list(
+    @transaction.atomic()
+    def _bulk_update_or_create_objs(
         self,
-        character: "SkillFarmAudit",
-        skills_list: list["CharactersSkillsSkill"],
-        create_ids: set,
-    ):
-        logger.debug("%s: Storing %s new skills", character, len(create_ids))
-        skills = []
-
-        for skill in skills_list:
-            if skill.skill_id in create_ids:
-                try:
-                    eve_type_instance = EveType.objects.get(id=skill.skill_id)
-                except ObjectDoesNotExist:
-                    logger.warning(
-                        "EveType with id %s not found. Skipping skill entry.",
-                        skill.skill_id,
-                    )
-                    continue
-
-                skills.append(
-                    self.model(
-                        name=character.name,
-                        character=character,
-                        eve_type=eve_type_instance,
-                        active_skill_level=skill.active_skill_level,
-                        skillpoints_in_skill=skill.skillpoints_in_skill,
-                        trained_skill_level=skill.trained_skill_level,
-                    )
+        characters_skills_items: dict["SkillFarmAudit", list["CharactersSkills"]],
+    ) -> dict[int, int]:
+        """
+        Update or Create skill entries for many characters with shared bulk statements.
+
+        Incoming skills are compared against the stored rows, only new and
+        changed skills are written with one upsert on the (character, eve_type)
+        constraint, followed by one delete for the skills that are gone.
+
+        Returns:
+            dict[int, int]: The number of changed rows per character pk.
+        """
+        incoming = {}
+        for character, character_skills_items in characters_skills_items.items():
+            for character_skills in character_skills_items:
+                if len(character_skills.skills) >= 1:
+                    incoming[character] = {
+                        skill.skill_id: skill for skill in character_skills.skills
+                    }
+
+        if not incoming:
+            return {}
+
+        existing = {}
+        for pk, character_id, eve_type_id, *values in self.filter(
+            character__in=incoming.keys()
+        ).values_list(
+            "pk",
+            "character_id",
+            "eve_type_id",
+            *self.SKILL_VALUE_FIELDS,
+        ):
+            existing[(character_id, eve_type_id)] = (pk, tuple(values))
+
+        changed_skills = []
+        for character, skills in incoming.items():
+            for skill in skills.values():
+                current = existing.pop((character.pk, skill.skill_id), None)
+                values = tuple(
+                    getattr(skill, field) for field in self.SKILL_VALUE_FIELDS
                 )
-        self.bulk_create(skills, batch_size=SKILLFARM_BULK_METHODS_BATCH_SIZE)
+                if current is None or current[1] != values:
+                    changed_skills.append((character, skill))
 
-    def _update_from_list(
-        self,
-        character,
-        skills_list: list["CharactersSkillsSkill"],
-        update_ids: set,
-    ):
-        logger.debug("%s: Updating %s skills", character, len(update_ids))
-        update_pks = list(
-            self.filter(character=character, eve_type_id__in=update_ids).values_list(
-                "pk", flat=True
-            )
-        )
-        skills = self.in_bulk(update_pks)
-        skills_dict = {s.skill_id: s for s in skills_list}
-        for skill in skills.values():
-            if skill.eve_type_id in skills_dict:
-                skill_ctx = skills_dict[skill.eve_type_id]
-                skill.active_skill_level = skill_ctx.active_skill_level
-                skill.skillpoints_in_skill = skill_ctx.skillpoints_in_skill
-                skill.trained_skill_level = skill_ctx.trained_skill_level
-
-        self.bulk_update(
-            skills.values(),
-            fields=[
-                "active_skill_level",
-                "skillpoints_in_skill",
-                "trained_skill_level",
-            ],
-            batch_size=SKILLFARM_BULK_METHODS_BATCH_SIZE,
+        # Resolve all skill types with one query instead of one per new skill
+        known_type_ids = eve_type_resolver.resolve_ids(
+            skill.skill_id for __, skill in changed_skills
         )
+
+        changed_rows = defaultdict(int)
+        upsert_skills = []
+        for character, skill in changed_skills:
+            if skill.skill_id not in known_type_ids:
+                continue
+            upsert_skills.append(
+                self.model(
+                    name=character.name,
+                    character=character,
+                    eve_type_id=skill.skill_id,
+                    active_skill_level=skill.active_skill_level,
+                    skillpoints_in_skill=skill.skillpoints_in_skill,
+                    trained_skill_level=skill.trained_skill_level,
+                )
+            )
+            changed_rows[character.pk] += 1
+
+        # The remaining stored skills are not known by ESI anymore
+        obsolete_pks = []
+        for (character_id, __), (pk, __) in existing.items():
+            obsolete_pks.append(pk)
+            changed_rows[character_id] += 1
+
+        if obsolete_pks:
+            logger.debug("Deleting %s obsolete skill/s", len(obsolete_pks))
+            self.filter(pk__in=obsolete_pks).delete()
+
+        if upsert_skills:
+            logger.debug("Storing %s new or changed skill/s", len(upsert_skills))
+            # MySQL/MariaDB upsert on any unique key and reject an explicit target
+            unique_fields = None
+            if connections[self.db].features.supports_update_conflicts_with_target:
+                unique_fields = ["character", "eve_type"]
+            self.bulk_create(
+                upsert_skills,
+                update_conflicts=True,
+                unique_fields=unique_fields,
+                update_fields=list(self.SKILL_VALUE_FIELDS),
+                batch_size=SKILLFARM_BULK_METHODS_BATCH_SIZE,
+            )
+        return dict(changed_rows)
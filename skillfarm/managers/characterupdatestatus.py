@@ -1,17 +1,30 @@
 # Standard Library
+from collections import defaultdict
 from typing import TYPE_CHECKING
 
 # Django
 from django.contrib.humanize.templatetags.humanize import naturaltime
 from django.db import models
-from django.db.models import Case, Count, Q, Value, When
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    Min,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 # Alliance Auth
 from allianceauth.services.hooks import get_extension_logger
 
 # AA Skillfarm
-from skillfarm import __title__
+from skillfarm import __title__, app_settings
 from skillfarm.models.helpers.update_manager import CharacterUpdateSection, UpdateStatus
 from skillfarm.providers import AppLogger
 
@@ -19,6 +32,7 @@ logger = AppLogger(my_logger=get_extension_logger(__name__), prefix=__title__)
 
 if TYPE_CHECKING:
     # AA Skillfarm
+    from skillfarm.models.general import UpdateSectionResult
     from skillfarm.models.skillfarmaudit import (
         CharacterUpdateStatus as CharacterUpdateStatusType,
     )
@@ -52,6 +66,233 @@ class UpdateStatusQuerySet(models.QuerySet["CharacterUpdateStatusType"]):
             return UpdateStatus.INCOMPLETE
         return UpdateStatus(total_update_status)
 
+    def get_statuses(self) -> dict[int, UpdateStatus]:
+        """
+        Return the aggregate update status per character.
+
+        Set-based counterpart of `get_status()`, characters without
+        update status rows are not included.
+        """
+        return {
+            character_id: UpdateStatus(total_update_status)
+            for character_id, total_update_status in self.annotate_total_update_status().values_list(
+                "character_id", "total_update_status"
+            )
+        }
+
+    def last_update_statuses(self) -> dict[int, str]:
+        """
+        Return the last update status per character.
+
+        Set-based counterpart of `last_update_status()`, characters without
+        a finished update are not included.
+        """
+        return {
+            character_id: str(naturaltime(last_update_finished_at))
+            for character_id, last_update_finished_at in self.exclude(
+                last_update_finished_at__isnull=True
+            )
+            .values("character_id")
+            .annotate(first_update_finished_at=Min("last_update_finished_at"))
+            .values_list("character_id", "first_update_finished_at")
+        }
+
+    def filter_fresh(self):
+        """
+        Return update status rows which do not need an update.
+
+        Set-based counterpart of `CharacterUpdateStatus.need_update()`:
+        rows with a token error are ignored and successful rows stay fresh
+        until their `next_due_at` has passed. Rows without a `next_due_at`
+        stay fresh until the stale time of their section has passed.
+        """
+        now = timezone.now()
+        query = Q(has_token_error=True) | Q(
+            is_success=True,
+            last_update_finished_at__isnull=False,
+            next_due_at__gt=now,
+        )
+        for section in CharacterUpdateSection.get_sections():
+            section_time_stale = app_settings.SKILLFARM_STALE_TYPES.get(section, 60)
+            query |= Q(
+                section=section,
+                is_success=True,
+                last_update_finished_at__isnull=False,
+                next_due_at__isnull=True,
+                last_run_finished_at__gt=now
+                - timezone.timedelta(minutes=section_time_stale),
+            )
+        return self.filter(query)
+
+    def next_due_at_expression(self, section: str, now=None):
+        """
+        Return the SQL expression for the next due time of a section.
+
+        The next update is due when the next skill of the queue finishes,
+        but never before the stale time of the section and never later
+        than `SKILLFARM_MAX_UPDATE_INTERVAL`. Characters without an active
+        training are refreshed after the max interval.
+        """
+        now = now or timezone.now()
+        section_time_stale = app_settings.SKILLFARM_STALE_TYPES.get(section, 60)
+        min_due = now + timezone.timedelta(minutes=section_time_stale)
+        max_due = max(
+            min_due,
+            now
+            + timezone.timedelta(minutes=app_settings.SKILLFARM_MAX_UPDATE_INTERVAL),
+        )
+
+        skillqueue_model = (
+            self.model._meta.get_field("character")
+            .related_model._meta.get_field("skillfarm_skillqueue")
+            .related_model
+        )
+        next_finish_date = Subquery(
+            skillqueue_model.objects.filter(
+                character=OuterRef("character_id"), finish_date__gt=now
+            )
+            .order_by("finish_date")
+            .values("finish_date")[:1],
+            output_field=models.DateTimeField(),
+        )
+        min_due = Value(min_due, output_field=models.DateTimeField())
+        max_due = Value(max_due, output_field=models.DateTimeField())
+        return Least(Greatest(Coalesce(next_finish_date, max_due), min_due), max_due)
+
+    def set_next_due_at(self, section: str) -> int:
+        """Schedule the next update of a section from the skillqueue."""
+        return self.filter(section=section).update(
+            next_due_at=self.next_due_at_expression(section)
+        )
+
+    def bulk_reset(self, character_pks: list[int], section: str) -> None:
+        """Create or Reset the update status of a section for many characters."""
+        existing_pks = set(
+            self.filter(character_id__in=character_pks, section=section).values_list(
+                "character_id", flat=True
+            )
+        )
+        self.bulk_create(
+            [
+                self.model(character_id=pk, section=section)
+                for pk in character_pks
+                if pk not in existing_pks
+            ]
+        )
+        self.filter(character_id__in=character_pks, section=section).update(
+            is_success=None,
+            error_message="",
+            has_token_error=False,
+            last_run_at=timezone.now(),
+            last_run_finished_at=None,
+        )
+
+    def bulk_update_section_log(
+        self, section: str, results: dict[int, "UpdateSectionResult"]
+    ) -> None:
+        """
+        Update the status of a section for many characters.
+
+        Characters with the same outcome share one update statement.
+
+        Args:
+            section (str): The updated section.
+            results (dict[int, UpdateSectionResult]): Mapping of character pk to its update result.
+        """
+        groups = defaultdict(list)
+        for character_pk, result in results.items():
+            key = (
+                bool(result.is_updated),
+                result.has_token_error,
+                result.error_message or "",
+            )
+            groups[key].append(character_pk)
+
+        now = timezone.now()
+        for (is_updated, has_token_error, error_message), pks in groups.items():
+            values = {
+                "is_success": not has_token_error,
+                "error_message": error_message,
+                "has_token_error": has_token_error,
+                "last_run_finished_at": now,
+            }
+            if is_updated:
+                values["last_update_at"] = F("last_run_at")
+                values["last_update_finished_at"] = now
+            if not has_token_error:
+                values["next_due_at"] = self.next_due_at_expression(section, now)
+            self.filter(character_id__in=pks, section=section).update(**values)
+
+        character_model = self.model._meta.get_field("character").related_model
+        character_model.objects.filter(pk__in=results.keys()).invalidate_api_cache()
+
+        # Remember the stored payloads to skip the write of unchanged payloads
+        digests = {
+            character_pk: result.payload_digest
+            for character_pk, result in results.items()
+            if result.is_changed and result.payload_digest
+        }
+        if digests:
+            self.filter(character_id__in=digests.keys(), section=section).update(
+                payload_digest=Case(
+                    *[
+                        When(character_id=character_pk, then=Value(digest))
+                        for character_pk, digest in digests.items()
+                    ],
+                    default=F("payload_digest"),
+                )
+            )
+
+    def get_payload_digests(
+        self, section: str, character_pks: list[int]
+    ) -> dict[int, str]:
+        """Return the digest of the last stored payload of a section per character pk."""
+        return dict(
+            self.filter(character_id__in=character_pks, section=section).values_list(
+                "character_id", "payload_digest"
+            )
+        )
+
+    def bulk_update_error(
+        self, section: str, character_pks: list[int], error_message: str
+    ) -> None:
+        """Mark a section as failed for many characters and finish their run."""
+        now = timezone.now()
+        self.filter(character_id__in=character_pks, section=section).update(
+            is_success=False,
+            error_message=error_message,
+            has_token_error=False,
+            last_update_at=now,
+            last_run_finished_at=now,
+        )
+
+    def bulk_update_token_error(
+        self, character_pks: list[int], error_message: str
+    ) -> None:
+        """Mark all sections of many characters with a token error."""
+        sections = CharacterUpdateSection.get_sections()
+        existing = set(
+            self.filter(character_id__in=character_pks).values_list(
+                "character_id", "section"
+            )
+        )
+        self.bulk_create(
+            [
+                self.model(character_id=pk, section=section)
+                for pk in character_pks
+                for section in sections
+                if (pk, section) not in existing
+            ]
+        )
+        now = timezone.now()
+        self.filter(character_id__in=character_pks, section__in=sections).update(
+            is_success=False,
+            error_message=error_message,
+            has_token_error=True,
+            last_run_at=now,
+            last_run_finished_at=now,
+        )
+
     def annotate_total_update_status(self):
         """Get the total update status."""
         sections = CharacterUpdateSection.get_sections()
@@ -133,6 +374,52 @@ class UpdateStatusManager(models.Manager["CharacterUpdateStatusType"]):
         """Return the last update status for the given character."""
         return self.get_queryset().get_status()
 
+    def get_statuses(self) -> dict[int, UpdateStatus]:
+        """Return the aggregate update status per character."""
+        return self.get_queryset().get_statuses()
+
+    def last_update_statuses(self) -> dict[int, str]:
+        """Return the last update status per character."""
+        return self.get_queryset().last_update_statuses()
+
+    def filter_fresh(self) -> models.QuerySet["CharacterUpdateStatusType"]:
+        """Return update status rows which do not need an update."""
+        return self.get_queryset().filter_fresh()
+
+    def set_next_due_at(self, section: str) -> int:
+        """Schedule the next update of a section from the skillqueue."""
+        return self.get_queryset().set_next_due_at(section)
+
+    def bulk_reset(self, character_pks: list[int], section: str) -> None:
+        """Create or Reset the update status of a section for many characters."""
+        return self.get_queryset().bulk_reset(character_pks, section)
+
+    def bulk_update_section_log(
+        self, section: str, results: dict[int, "UpdateSectionResult"]
+    ) -> None:
+        """Update the status of a section for many characters."""
+        return self.get_queryset().bulk_update_section_log(section, results)
+
+    def get_payload_digests(
+        self, section: str, character_pks: list[int]
+    ) -> dict[int, str]:
+        """Return the digest of the last stored payload of a section per character pk."""
+        return self.get_queryset().get_payload_digests(section, character_pks)
+
+    def bulk_update_error(
+        self, section: str, character_pks: list[int], error_message: str
+    ) -> None:
+        """Mark a section as failed for many characters."""
+        return self.get_queryset().bulk_update_error(
+            section, character_pks, error_message
+        )
+
+    def bulk_update_token_error(
+        self, character_pks: list[int], error_message: str
+    ) -> None:
+        """Mark all sections of many characters with a token error."""
+        return self.get_queryset().bulk_update_token_error(character_pks, error_message)
+
     def annotate_total_update_status(
         self,
     ) -> models.QuerySet["CharacterUpdateStatusType"]:
@@ -1,16 +1,22 @@
 # Standard Library
+from collections import defaultdict
 from typing import TYPE_CHECKING
 
 # Django
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Exists, OuterRef, Sum
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 # Alliance Auth
-from allianceauth.eveonline.models import EveCharacter
+from allianceauth.eveonline.models import EveCharacter, Token
 from allianceauth.services.hooks import get_extension_logger
 
 # AA Skillfarm
 from skillfarm import __title__
+from skillfarm.helpers.api_cache import api_cache
+from skillfarm.helpers.visibility import visibility_cache
+from skillfarm.models.helpers.update_manager import CharacterUpdateSection
 from skillfarm.providers import AppLogger
 
 logger = AppLogger(my_logger=get_extension_logger(__name__), prefix=__title__)
@@ -22,34 +28,172 @@ if TYPE_CHECKING:
 
 class SkillfarmQuerySet(models.QuerySet):
     def visible_to(self, user):
-        # superusers get all visible
-        if user.is_superuser:
-            logger.debug("Returning all characters for superuser %s.", user)
-            return self
+        """Return characters visible to the given user."""
+        return visibility_cache.get(user).filter(self, prefix="character__")
+
+    def annotate_stale_sections(self):
+        """Annotate each character with a `needs_<section>` flag for every update section."""
+        update_status_model = self.model._meta.get_field(
+            "skillfarm_update_status"
+        ).related_model
+        annotations = {}
+        for section in CharacterUpdateSection.get_sections():
+            fresh_status = update_status_model.objects.filter(
+                character=OuterRef("pk"),
+                section=section,
+            ).filter_fresh()
+            annotations[f"needs_{section}"] = ~Exists(fresh_status)
+        return self.annotate(**annotations)
 
-        if user.has_perm("skillfarm.admin_access"):
-            logger.debug("Returning all characters for admin %s.", user)
-            return self
+    def stale_sections(self) -> dict[int, list[str]]:
+        """
+        Return the sections which need an update for each character.
 
-        try:
-            char = user.profile.main_character
-            assert char
-            queries = [models.Q(character__character_ownership__user=user)]
+        Evaluates the staleness of the whole queryset in one query.
+        Characters without any stale section are not included.
+
+        Returns:
+            dict[int, list[str]]: Mapping of character pk to stale sections.
+        """
+        sections = CharacterUpdateSection.get_sections()
+        rows = self.annotate_stale_sections().values_list(
+            "pk", *[f"needs_{section}" for section in sections]
+        )
+        stale = {}
+        for pk, *needs_update in rows:
+            stale_sections = [
+                section for section, needs in zip(sections, needs_update) if needs
+            ]
+            if stale_sections:
+                stale[pk] = stale_sections
+        return stale
 
-            if user.has_perm("skillfarm.corp_access"):
-                queries.append(models.Q(character__corporation_id=char.corporation_id))
+    def filter_without_token(self):
+        """
+        Return characters which have no valid token with the required scopes.
 
-            logger.debug(
-                "%s queries for user %s visible chracters.", len(queries), user
+        Uses the same validity check as `get_tokens`, expired tokens are
+        refreshed and tokens which can not be refreshed are deleted.
+        """
+        tokens = (
+            Token.objects.filter(
+                character_id__in=self.values("character__character_id")
             )
+            .require_scopes(self.model.get_esi_scopes())
+            .require_valid()
+        )
+        return self.exclude(character__character_id__in=tokens.values("character_id"))
+
+    def update_farm_state(self) -> int:
+        """
+        Recompute the stored farm state of the characters from their skills and skillqueue.
+
+        Loads the data of all characters with a few queries and writes the
+        state with one bulk update, so the read paths only read columns.
+
+        Returns:
+            int: The number of updated characters.
+        """
+        skill_model = self.model._meta.get_field("skillfarm_skills").related_model
+        skillqueue_model = self.model._meta.get_field(
+            "skillfarm_skillqueue"
+        ).related_model
+        setup_model = self.model._meta.get_field("skillfarm_setup").related_model
 
-            query = queries.pop()
-            for q in queries:
-                query |= q
-            return self.filter(query)
-        except AssertionError:
-            logger.debug("User %s has no main character. Nothing visible.", user)
-            return self.none()
+        character_pks = list(self.values_list("pk", flat=True))
+        if not character_pks:
+            return 0
+
+        skillsets = dict(
+            setup_model.objects.filter(
+                character_id__in=character_pks, skillset__isnull=False
+            ).values_list("character_id", "skillset_type_ids")
+        )
+        total_sp = dict(
+            skill_model.objects.filter(character_id__in=character_pks)
+            .values("character_id")
+            .annotate(total_sp=Sum("skillpoints_in_skill"))
+            .values_list("character_id", "total_sp")
+        )
+
+        extraction_ready_count = defaultdict(int)
+        for character_id, eve_type_id in skill_model.objects.filter(
+            character_id__in=skillsets.keys(), trained_skill_level=5
+        ).values_list("character_id", "eve_type_id"):
+            if eve_type_id in skillsets[character_id]:
+                extraction_ready_count[character_id] += 1
+
+        now = timezone.now()
+        is_training = set()
+        queue_finish_at = {}
+        extraction_ready_in_queue = defaultdict(int)
+        for (
+            character_id,
+            eve_type_id,
+            start_date,
+            finish_date,
+            finished_level,
+        ) in skillqueue_model.objects.filter(
+            character_id__in=character_pks
+        ).values_list(
+            "character_id",
+            "eve_type_id",
+            "start_date",
+            "finish_date",
+            "finished_level",
+        ):
+            if start_date is None or finish_date is None:
+                continue
+            if start_date < now < finish_date:
+                is_training.add(character_id)
+            queue_finish_at[character_id] = max(
+                finish_date, queue_finish_at.get(character_id, finish_date)
+            )
+            if (
+                start_date < finish_date < now
+                and finished_level == 5
+                and eve_type_id in skillsets.get(character_id, [])
+            ):
+                extraction_ready_in_queue[character_id] += 1
+
+        characters = [
+            self.model(
+                pk=character_pk,
+                is_training=character_pk in is_training,
+                queue_finish_at=queue_finish_at.get(character_pk),
+                extraction_ready_count=extraction_ready_count[character_pk],
+                extraction_ready_in_queue=extraction_ready_in_queue[character_pk],
+                total_sp=total_sp.get(character_pk) or 0,
+                has_skillset=character_pk in skillsets,
+            )
+            for character_pk in character_pks
+        ]
+        return self.model.objects.bulk_update(
+            characters,
+            fields=[
+                "is_training",
+                "queue_finish_at",
+                "extraction_ready_count",
+                "extraction_ready_in_queue",
+                "total_sp",
+                "has_skillset",
+            ],
+        )
+
+    def invalidate_api_cache(self) -> None:
+        """
+        Invalidate the cached API responses of the owners of the characters.
+
+        The versions are bumped after the current transaction is committed,
+        otherwise a concurrent request could cache the old data again.
+        """
+        scopes = [
+            api_cache.owner_scope(owner_id)
+            for owner_id in set(
+                self.values_list("character__character_ownership__user_id", flat=True)
+            )
+        ]
+        transaction.on_commit(lambda: api_cache.bump(*scopes))
 
     def disable_characters_with_no_owner(self) -> int:
         """Disable characters which have no owner. Return count of disabled characters."""
@@ -80,37 +224,44 @@ class SkillFarmManager(models.Manager["SkillFarmAuditType"]):
         """Return characters visible to the given user."""
         return self.get_queryset().visible_to(user)
 
+    def stale_sections(self) -> dict[int, list[str]]:
+        """Return the sections which need an update for each character."""
+        return self.get_queryset().stale_sections()
+
+    def filter_without_token(self):
+        """Return characters which have no valid token with the required scopes."""
+        return self.get_queryset().filter_without_token()
+
+    def update_farm_state(self) -> int:
+        """Recompute the stored farm state of the characters from their skills and skillqueue."""
+        return self.get_queryset().update_farm_state()
+
+    def invalidate_api_cache(self) -> None:
+        """Invalidate the cached API responses of the owners of the characters."""
+        return self.get_queryset().invalidate_api_cache()
+
     def disable_characters_with_no_owner(self) -> int:
         """Disable characters which have no owner. Return count of disabled characters."""
         return self.get_queryset().disable_characters_with_no_owner()
 
     @staticmethod
     def visible_eve_characters(user):
-        qs = EveCharacter.objects.get_queryset()
-        if user.is_superuser:
-            logger.debug("Returning all characters for superuser %s.", user)
-            return qs.all()
-
-        if user.has_perm("skillfarm.admin_access"):
-            logger.debug("Returning all characters for admin %s.", user)
-            return qs.all()
-
-        try:
-            char = user.profile.main_character
-            assert char
-            queries = [models.Q(character_ownership__user=user)]
+        """Return the EveCharacters visible to the given user."""
+        return visibility_cache.get(user).filter(EveCharacter.objects.all())
 
-            if user.has_perm("skillfarm.corp_access"):
-                queries.append(models.Q(corporation_id=char.corporation_id))
-
-            logger.debug(
-                "%s queries for user %s visible chracters.", len(queries), user
-            )
+    @staticmethod
+    def can_view(user, character_id: int) -> bool:
+        """
+        Return True if the user can view the EveCharacter with the given character id.
 
-            query = queries.pop()
-            for q in queries:
-                query |= q
-            return qs.filter(query)
-        except AssertionError:
-            logger.debug("User %s has no main character. Nothing visible.", user)
-            return qs.none()
+        Owned characters are checked against the cached visibility scope
+        without a query, other characters with an indexed existence query.
+        """
+        scope = visibility_cache.get(user)
+        if character_id in scope.character_ids:
+            return True
+        if not scope.see_all and not scope.corporation_ids:
+            return False
+        return scope.filter(
+            EveCharacter.objects.filter(character_id=character_id)
+        ).exists()
@@ -1,4 +1,5 @@
 # Standard Library
+from collections import defaultdict
 from typing import TYPE_CHECKING
 
 # Django
@@ -9,18 +10,17 @@ from django.utils import timezone
 # Alliance Auth
 from allianceauth.services.hooks import get_extension_logger
 
-# Alliance Auth (External Libs)
-from eve_sde.models.types import ItemType as EveType
-
 # AA Skillfarm
 from skillfarm import __title__
 from skillfarm.app_settings import SKILLFARM_BULK_METHODS_BATCH_SIZE
 from skillfarm.decorators import log_timing
+from skillfarm.helpers.eve_types import eve_type_resolver
 from skillfarm.models.helpers.update_manager import CharacterUpdateSection
-from skillfarm.providers import AppLogger, esi
+from skillfarm.providers import AppLogger, esi, esi_breaker, esi_governor
 
 if TYPE_CHECKING:
     # Alliance Auth
+    from esi.models import Token
     from esi.stubs import CharactersSkillqueueSkill
 
     # AA Skillfarm
@@ -50,7 +50,7 @@ class SkillqueueQuerySet(models.QuerySet):
             if not skillsetup or not skillsetup.skillset:
                 skillset = []
             else:
-                skillset = skillsetup.skillset
+                skillset = skillsetup.skillset_type_ids
         except ObjectDoesNotExist:
             skillset = []
 
@@ -58,7 +58,7 @@ class SkillqueueQuerySet(models.QuerySet):
             finish_date__gt=models.F("start_date"),
             finish_date__lt=timezone.now(),
             finished_level=5,
-            eve_type__name__in=skillset,
+            eve_type_id__in=skillset,
         )
 
         return extraction
@@ -91,17 +91,28 @@ class SkillqueueQuerySet(models.QuerySet):
             if not skillsetup or not skillsetup.skillset:
                 skillset = []
             else:
-                skillset = skillsetup.skillset
+                skillset = skillsetup.skillset_type_ids
         except ObjectDoesNotExist:
             skillset = []
 
         skillqueue = self.filter(
-            eve_type__name__in=skillset,
+            eve_type_id__in=skillset,
         )
         return skillqueue
 
 
 class SkillqueueManager(models.Manager["CharacterSkillqueueEntry"]):
+    # Fields that are refreshed from ESI on existing queue entries
+    ENTRY_VALUE_FIELDS = (
+        "eve_type_id",
+        "finish_date",
+        "finished_level",
+        "level_end_sp",
+        "level_start_sp",
+        "start_date",
+        "training_start_sp",
+    )
+
     def get_queryset(self):
         """Get the base QuerySet for Skillqueue entries."""
         return SkillqueueQuerySet(self.model, using=self._db)
@@ -126,66 +137,149 @@ class SkillqueueManager(models.Manager["CharacterSkillqueueEntry"]):
         self, character: "SkillFarmAudit", force_refresh: bool = False
     ) -> "UpdateSectionResult":
         """Update or Create skills for a character from ESI."""
-        return character.update_manager.update_section_if_changed(
+        result = character.update_manager.update_section_if_changed(
             section=CharacterUpdateSection.SKILLQUEUE,
-            fetch_func=self._fetch_esi_data,
+            fetch_func=self._fetch_esi_items,
             force_refresh=force_refresh,
         )
+        if result.is_changed:
+            changed_rows = self._update_or_create_objs(
+                character=character, character_skillqueue_items=result.data
+            )
+            result = result._replace(changed_rows=changed_rows, data=None)
+        return result
 
-    def _fetch_esi_data(
-        self, character: "SkillFarmAudit", force_refresh: bool = False
-    ) -> dict:
-        """Fetch Skillqueue entries from ESI data."""
-        token = character.get_token()
+    def _fetch_esi_items(
+        self,
+        character: "SkillFarmAudit",
+        force_refresh: bool = False,
+        token: "Token" = None,
+    ) -> list["CharactersSkillqueueSkill"]:
+        """Fetch Skillqueue entries from ESI without storing them."""
+        if token is None:
+            token = character.get_token()
+
+        # Wait for a free slot of the shared rate governor
+        esi_governor.acquire()
 
         # Make the ESI request
         skillqueue_data = esi.client.Skills.GetCharactersCharacterIdSkillqueue(
             character_id=character.character.character_id,
             token=token,
         )
-        character_skillqueue_items = skillqueue_data.results(
-            force_refresh=force_refresh,
-        )
-
-        self._update_or_create_objs(
-            character=character, character_skillqueue_items=character_skillqueue_items
-        )
+        with esi_breaker.guard():
+            return skillqueue_data.results(
+                force_refresh=force_refresh,
+            )
 
-    @transaction.atomic()
     def _update_or_create_objs(
         self,
         character: "SkillFarmAudit",
         character_skillqueue_items: list["CharactersSkillqueueSkill"],
-    ) -> None:
+    ) -> int:
         """Update or Create skill queue entries from objs data."""
-        entries = []
-
-        for entry in character_skillqueue_items:
-            try:
-                eve_type_instance = EveType.objects.get(id=entry.skill_id)
-            except ObjectDoesNotExist:
-                logger.warning(
-                    "EveType with id %s not found. Skipping skillqueue entry.",
-                    entry.skill_id,
-                )
+        changed_rows = self._bulk_update_or_create_objs(
+            {character: character_skillqueue_items}
+        )
+        return changed_rows.get(character.pk, 0)
+
+    @transaction.atomic()
+    def _bulk_update_or_create_objs(
+        self,
+        characters_skillqueue_items: dict[
+            "SkillFarmAudit", list["CharactersSkillqueueSkill"]
+        ],
+    ) -> dict[int, int]:
+        """
+        Update or Create skill queue entries for many characters with shared bulk statements.
+
+        The incoming queue is merged into the stored entries by queue position,
+        only changed entries are updated, new positions are inserted and the
+        removed tail is deleted.
+
+        Returns:
+            dict[int, int]: The number of changed rows per character pk.
+        """
+        existing = {}
+        obsolete_pks = []
+        for pk, character_id, queue_position, *values in self.filter(
+            character__in=characters_skillqueue_items.keys()
+        ).values_list("pk", "character_id", "queue_position", *self.ENTRY_VALUE_FIELDS):
+            if (character_id, queue_position) in existing:
+                # Duplicate position from an older update
+                obsolete_pks.append(pk)
                 continue
+            existing[(character_id, queue_position)] = (pk, tuple(values))
 
-            entries.append(
-                self.model(
-                    name=character.name,
-                    character=character,
-                    eve_type=eve_type_instance,
-                    finish_date=entry.finish_date,
-                    finished_level=entry.finished_level,
-                    level_end_sp=entry.level_end_sp,
-                    level_start_sp=entry.level_start_sp,
-                    queue_position=entry.queue_position,
-                    start_date=entry.start_date,
-                    training_start_sp=entry.training_start_sp,
-                )
-            )
+        # Resolve all skill types with one query instead of one per entry
+        known_type_ids = eve_type_resolver.resolve_ids(
+            entry.skill_id
+            for character_skillqueue_items in characters_skillqueue_items.values()
+            for entry in character_skillqueue_items
+        )
+
+        changed_rows = defaultdict(int)
+        create_entries = []
+        update_entries = []
+        for (
+            character,
+            character_skillqueue_items,
+        ) in characters_skillqueue_items.items():
+            for entry in character_skillqueue_items:
+                if entry.skill_id not in known_type_ids:
+                    continue
+
+                values = {
+                    "eve_type_id": entry.skill_id,
+                    "finish_date": entry.finish_date,
+                    "finished_level": entry.finished_level,
+                    "level_end_sp": entry.level_end_sp,
+                    "level_start_sp": entry.level_start_sp,
+                    "start_date": entry.start_date,
+                    "training_start_sp": entry.training_start_sp,
+                }
+                current = existing.pop((character.pk, entry.queue_position), None)
+                if current is None:
+                    create_entries.append(
+                        self.model(
+                            name=character.name,
+                            character=character,
+                            queue_position=entry.queue_position,
+                            **values,
+                        )
+                    )
+                elif current[1] != tuple(
+                    values[field] for field in self.ENTRY_VALUE_FIELDS
+                ):
+                    update_entries.append(
+                        self.model(
+                            pk=current[0],
+                            character=character,
+                            queue_position=entry.queue_position,
+                            **values,
+                        )
+                    )
+                else:
+                    continue
+                changed_rows[character.pk] += 1
+
+        # The remaining stored entries are the removed tail of the queue
+        for (character_id, __), (pk, __) in existing.items():
+            obsolete_pks.append(pk)
+            changed_rows[character_id] += 1
 
-        self.filter(character=character).delete()
+        if obsolete_pks:
+            self.filter(pk__in=obsolete_pks).delete()
 
-        if len(entries) > 0:
-            self.bulk_create(entries, batch_size=SKILLFARM_BULK_METHODS_BATCH_SIZE)
+        if update_entries:
+            self.bulk_update(
+                update_entries,
+                fields=list(self.ENTRY_VALUE_FIELDS),
+                batch_size=SKILLFARM_BULK_METHODS_BATCH_SIZE,
+            )
+
+        if create_entries:
+            self.bulk_create(
+                create_entries, batch_size=SKILLFARM_BULK_METHODS_BATCH_SIZE
+            )
+        return dict(changed_rows)
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:02
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("skillfarm", "0002_alter_evetypeprice_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="characterupdatestatus",
+            name="next_due_at",
+            field=models.DateTimeField(
+                db_index=True,
+                default=None,
+                help_text="Next update is due at this time",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:22
+
+# Django
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def remove_duplicate_skills(apps, schema_editor):
+    """Keep only the newest row of each character skill before adding the constraint."""
+    CharacterSkill = apps.get_model("skillfarm", "CharacterSkill")
+    duplicates = (
+        CharacterSkill.objects.values("character_id", "eve_type_id")
+        .annotate(count=Count("pk"), keep_pk=Max("pk"))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        CharacterSkill.objects.filter(
+            character_id=duplicate["character_id"],
+            eve_type_id=duplicate["eve_type_id"],
+        ).exclude(pk=duplicate["keep_pk"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("eve_sde", "0036_remove_star_name"),
+        ("skillfarm", "0003_characterupdatestatus_next_due_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_skills, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="characterskill",
+            constraint=models.UniqueConstraint(
+                fields=("character", "eve_type"),
+                name="skillfarm_characterskill_unique_character_eve_type",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:27
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("skillfarm", "0004_characterskill_unique_character_eve_type"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="characterupdatestatus",
+            name="payload_digest",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Digest of the last stored ESI payload",
+                max_length=64,
+            ),
+        ),
+    ]
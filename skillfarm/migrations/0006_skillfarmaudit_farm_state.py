@@ -0,0 +1,122 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:32
+
+# Django
+from django.db import migrations, models
+from django.db.models import F, Sum
+from django.utils import timezone
+
+
+def populate_farm_state(apps, schema_editor):
+    """Compute the farm state of the existing characters from their stored data."""
+    SkillFarmAudit = apps.get_model("skillfarm", "SkillFarmAudit")
+    SkillFarmSetup = apps.get_model("skillfarm", "SkillFarmSetup")
+    CharacterSkill = apps.get_model("skillfarm", "CharacterSkill")
+    CharacterSkillqueueEntry = apps.get_model("skillfarm", "CharacterSkillqueueEntry")
+
+    now = timezone.now()
+    skillsets = dict(
+        SkillFarmSetup.objects.filter(skillset__isnull=False).values_list(
+            "character_id", "skillset"
+        )
+    )
+    characters = []
+    for character in SkillFarmAudit.objects.all():
+        skillset = skillsets.get(character.pk)
+        skills = CharacterSkill.objects.filter(character=character)
+        skillqueue = CharacterSkillqueueEntry.objects.filter(
+            character=character,
+            start_date__isnull=False,
+            finish_date__isnull=False,
+        )
+        character.is_training = skillqueue.filter(
+            start_date__lt=now, finish_date__gt=now
+        ).exists()
+        character.queue_finish_at = (
+            skillqueue.order_by("-finish_date")
+            .values_list("finish_date", flat=True)
+            .first()
+        )
+        character.extraction_ready_count = skills.filter(
+            trained_skill_level=5, eve_type__name__in=skillset or []
+        ).count()
+        character.extraction_ready_in_queue = skillqueue.filter(
+            finish_date__gt=F("start_date"),
+            finish_date__lt=now,
+            finished_level=5,
+            eve_type__name__in=skillset or [],
+        ).count()
+        character.total_sp = (
+            skills.aggregate(total_sp=Sum("skillpoints_in_skill"))["total_sp"] or 0
+        )
+        character.has_skillset = skillset is not None
+        characters.append(character)
+    SkillFarmAudit.objects.bulk_update(
+        characters,
+        fields=[
+            "is_training",
+            "queue_finish_at",
+            "extraction_ready_count",
+            "extraction_ready_in_queue",
+            "total_sp",
+            "has_skillset",
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("skillfarm", "0005_characterupdatestatus_payload_digest"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="skillfarmaudit",
+            name="extraction_ready_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Trained skills of the skillset ready for extraction",
+            ),
+        ),
+        migrations.AddField(
+            model_name="skillfarmaudit",
+            name="extraction_ready_in_queue",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Finished queue skills of the skillset ready for extraction",
+            ),
+        ),
+        migrations.AddField(
+            model_name="skillfarmaudit",
+            name="has_skillset",
+            field=models.BooleanField(
+                default=False, help_text="The character has a skillset filter"
+            ),
+        ),
+        migrations.AddField(
+            model_name="skillfarmaudit",
+            name="is_training",
+            field=models.BooleanField(
+                default=False, help_text="A skill was in training at the last update"
+            ),
+        ),
+        migrations.AddField(
+            model_name="skillfarmaudit",
+            name="queue_finish_at",
+            field=models.DateTimeField(
+                blank=True,
+                default=None,
+                help_text="Finish date of the last skill in the training queue",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="skillfarmaudit",
+            name="total_sp",
+            field=models.BigIntegerField(
+                default=0, help_text="Total trained skillpoints"
+            ),
+        ),
+        migrations.RunPython(populate_farm_state, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:35
+
+# Django
+from django.db import migrations, models
+
+
+def populate_skillset_type_ids(apps, schema_editor):
+    """Resolve the skill names of the existing skillsets to EVE type ids."""
+    SkillFarmSetup = apps.get_model("skillfarm", "SkillFarmSetup")
+    ItemType = apps.get_model("eve_sde", "ItemType")
+
+    setups = []
+    for setup in SkillFarmSetup.objects.all():
+        if not setup.skillset or not isinstance(setup.skillset, list):
+            continue
+        setup.skillset_type_ids = sorted(
+            ItemType.objects.filter(name__in=setup.skillset).values_list(
+                "id", flat=True
+            )
+        )
+        setups.append(setup)
+    SkillFarmSetup.objects.bulk_update(
+        setups, fields=["skillset_type_ids"], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("eve_sde", "0036_remove_star_name"),
+        ("skillfarm", "0006_skillfarmaudit_farm_state"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="skillfarmsetup",
+            name="skillset_type_ids",
+            field=models.JSONField(
+                blank=True, default=list, help_text="EVE type ids of the skillset"
+            ),
+        ),
+        migrations.RunPython(populate_skillset_type_ids, migrations.RunPython.noop),
+    ]
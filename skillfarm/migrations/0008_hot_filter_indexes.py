@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:36
+
+# Django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("eve_sde", "0036_remove_star_name"),
+        ("skillfarm", "0007_skillfarmsetup_skillset_type_ids"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="characterskill",
+            index=models.Index(
+                fields=["character", "trained_skill_level", "eve_type"],
+                name="skillfarm_skill_extraction_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="characterskillqueueentry",
+            index=models.Index(
+                fields=["character", "start_date", "finish_date"],
+                name="skillfarm_sq_training_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="characterskillqueueentry",
+            index=models.Index(
+                fields=["character", "finished_level", "finish_date"],
+                name="skillfarm_sq_extraction_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="characterupdatestatus",
+            index=models.Index(
+                fields=["character", "section", "is_success", "has_token_error"],
+                name="skillfarm_status_total_idx",
+            ),
+        ),
+    ]
@@ -38,6 +38,8 @@ class UpdateSectionResult(NamedTuple):
     has_token_error: bool = False
     error_message: str | None = None
     data: Any = None
+    changed_rows: int | None = None  # Stored rows that have been written or deleted
+    payload_digest: str | None = None  # Digest of the fetched ESI payload
 
 
 @dataclass(frozen=True)
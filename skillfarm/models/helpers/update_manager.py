@@ -1,5 +1,8 @@
 # Standard Library
-from typing import TYPE_CHECKING
+import datetime
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any
 
 # Django
 from django.db import models
@@ -31,6 +34,25 @@ from skillfarm.providers import AppLogger
 logger = AppLogger(get_extension_logger(__name__), __title__)
 
 
+def _payload_json_default(obj: Any) -> Any:
+    """Convert the ESI response objects into JSON serializable values."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (datetime.date, datetime.datetime)):
+        return obj.isoformat()
+    if hasattr(obj, "__dict__"):
+        return vars(obj)
+    return str(obj)
+
+
+def get_payload_digest(data: Any) -> str:
+    """Return a stable SHA-256 digest of an ESI payload."""
+    payload = json.dumps(
+        data, default=_payload_json_default, sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
 class UpdateStatus(models.TextChoices):
     DISABLED = "disabled", _("Disabled")
     TOKEN_ERROR = "token_error", _("Token Error")
@@ -165,16 +187,32 @@ class UpdateManager:
             has_token_error=False,
         )
 
+    def get_payload_digest(self, section: models.TextChoices) -> str:
+        """Return the payload digest of the last stored update of a section."""
+        return (
+            self.update_status.objects.filter(character=self.character, section=section)
+            .values_list("payload_digest", flat=True)
+            .first()
+        ) or ""
+
     def update_section_if_changed(
-        self, section: models.TextChoices, fetch_func, force_refresh: bool = False
+        self,
+        section: models.TextChoices,
+        fetch_func,
+        force_refresh: bool = False,
+        previous_digest: str | None = None,
     ):
         """
         Handle updating a specific section if there are changes.
 
+        The fetched payload is compared by digest with the last stored payload,
+        so an unchanged payload skips the write even on a forced refresh.
+
         Args:
             section (models.TextChoices): The section to update.
             fetch_func (Callable): The function to fetch the data for the section.
             force_refresh (bool): Whether to force a refresh of the data.
+            previous_digest (str): Digest of the last stored payload, loaded from the update status if None.
         Returns:
             UpdateSectionResult: The result of the update operation.
         Raises:
@@ -184,9 +222,6 @@ class UpdateManager:
         section = self.update_section(section)
         try:
             data = fetch_func(character=self.character, force_refresh=force_refresh)
-            logger.debug(
-                "%s: Update has changed, section: %s", self.character, section.label
-            )
         except HTTPNotModified:
             logger.debug(
                 "%s: Update has not changed, section: %s", self.character, section.label
@@ -207,10 +242,28 @@ class UpdateManager:
                 has_token_error=True,
                 error_message=error_message,
             )
+
+        payload_digest = get_payload_digest(data)
+        if previous_digest is None:
+            previous_digest = self.get_payload_digest(section)
+        if payload_digest == previous_digest:
+            logger.debug(
+                "%s: Update payload has not changed, section: %s",
+                self.character,
+                section.label,
+            )
+            return UpdateSectionResult(
+                is_changed=False, is_updated=False, payload_digest=payload_digest
+            )
+
+        logger.debug(
+            "%s: Update has changed, section: %s", self.character, section.label
+        )
         return UpdateSectionResult(
             is_changed=True,
             is_updated=True,
             data=data,
+            payload_digest=payload_digest,
         )
 
     def update_section_log(
@@ -232,6 +285,8 @@ class UpdateManager:
             "has_token_error": result.has_token_error,
             "last_run_finished_at": timezone.now(),
         }
+        if result.is_changed and result.payload_digest:
+            defaults["payload_digest"] = result.payload_digest
         obj = self.update_status.objects.update_or_create(
             character=self.character,
             section=section,
@@ -241,6 +296,9 @@ class UpdateManager:
             obj.last_update_at = obj.last_run_at
             obj.last_update_finished_at = timezone.now()
             obj.save()
+        if is_success:
+            self.update_status.objects.filter(pk=obj.pk).set_next_due_at(section)
+        type(self.character).objects.filter(pk=self.character.pk).invalidate_api_cache()
         status = "successfully" if is_success else "with errors"
         logger.info(
             "%s: %s Update run completed %s", self.character, section.label, status
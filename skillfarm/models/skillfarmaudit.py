@@ -68,6 +68,28 @@ class SkillFarmAudit(models.Model):
 
     is_read = models.BooleanField(default=False, help_text="Mark Character as read")
 
+    # Farm state, recomputed after each skills/skillqueue update
+    is_training = models.BooleanField(
+        default=False, help_text="A skill was in training at the last update"
+    )
+    queue_finish_at = models.DateTimeField(
+        null=True,
+        default=None,
+        blank=True,
+        help_text="Finish date of the last skill in the training queue",
+    )
+    extraction_ready_count = models.PositiveIntegerField(
+        default=0, help_text="Trained skills of the skillset ready for extraction"
+    )
+    extraction_ready_in_queue = models.PositiveIntegerField(
+        default=0,
+        help_text="Finished queue skills of the skillset ready for extraction",
+    )
+    total_sp = models.BigIntegerField(default=0, help_text="Total trained skillpoints")
+    has_skillset = models.BooleanField(
+        default=False, help_text="The character has a skillset filter"
+    )
+
     def __str__(self):
         return f"{self.character.character_name} - Active: {self.active}"
 
@@ -79,6 +101,40 @@ class SkillFarmAudit(models.Model):
             "esi-skills.read_skillqueue.v1",
         ]
 
+    @classmethod
+    def get_section_manager(
+        cls, section: CharacterUpdateSection
+    ) -> SkillManager | SkillqueueManager:
+        """Return the model manager which stores the data of a section."""
+        section_managers = {
+            CharacterUpdateSection.SKILLS: CharacterSkill.objects,
+            CharacterUpdateSection.SKILLQUEUE: CharacterSkillqueueEntry.objects,
+        }
+        return section_managers[section]
+
+    @classmethod
+    def get_tokens(cls, characters: list["SkillFarmAudit"]) -> dict[int, Token]:
+        """
+        Helper method to get the valid tokens for many characters with specific scopes.
+
+        Returns:
+            dict[int, Token]: Mapping of character pk to its newest valid token.
+            Characters without a valid token are not included.
+        """
+        character_pks = {
+            character.character.character_id: character.pk for character in characters
+        }
+        tokens = (
+            Token.objects.filter(character_id__in=character_pks)
+            .require_scopes(cls.get_esi_scopes())
+            .require_valid()
+            .order_by("-created")
+        )
+        character_tokens = {}
+        for token in tokens:
+            character_tokens.setdefault(character_pks[token.character_id], token)
+        return character_tokens
+
     def get_token(self) -> Token:
         """Helper method to get a valid token for a specific character with specific scopes."""
         token = (
@@ -125,12 +181,15 @@ class SkillFarmAudit(models.Model):
     @property
     def is_filtered(self) -> bool:
         """Check if the character has Skill Queue filter active."""
+        return self.has_skillset
+
+    @property
+    def is_training_active(self) -> bool:
+        """Check if the character is still training since the last update."""
         return (
-            self.skillfarm_skillqueue.skill_filtered(self).exists()
-            or SkillFarmSetup.objects.filter(
-                character=self,
-                skillset__isnull=False,
-            ).exists()
+            self.is_training
+            and self.queue_finish_at is not None
+            and self.queue_finish_at > timezone.now()
         )
 
     @property
@@ -149,11 +208,11 @@ class SkillFarmAudit(models.Model):
 
     @property
     def extraction_icon(self) -> str:
-        if self.skillfarm_skills.extractions(self).exists():
+        if self.extraction_ready_count:
             return format_html(
                 render_to_string("skillfarm/partials/icons/extraction_ready.html")
             )
-        if self.skillfarm_skillqueue.extractions(self).exists():
+        if self.extraction_ready_in_queue:
             return format_html(
                 render_to_string("skillfarm/partials/icons/extraction_sb_ready.html")
             )
@@ -209,9 +268,28 @@ class SkillFarmSetup(models.Model):
 
     skillset = models.JSONField(default=dict, blank=True, null=True)
 
+    skillset_type_ids = models.JSONField(
+        default=list, blank=True, help_text="EVE type ids of the skillset"
+    )
+
     def __str__(self):
         return f"{self.skillset}'s Skill Setup"
 
+    def save(self, *args, **kwargs):
+        # Keep the type ids in sync, the extraction filters match by id
+        self.skillset_type_ids = self.get_skillset_type_ids()
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "skillset_type_ids"}
+        super().save(*args, **kwargs)
+
+    def get_skillset_type_ids(self) -> list[int]:
+        """Return the sorted EVE type ids of the skill names in the skillset."""
+        if not self.skillset or not isinstance(self.skillset, list):
+            return []
+        return sorted(
+            EveType.objects.filter(name__in=self.skillset).values_list("id", flat=True)
+        )
+
 
 class CharacterSkill(models.Model):
     """Skillfarm Character Skill model for app"""
@@ -220,6 +298,19 @@ class CharacterSkill(models.Model):
 
     class Meta:
         default_permissions = ()
+        constraints = [
+            models.UniqueConstraint(
+                fields=["character", "eve_type"],
+                name="skillfarm_characterskill_unique_character_eve_type",
+            )
+        ]
+        indexes = [
+            # extractions()
+            models.Index(
+                fields=["character", "trained_skill_level", "eve_type"],
+                name="skillfarm_skill_extraction_idx",
+            ),
+        ]
 
     name = models.CharField(max_length=255, blank=True, null=True)
 
@@ -247,6 +338,18 @@ class CharacterSkillqueueEntry(models.Model):
 
     class Meta:
         default_permissions = ()
+        indexes = [
+            # skill_in_training()
+            models.Index(
+                fields=["character", "start_date", "finish_date"],
+                name="skillfarm_sq_training_idx",
+            ),
+            # extractions()
+            models.Index(
+                fields=["character", "finished_level", "finish_date"],
+                name="skillfarm_sq_extraction_idx",
+            ),
+        ]
 
     name = models.CharField(max_length=255, blank=True, null=True)
 
@@ -280,6 +383,13 @@ class CharacterUpdateStatus(models.Model):
 
     class Meta:
         default_permissions = ()
+        indexes = [
+            # annotate_total_update_status(), covers all aggregated columns
+            models.Index(
+                fields=["character", "section", "is_success", "has_token_error"],
+                name="skillfarm_status_total_idx",
+            ),
+        ]
 
     objects: UpdateStatusManager = UpdateStatusManager()
 
@@ -317,6 +427,18 @@ class CharacterUpdateStatus(models.Model):
         db_index=True,
         help_text="Last update has been successful finished at this time",
     )
+    next_due_at = models.DateTimeField(
+        default=None,
+        null=True,
+        db_index=True,
+        help_text="Next update is due at this time",
+    )
+    payload_digest = models.CharField(
+        max_length=64,
+        default="",
+        blank=True,
+        help_text="Digest of the last stored ESI payload",
+    )
 
     def __str__(self) -> str:
         return f"{self.character} - {self.section} - {self.is_success}"
@@ -325,6 +447,8 @@ class CharacterUpdateStatus(models.Model):
         """Check if the update is needed."""
         if not self.is_success or not self.last_update_finished_at:
             needs_update = True
+        elif self.next_due_at:
+            needs_update = self.next_due_at <= timezone.now()
         else:
             section_time_stale = app_settings.SKILLFARM_STALE_TYPES.get(
                 self.section, 60
@@ -1,8 +1,10 @@
 """Shared ESI client for Skillfarm."""
 
 # Standard Library
+import datetime
 import logging
 import random
+import time
 from contextlib import contextmanager
 from http import HTTPStatus
 from pathlib import Path
@@ -12,6 +14,8 @@ from aiopenapi3 import RequestError
 from celery import Task
 
 # Django
+from django.core.cache import cache
+from django.dispatch import receiver
 from django.utils import timezone
 
 # Alliance Auth
@@ -19,9 +23,11 @@ from allianceauth.services.hooks import get_extension_logger
 from esi.exceptions import (
     ESIBucketLimitException,
     ESIErrorLimitException,
+    HTTPNotModified,
     HTTPServerError,
 )
 from esi.openapi_clients import ESIClientProvider
+from esi.signals import esi_request_statistics
 
 # AA Skillfarm
 from skillfarm import (
@@ -31,8 +37,9 @@ from skillfarm import (
     __operations__,
     __title__,
     __version__,
+    app_settings,
 )
-from skillfarm.errors import DownTimeError
+from skillfarm.errors import DownTimeError, ESICircuitOpenError
 
 spec_file = Path(__file__).parent / "openapi_2026-06-09.json"
 esi = ESIClientProvider(
@@ -46,6 +53,10 @@ esi = ESIClientProvider(
 
 DOWNTIME_TIMER = 60 * 10  # 10 minutes
 
+# ESI's daily downtime window in UTC
+ESI_DOWNTIME_START = datetime.time(11, 0)
+ESI_DOWNTIME_END = datetime.time(11, 15)
+
 
 class AppLogger(logging.LoggerAdapter):
     """
@@ -86,6 +97,279 @@ class AppLogger(logging.LoggerAdapter):
 logger = AppLogger(my_logger=get_extension_logger(__name__), prefix=__title__)
 
 
+class ESIRateGovernor:
+    """
+    ESI rate governor shared by all Celery workers through the Django cache.
+
+    Outgoing requests are paced with a token bucket which is refilled every
+    second. The remaining ESI error budget is read from the response headers
+    and all requests are paused until the error window resets once the budget
+    drops below the configured minimum.
+    """
+
+    BUCKET_KEY = "skillfarm:esi_governor:bucket:{}"
+    PAUSE_KEY = "skillfarm:esi_governor:pause"
+
+    def __init__(self, rate: int, error_budget_min: int):
+        """
+        Initializes the governor.
+
+        :param rate: Max requests per second for all workers, 0 disables pacing
+        :type rate: int
+        :param error_budget_min: Remaining ESI errors at which all requests are paused
+        :type error_budget_min: int
+        """
+        self.rate = rate
+        self.error_budget_min = error_budget_min
+
+    def get_pause(self) -> float:
+        """Return the seconds until requests are allowed again."""
+        paused_until = cache.get(self.PAUSE_KEY)
+        if paused_until is None:
+            return 0
+        return max(0, paused_until - time.time())
+
+    def pause(self, seconds: float) -> None:
+        """Pause all requests for the given seconds."""
+        cache.set(self.PAUSE_KEY, time.time() + seconds, timeout=int(seconds) + 1)
+
+    def update_from_headers(self, headers: dict) -> None:
+        """Pause all requests when the ESI error budget is nearly used up."""
+        headers = {key.lower(): value for key, value in (headers or {}).items()}
+        remain = headers.get("x-esi-error-limit-remain")
+        reset = headers.get("x-esi-error-limit-reset")
+        if remain is None or reset is None:
+            return
+        if int(remain) <= self.error_budget_min:
+            logger.warning(
+                "ESI error budget nearly used up (%s left). Pausing requests for %s seconds.",
+                remain,
+                reset,
+            )
+            self.pause(int(reset))
+
+    def acquire(self) -> None:
+        """
+        Wait for a free slot before sending an ESI request.
+
+        :raises ESIErrorLimitException: When requests are paused because of the error budget.
+        """
+        pause = self.get_pause()
+        if pause > 0:
+            raise ESIErrorLimitException(reset=pause)
+        if not self.rate:
+            return
+
+        while True:
+            now = time.time()
+            key = self.BUCKET_KEY.format(int(now))
+            cache.add(key, 0, timeout=2)
+            try:
+                if cache.incr(key) <= self.rate:
+                    return
+            except ValueError:
+                # The bucket expired between add and incr
+                continue
+            time.sleep(int(now) + 1 - now)
+
+
+esi_governor = ESIRateGovernor(
+    rate=app_settings.SKILLFARM_ESI_RATE_LIMIT,
+    error_budget_min=app_settings.SKILLFARM_ESI_ERROR_BUDGET_MIN,
+)
+
+
+# pylint: disable=unused-argument
+@receiver(esi_request_statistics)
+def update_esi_governor(sender, headers: dict = None, **kwargs):
+    """Feed the response headers of each ESI request to the governor."""
+    esi_governor.update_from_headers(headers)
+
+
+class ESICircuitBreaker:
+    """
+    ESI circuit breaker shared by all Celery workers through the Django cache.
+
+    The breaker opens after `threshold` outage errors (HTTP 502/503/504 or
+    request errors) within `window` seconds. While it is open no request is
+    sent to ESI. After `cooldown` seconds it is half-open and admits one probe
+    request per `probe_interval` seconds. A successful probe closes the
+    breaker, a failed probe opens it again.
+    """
+
+    FAILURES_KEY = "skillfarm:esi_breaker:failures"
+    STATE_KEY = "skillfarm:esi_breaker:open_until"
+    PROBE_KEY = "skillfarm:esi_breaker:probe"
+
+    def __init__(
+        self,
+        threshold: int,
+        cooldown: int,
+        window: int = 60,
+        probe_interval: int = 10,
+    ):
+        """
+        Initializes the circuit breaker.
+
+        :param threshold: Outage errors within the window to open the breaker
+        :type threshold: int
+        :param cooldown: Seconds the breaker stays open
+        :type cooldown: int
+        :param window: Seconds in which the outage errors are counted
+        :type window: int
+        :param probe_interval: Seconds between two probe requests while half-open
+        :type probe_interval: int
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.window = window
+        self.probe_interval = probe_interval
+
+    @staticmethod
+    def is_outage(exc: Exception) -> bool:
+        """Return True if the exception indicates an ESI outage."""
+        if isinstance(exc, RequestError):
+            return True
+        return isinstance(exc, HTTPServerError) and exc.status_code in [
+            HTTPStatus.BAD_GATEWAY,
+            HTTPStatus.SERVICE_UNAVAILABLE,
+            HTTPStatus.GATEWAY_TIMEOUT,
+        ]
+
+    def get_open_time(self) -> float:
+        """Return the seconds until the breaker is half-open, 0 if it is not open."""
+        open_until = cache.get(self.STATE_KEY)
+        if open_until is None:
+            return 0
+        return max(0, open_until - time.time())
+
+    def is_open(self) -> bool:
+        """Return True if the breaker is open."""
+        return self.get_open_time() > 0
+
+    def open(self) -> None:
+        """Open the breaker for the cooldown time."""
+        logger.warning(
+            "ESI circuit breaker opened. Pausing ESI requests for %s seconds.",
+            self.cooldown,
+        )
+        cache.set(
+            self.STATE_KEY,
+            time.time() + self.cooldown,
+            timeout=self.cooldown * 4,
+        )
+        cache.delete(self.FAILURES_KEY)
+
+    def before_request(self) -> None:
+        """
+        Check if a request may be sent to ESI.
+
+        :raises ESICircuitOpenError: When the breaker is open or the probe slot is taken.
+        """
+        open_until = cache.get(self.STATE_KEY)
+        if open_until is None:
+            return
+        open_time = open_until - time.time()
+        if open_time > 0:
+            raise ESICircuitOpenError(reset=open_time)
+        # Half-open, admit one probe per interval
+        if not cache.add(self.PROBE_KEY, 1, timeout=self.probe_interval):
+            raise ESICircuitOpenError(reset=self.probe_interval)
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request."""
+        if cache.get(self.STATE_KEY) is not None:
+            logger.info("ESI circuit breaker closed.")
+            cache.delete_many([self.STATE_KEY, self.PROBE_KEY, self.FAILURES_KEY])
+
+    def record_failure(self) -> None:
+        """Count an outage error and open the breaker when the threshold is reached."""
+        if cache.get(self.STATE_KEY) is not None:
+            # A failed probe opens the breaker again
+            self.open()
+            return
+        cache.add(self.FAILURES_KEY, 0, timeout=self.window)
+        try:
+            failures = cache.incr(self.FAILURES_KEY)
+        except ValueError:
+            return
+        if failures >= self.threshold:
+            self.open()
+
+    @contextmanager
+    def guard(self):
+        """
+        Context manager for one ESI request.
+
+        :raises ESICircuitOpenError: When the breaker does not admit the request.
+        """
+        self.before_request()
+        try:
+            yield
+        except HTTPNotModified:
+            self.record_success()
+            raise
+        except Exception as exc:
+            if self.is_outage(exc):
+                self.record_failure()
+            raise
+        self.record_success()
+
+
+esi_breaker = ESICircuitBreaker(
+    threshold=app_settings.SKILLFARM_ESI_BREAKER_THRESHOLD,
+    cooldown=app_settings.SKILLFARM_ESI_BREAKER_COOLDOWN,
+)
+
+
+def is_esi_daily_downtime() -> bool:
+    """Checks if the current time is within ESI's daily downtime window (11:00 - 11:15 UTC)."""
+    return ESI_DOWNTIME_START <= timezone.now().time() <= ESI_DOWNTIME_END
+
+
+def get_esi_downtime_countdown() -> int:
+    """Return the seconds until ESI's daily downtime is over, 0 outside of the downtime."""
+    now = timezone.now()
+    if not ESI_DOWNTIME_START <= now.time() <= ESI_DOWNTIME_END:
+        return 0
+    downtime_end = datetime.datetime.combine(
+        now.date(), ESI_DOWNTIME_END, tzinfo=now.tzinfo
+    )
+    return int((downtime_end - now).total_seconds()) + 1
+
+
+def get_esi_retry_info(exc: Exception) -> tuple[float, str] | None:
+    """
+    Return the retry delay and issue for a retryable ESI error.
+
+    :param exc: Exception raised during an ESI request
+    :return: Tuple of (retry_after, issue) or None if the error is not retryable.
+    """
+    if isinstance(exc, ESIErrorLimitException):
+        return exc.reset, "ESI Error Limit Reached"
+    if isinstance(exc, ESIBucketLimitException):
+        return exc.reset, f"ESI Bucket Limit Reached for {exc.bucket}"
+    if isinstance(exc, HTTPServerError) and exc.status_code in [
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    ]:
+        return DOWNTIME_TIMER, f"ESI seems to be down (HTTP {exc.status_code})"
+    if isinstance(exc, RequestError):
+        return DOWNTIME_TIMER, "Request Error"
+    if isinstance(exc, DownTimeError):
+        return get_esi_downtime_countdown() or DOWNTIME_TIMER, "Downtime Error"
+    if isinstance(exc, ESICircuitOpenError):
+        return exc.reset, "ESI circuit breaker is open"
+    return None
+
+
+def get_retry_countdown(retry_after: float, retries: int) -> float:
+    """Return the countdown for a retry with backoff jitter."""
+    backoff_jitter = int(random.uniform(2, 5) ** retries)
+    return retry_after + backoff_jitter
+
+
 @contextmanager
 def retry_task_on_esi_error(task: Task):
     """Retry Task when a ESI error occurs.
@@ -99,6 +383,7 @@ def retry_task_on_esi_error(task: Task):
     - HTTPError with status codes 502, 503, 504 (server errors)
     - Request errors (RequestError)
     - Downtime errors (DownTimeError, e.g. ESI's daily downtime from 11:00 to 11:15 UTC)
+    - Open ESI circuit breaker (ESICircuitOpenError)
 
     :param task: Celery Task instance
     :return: Context manager that retries the task on ESI errors.
@@ -106,8 +391,7 @@ def retry_task_on_esi_error(task: Task):
     """
 
     def retry(exc: Exception, retry_after: float, issue: str):
-        backoff_jitter = int(random.uniform(2, 5) ** task.request.retries)
-        countdown = retry_after + backoff_jitter
+        countdown = get_retry_countdown(retry_after, task.request.retries)
         if not isinstance(exc, DownTimeError):
             logger.warning(
                 "ESI Error encountered: %s. Retrying after %.2f seconds. Issue: %s",
@@ -117,34 +401,19 @@ def retry_task_on_esi_error(task: Task):
             )
         raise task.retry(countdown=countdown, exc=exc)
 
-    def daily_downtime():
-        """Checks if the current time is within ESI's daily downtime window (11:00 - 11:15 UTC)."""
-        is_downtime = (
-            timezone.now().time() >= timezone.datetime.strptime("11:00", "%H:%M").time()
-            and timezone.now().time()
-            <= timezone.datetime.strptime("11:15", "%H:%M").time()
-        )
-        if not is_downtime:
-            return False
-        return True
-
     try:
-        if daily_downtime():
+        if is_esi_daily_downtime():
             raise DownTimeError("ESI is in daily downtime")
         yield
-    except ESIErrorLimitException as exc:
-        retry(exc, exc.reset, "ESI Error Limit Reached")
-    except ESIBucketLimitException as exc:
-        retry(exc, exc.reset, f"ESI Bucket Limit Reached for {exc.bucket}")
-    except HTTPServerError as exc:
-        if exc.status_code in [
-            HTTPStatus.BAD_GATEWAY,
-            HTTPStatus.SERVICE_UNAVAILABLE,
-            HTTPStatus.GATEWAY_TIMEOUT,
-        ]:
-            retry(exc, DOWNTIME_TIMER, f"ESI seems to be down (HTTP {exc.status_code})")
-        raise exc
-    except RequestError as exc:
-        retry(exc, DOWNTIME_TIMER, "Request Error")
-    except DownTimeError as exc:
-        retry(exc, DOWNTIME_TIMER, "Downtime Error")
+    except (
+        ESIErrorLimitException,
+        ESIBucketLimitException,
+        HTTPServerError,
+        RequestError,
+        DownTimeError,
+        ESICircuitOpenError,
+    ) as exc:
+        retry_info = get_esi_retry_info(exc)
+        if retry_info is None:
+            raise exc
+        retry(exc, *retry_info)
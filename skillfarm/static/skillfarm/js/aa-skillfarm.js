@@ -1,4 +1,4 @@
-/* global aaSkillfarmDeafaultSettings, aaSkillfarmSettingsOverride, objectDeepMerge, bootstrap */
+/* global aaSkillfarmDeafaultSettings, aaSkillfarmSettingsOverride, objectDeepMerge, bootstrap, fetchGet */
 
 /**
  * Default settings for aaSkillfarm
@@ -37,3 +37,62 @@ const _bootstrapTooltip = ({selector = 'body', namespace = 'aa-skillfarm', trigg
             return new bootstrap.Tooltip(tooltipTriggerEl, { trigger });
         });
 };
+
+/**
+ * Escape a value for the use in HTML markup
+ *
+ * @param {*} value Value to escape
+ * @returns {string} The escaped value
+ */
+const _escapeHtml = (value) => {
+    return String(value ?? '')
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;')
+        .replace(/'/g, '&#039;');
+};
+
+/**
+ * DataTables server-side processing with a paged skillfarm API endpoint
+ *
+ * Maps the DataTables request to the `start`, `length`, `search`, `order` and `direction`
+ * query parameters, the `name` of the ordered column is used as `order`.
+ *
+ * @param {string} url URL of the paged API endpoint
+ * @param {Object} [params={}] Additional query parameters
+ * @param {Function} [onData] Called with the API response of each page
+ * @returns {Function} DataTables ajax function
+ */
+const _serverSideAjax = (url, params = {}, onData = null) => {
+    return (request, callback) => {
+        const query = new URLSearchParams({
+            start: request.start,
+            length: request.length,
+            search: request.search.value,
+            ...params,
+        });
+        const order = request.order && request.order[0];
+        if (order && request.columns[order.column].name) {
+            query.set('order', request.columns[order.column].name);
+            query.set('direction', order.dir);
+        }
+
+        fetchGet({url: `${url}?${query.toString()}`})
+            .then((data) => {
+                if (onData) {
+                    onData(data);
+                }
+                callback({
+                    draw: request.draw,
+                    recordsTotal: data.records_total,
+                    recordsFiltered: data.records_filtered,
+                    data: data.characters,
+                });
+            })
+            .catch((error) => {
+                console.error(`Error fetching DataTable page: ${error.message}`);
+                callback({draw: request.draw, recordsTotal: 0, recordsFiltered: 0, data: []});
+            });
+    };
+};
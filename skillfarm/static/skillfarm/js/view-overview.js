@@ -1,4 +1,4 @@
-/* global aaSkillfarmSettings, aaSkillfarmSettingsOverride, _bootstrapTooltip, fetchGet, DataTable */
+/* global aaSkillfarmSettings, aaSkillfarmSettingsOverride, _bootstrapTooltip, _escapeHtml, _serverSideAjax, DataTable */
 
 $(document).ready(() => {
     'use strict';
@@ -9,68 +9,78 @@ $(document).ready(() => {
     const OverviewTable = $('#skillfarm-overview');
 
     /**
-     * Table :: Overview
-     * @type {*|jQuery|HTMLElement}
+     * Render the character portrait
+     * @param {Object} data Row data
+     * @returns {string}
+     */
+    const _renderPortrait = (data) => {
+        return `<img class="character-portrait rounded-circle" src="${_escapeHtml(data.portrait_url)}" alt="${_escapeHtml(data.character.character_name)}">`;
+    };
+
+    /**
+     * Render the view skillfarm button
+     * @param {Object} data Row data
+     * @returns {string}
      */
-    fetchGet({
-        url: aaSkillfarmSettings.url.Overview,
-    })
-        .then((data) => {
-            if (data) {
-            /**
-             * Table :: Overview
-             */
-                const overviewDataTable = new DataTable(OverviewTable, {
-                    data: data.characters,
-                    language: aaSkillfarmSettings.dataTables.language,
-                    layout: aaSkillfarmSettings.dataTables.layout,
-                    ordering: aaSkillfarmSettings.dataTables.ordering,
-                    columnControl: aaSkillfarmSettings.dataTables.columnControl,
-                    columns: [
-                        {
-                            data: 'portrait',
-                        },
-                        {
-                            data: {
-                                display: (data) => data.character.character_name,
-                                sort: (data) => data.character.character_name,
-                                filter: (data) => data.character.character_name
-                            }
-                        },
-                        {
-                            data: {
-                                display: (data) => data.character.corporation_name,
-                                sort: (data) => data.character.corporation_name,
-                                filter: (data) => data.character.corporation_name
-                            }
-                        },
-                        {
-                            data: 'action',
-                            className: 'text-end',
-                        }
-                    ],
-                    columnDefs: [
-                        {
-                            orderable: false,
-                            targets: [0, 3],
-                            columnControl: [
-                                {target: 0, content: []},
-                                {target: 1, content: []}
-                            ]
-                        },
+    const _renderViewButton = (data) => {
+        const url = aaSkillfarmSettings.url.Skillfarm.replace('12345', data.character.character_id);
+        return `<a href="${_escapeHtml(url)}">
+            <button class="btn btn-primary btn-sm" data-bs-tooltip="aa-skillfarm" title="${_escapeHtml(aaSkillfarmSettings.translations.showSkillfarm)}">
+                <i class="fa-solid fa-eye"></i>
+            </button>
+        </a>`;
+    };
 
-                    ],
-                    order: [[1, 'asc']],
-                    initComplete: function () {
-                        _bootstrapTooltip({selector: '#skillfarm-overview'});
-                    },
-                    drawCallback: function () {
-                        _bootstrapTooltip({selector: '#skillfarm-overview'});
-                    },
-                });
+    /**
+     * Table :: Overview
+     * Paged, sorted and searched by the API
+     */
+    const overviewDataTable = new DataTable(OverviewTable, {
+        serverSide: true,
+        processing: true,
+        ajax: _serverSideAjax(aaSkillfarmSettings.url.Overview),
+        language: aaSkillfarmSettings.dataTables.language,
+        layout: aaSkillfarmSettings.dataTables.layout,
+        ordering: aaSkillfarmSettings.dataTables.ordering,
+        columnControl: aaSkillfarmSettings.dataTables.columnControl,
+        columns: [
+            {
+                data: null,
+                render: (data, type, row) => _renderPortrait(row)
+            },
+            {
+                data: 'character.character_name',
+                name: 'character_name',
+                render: (data) => _escapeHtml(data)
+            },
+            {
+                data: 'character.corporation_name',
+                name: 'corporation_name',
+                render: (data) => _escapeHtml(data)
+            },
+            {
+                data: null,
+                render: (data, type, row) => _renderViewButton(row),
+                className: 'text-end',
             }
-        })
-        .catch((error) => {
-            console.error('Error fetching Overview DataTable:', error);
-        });
+        ],
+        columnDefs: [
+            {
+                orderable: false,
+                targets: [0, 3],
+                columnControl: [
+                    {target: 0, content: []},
+                    {target: 1, content: []}
+                ]
+            },
+
+        ],
+        order: [[1, 'asc']],
+        initComplete: function () {
+            _bootstrapTooltip({selector: '#skillfarm-overview'});
+        },
+        drawCallback: function () {
+            _bootstrapTooltip({selector: '#skillfarm-overview'});
+        },
+    });
 });
@@ -1,4 +1,4 @@
-/* global aaSkillfarmSettings, aaSkillfarmSettingsOverride, _bootstrapTooltip, fetchGet, fetchPost, DataTable, SlimSelect */
+/* global aaSkillfarmSettings, aaSkillfarmSettingsOverride, _bootstrapTooltip, _escapeHtml, _serverSideAjax, fetchGet, fetchPost, DataTable, SlimSelect */
 $(document).ready(() => {
 
     /**
@@ -11,146 +11,316 @@ $(document).ready(() => {
     const SkillfarmSkillsTable = $('#skillfarm-skills');
 
     /**
-     * Reload Skillfarm DataTables
-     *
-     * @param {Object} tableData # Ajax API Response Data
+     * Update status text classes
+     */
+    const updateStatusStyles = {
+        disabled: 'text-muted',
+        token_error: 'text-warning',
+        incomplete: 'text-warning',
+        in_progress: 'text-info',
+        error: 'text-danger',
+        ok: 'text-success',
+    };
+
+    /**
+     * Replace the character id placeholder of an URL
+     * @param {string} url URL with the 12345 placeholder
+     * @param {number} characterId Character ID
+     * @returns {string}
+     * @private
+     */
+    const _characterUrl = (url, characterId) => url.replace('12345', characterId);
+
+    /**
+     * Render the character with portrait, update status and notification icon
+     * @param {Object} data Row data
+     * @returns {string}
      * @private
      */
-    const _reloadSkillFarmDataTable = (tableData) => {
-        const dtActive = SkillfarmDetailsTable.DataTable();
-        dtActive.clear().rows.add(tableData.active_characters).draw();
-        // Inactive Table
-        const dtInactive = SkillfarmInactiveTable.DataTable();
-        dtInactive.clear().rows.add(tableData.inactive_characters).draw();
-        // reload Extractor Count
-        $('#skillExtractorLabel').text(tableData && tableData.skill_extraction_count != null ? tableData.skill_extraction_count : 'N/A');
+    const _renderCharacter = (data) => {
+        const details = data.details;
+        const t = aaSkillfarmSettings.translations;
+        const characterName = _escapeHtml(data.character.character_name);
+        const portrait = `<img class="character-portrait rounded-circle" src="${_escapeHtml(data.portrait_url)}" alt="${characterName}">`;
+        const status = `<span class='${updateStatusStyles[details.update_status] || ''}' data-tooltip-toggle='skillfarm-tooltip' title='${_escapeHtml(details.update_status_description)}'>⬤</span>`;
+        const notification = `<i class='fa-solid fa-bullhorn' style='margin-left: 5px; color: ${details.notification ? 'green' : 'gray'};' data-bs-tooltip="aa-skillfarm" title="${_escapeHtml(details.notification ? t.notificationActivated : t.notificationDeactivated)}"></i>`;
+        return `${portrait} ${characterName} ${status} - ${notification}`;
     };
 
-    fetchGet({
-        url: aaSkillfarmSettings.url.Skillfarm.replace('12345', aaSkillfarmSettings.characterPk),
-    })
-        .then((data) => {
-            if (data) {
-                // Set extraction count from the full response object
-                $('#skillExtractorLabel').text(data && data.skill_extraction_count != null ? data.skill_extraction_count : 'N/A');
-                /**
-                 * Table :: Active Characters
-                 */
-                const activeDataTable = new DataTable(SkillfarmDetailsTable, {
-                    data: data.active_characters,
-                    language: aaSkillfarmSettings.dataTables.language,
-                    layout: aaSkillfarmSettings.dataTables.layout,
-                    ordering: aaSkillfarmSettings.dataTables.ordering,
-                    columnControl: aaSkillfarmSettings.dataTables.columnControl,
-                    order: [[0, 'asc']],
-                    columns: [
-                        { data: 'character.character_html' },
-                        { data: 'details.progress' },
-                        { data: 'details.is_extraction_ready'},
-                        { data: 'details.last_update' },
-                        { data: 'details.is_filter'},
-                        { data: 'actions'},
-                    ],
-                    pageLength: 25,
-                    columnDefs: [
-                        {
-                            targets: [2, 4, 5],
-                            orderable: false,
-                            columnControl: [
-                                {target: 0, content: []},
-                                {target: 1, content: []}
-                            ]
-                        },
-                        {
-                            targets: [4],
-                            width: 45
-                        },
-                        {
-                            targets: [2, 5],
-                            width: 115
-                        },
-                    ],
-                    initComplete: function () {
-                        _bootstrapTooltip({selector: '#skillfarm-details'});
-                    },
-                    drawCallback: function () {
-                        _bootstrapTooltip({selector: '#skillfarm-details'});
-                    },
-                    rowCallback: function (row, data, index) {
-                        const details = data && data.details;
-                        const status = details && details.update_status;
-                        if (status === 'error') {
-                            $(row).addClass('table-stripe-red');
-                        } else if (status === 'in_progress') {
-                            $(row).addClass('table-stripe-info');
-                        } else if (status === 'incomplete' || status === 'token_error') {
-                            $(row).addClass('table-stripe-warning');
-                        }
-
-                        const extractionFlag = details && details.is_extraction_ready;
-                        if (extractionFlag && typeof extractionFlag.includes === 'function') {
-                            if (extractionFlag.includes('skillfarm-skill-extractor-maybe')) {
-                                $(row).addClass('table-stripe-warning');
-                            } else if (extractionFlag.includes('skillfarm-skill-extractor')) {
-                                $(row).addClass('table-stripe-red');
-                            }
-                        }
-                    },
-                });
-                /**
-                 * Table :: Inactive Characters
-                 */
-                const inactiveDataTable = new DataTable(SkillfarmInactiveTable, {
-                    data: data.inactive_characters,
-                    language: aaSkillfarmSettings.dataTables.language,
-                    layout: aaSkillfarmSettings.dataTables.layout,
-                    ordering: aaSkillfarmSettings.dataTables.ordering,
-                    columnControl: aaSkillfarmSettings.dataTables.columnControl,
-                    order: [[0, 'asc']],
-                    columns: [
-                        { data: 'character.character_html' },
-                        { data: 'details.progress' },
-                        { data: 'details.is_extraction_ready', orderable: false },
-                        { data: 'details.last_update' },
-                        { data: 'details.is_filter', orderable: false },
-                        { data: 'actions', orderable: false },
-                    ],
-                    initComplete: function () {
-                        _bootstrapTooltip({selector: '#skillfarm-inactive'});
-                    },
-                    drawCallback: function () {
-                        _bootstrapTooltip({selector: '#skillfarm-inactive'});
-                    },
-                    rowCallback: function (row, data, index) {
-                        const details = data && data.details;
-                        const status = details && details.update_status;
-                        if (status === 'error') {
-                            $(row).addClass('table-stripe-red');
-                        } else if (status === 'in_progress') {
-                            $(row).addClass('table-stripe-info');
-                        } else if (status === 'incomplete' || status === 'token_error') {
-                            $(row).addClass('table-stripe-warning');
-                        }
-
-                        const extractionFlag = details && details.is_extraction_ready;
-                        if (extractionFlag && typeof extractionFlag.includes === 'function') {
-                            if (extractionFlag.includes('skillfarm-skill-extractor-maybe')) {
-                                $(row).addClass('table-stripe-warning');
-                            } else if (extractionFlag.includes('skillfarm-skill-extractor')) {
-                                $(row).addClass('table-stripe-red');
-                            }
-                        }
-
-                        if (details && details.is_read === true) {
-                            $(row).addClass('opacity-25');
-                        }
-                    },
-                });
+    /**
+     * Render the skillqueue progress bar
+     * @param {Object} details Row details
+     * @returns {string}
+     * @private
+     */
+    const _renderProgress = (details) => {
+        if (!details.is_training) {
+            return _escapeHtml(aaSkillfarmSettings.translations.noActiveTraining);
+        }
+        const progress = Number(details.progress || 0).toFixed(2);
+        return `<div class="progress-outer flex-grow-1 me-2">
+            <div class="progress" style="position: relative;">
+                <div class="progress-bar progress-bar-warning progress-bar-striped active" role="progressbar" style="width: ${progress}%; box-shadow: -1px 3px 5px rgba(0, 180, 231, 0.9);"></div>
+                <div class="fw-bold fs-6 text-center position-absolute top-50 start-50 translate-middle">
+                    <span class="${progress > 50 ? 'text-white' : 'text-dark'}">${progress}%</span>
+                </div>
+            </div>
+        </div>`;
+    };
+
+    /**
+     * Render the extraction ready icon
+     * @param {Object} details Row details
+     * @returns {string}
+     * @private
+     */
+    const _renderExtraction = (details) => {
+        const t = aaSkillfarmSettings.translations;
+        const image = `<img src="${_escapeHtml(aaSkillfarmSettings.images.skillExtractor)}" class="rounded-circle" style="width: 32px">`;
+        if (details.extraction_ready) {
+            return `${image}<i class="fas fa-exclamation-triangle" style="margin-left: 5px; color: red" data-bs-tooltip="aa-skillfarm" title="${_escapeHtml(t.extractionReady)}"></i>`;
+        }
+        if (details.extraction_ready_in_queue) {
+            return `${image}<i class="fas fa-question" style="margin-left: 5px; color: orange" data-bs-tooltip="aa-skillfarm" title="${_escapeHtml(t.extractionMaybeReady)}"></i>`;
+        }
+        return '';
+    };
+
+    /**
+     * Render the skillset filter status icon
+     * @param {Object} details Row details
+     * @returns {string}
+     * @private
+     */
+    const _renderFilter = (details) => {
+        const t = aaSkillfarmSettings.translations;
+        return `<button class="btn bg-gradient rounded-circle ${details.is_filter ? 'btn-success' : 'btn-danger'}" style="height: 32px; width: 32px;" data-bs-tooltip="aa-skillfarm" title="${_escapeHtml(details.is_filter ? t.filterActive : t.filterInactive)}"></button>`;
+    };
+
+    /**
+     * Render an action button that opens a modal
+     * @param {Object} options Button options
+     * @returns {string}
+     * @private
+     */
+    const _renderActionButton = ({style, target, action, api = null, title, icon}) => {
+        const apiAttribute = api ? ` data-api="${_escapeHtml(api)}"` : '';
+        return `<button type="button" class="btn btn-${style} btn-sm btn-square me-2" data-bs-toggle="modal" data-bs-target="#${target}" data-bs-tooltip="aa-skillfarm" data-action="${_escapeHtml(action)}"${apiAttribute} title="${_escapeHtml(title)}"><span class="fas ${icon}"></span></button>`;
+    };
+
+    /**
+     * Render the action buttons of a character
+     * @param {Object} data Row data
+     * @returns {string}
+     * @private
+     */
+    const _renderActions = (data) => {
+        const url = aaSkillfarmSettings.url;
+        const t = aaSkillfarmSettings.translations;
+        const characterId = data.character.character_id;
+        const details = data.details;
+        const actions = [
+            _renderActionButton({
+                style: 'primary',
+                target: 'skillfarm-view-skillqueue',
+                action: _characterUrl(url.SkillInfo, characterId),
+                title: t.skillInfoButton,
+                icon: 'fa-info',
+            }),
+            _renderActionButton({
+                style: 'primary',
+                target: 'skillfarm-accept-switch-notification',
+                action: _characterUrl(url.SwitchNotification, characterId),
+                title: t.switchNotification,
+                icon: 'fa-bell',
+            }),
+            _renderActionButton({
+                style: 'warning',
+                target: 'skillfarm-edit-skillsetup',
+                action: _characterUrl(url.EditSkillset, characterId),
+                api: _characterUrl(url.SkillSet, characterId),
+                title: t.editSkillset,
+                icon: 'fa-pencil',
+            }),
+            _renderActionButton({
+                style: 'danger',
+                target: 'skillfarm-accept-delete-character',
+                action: _characterUrl(url.DeleteCharacter, characterId),
+                title: t.deleteCharacter,
+                icon: 'fa-trash',
+            }),
+        ];
+        if (!details.is_training || details.is_read) {
+            actions.push(_renderActionButton({
+                style: details.is_read ? 'secondary' : 'primary',
+                target: 'skillfarm-accept-mark-as-read',
+                action: _characterUrl(url.MarkAsRead, characterId),
+                title: t.markAsRead,
+                icon: 'fa-check',
+            }));
+        }
+        return `<div class="d-flex justify-content-end">${actions.join('')}</div>`;
+    };
+
+    /**
+     * Columns of the character tables
+     * The column name is the order column of the paged API
+     */
+    const characterColumns = [
+        {
+            data: null,
+            name: 'character_name',
+            render: (data, type, row) => _renderCharacter(row)
+        },
+        {
+            data: null,
+            name: 'progress',
+            render: (data, type, row) => _renderProgress(row.details)
+        },
+        {
+            data: null,
+            name: 'extraction',
+            render: (data, type, row) => _renderExtraction(row.details)
+        },
+        {
+            data: 'details.last_update',
+            name: 'last_update',
+            render: (data) => _escapeHtml(data)
+        },
+        {
+            data: null,
+            name: 'is_filter',
+            render: (data, type, row) => _renderFilter(row.details)
+        },
+        {
+            data: null,
+            render: (data, type, row) => _renderActions(row)
+        },
+    ];
+
+    /**
+     * Highlight a character row by its update and extraction state
+     * @param {HTMLElement} row Table row
+     * @param {Object} details Row details
+     * @private
+     */
+    const _highlightCharacterRow = (row, details) => {
+        const status = details && details.update_status;
+        if (status === 'error') {
+            $(row).addClass('table-stripe-red');
+        } else if (status === 'in_progress') {
+            $(row).addClass('table-stripe-info');
+        } else if (status === 'incomplete' || status === 'token_error') {
+            $(row).addClass('table-stripe-warning');
+        }
+
+        if (details && details.extraction_ready) {
+            $(row).addClass('table-stripe-red');
+        } else if (details && details.extraction_ready_in_queue) {
+            $(row).addClass('table-stripe-warning');
+        }
+    };
+
+    /**
+     * Reload Skillfarm DataTables and keep the current page
+     * @private
+     */
+    const _reloadSkillFarmDataTable = () => {
+        SkillfarmDetailsTable.DataTable().ajax.reload(null, false);
+        SkillfarmInactiveTable.DataTable().ajax.reload(null, false);
+    };
+
+    /**
+     * Show the number of characters with skills ready for extraction
+     * @param {Object} data Ajax API Response Data
+     * @private
+     */
+    const _setSkillExtractionCount = (data) => {
+        $('#skillExtractorLabel').text(data && data.skill_extraction_count != null ? data.skill_extraction_count : 'N/A');
+    };
+
+    const skillfarmUrl = aaSkillfarmSettings.url.Skillfarm.replace('12345', aaSkillfarmSettings.characterPk);
+
+    /**
+     * Table :: Active Characters
+     * Paged, sorted and searched by the API
+     */
+    const activeDataTable = new DataTable(SkillfarmDetailsTable, {
+        serverSide: true,
+        processing: true,
+        ajax: _serverSideAjax(skillfarmUrl, {training: true}, _setSkillExtractionCount),
+        language: aaSkillfarmSettings.dataTables.language,
+        layout: aaSkillfarmSettings.dataTables.layout,
+        ordering: aaSkillfarmSettings.dataTables.ordering,
+        columnControl: aaSkillfarmSettings.dataTables.columnControl,
+        order: [[0, 'asc']],
+        columns: characterColumns,
+        pageLength: 25,
+        columnDefs: [
+            {
+                targets: [2, 4, 5],
+                orderable: false,
+                columnControl: [
+                    {target: 0, content: []},
+                    {target: 1, content: []}
+                ]
+            },
+            {
+                targets: [4],
+                width: 45
+            },
+            {
+                targets: [2, 5],
+                width: 115
+            },
+        ],
+        initComplete: function () {
+            _bootstrapTooltip({selector: '#skillfarm-details'});
+        },
+        drawCallback: function () {
+            _bootstrapTooltip({selector: '#skillfarm-details'});
+        },
+        rowCallback: function (row, data, index) {
+            const details = data && data.details;
+            _highlightCharacterRow(row, details);
+        },
+    });
+
+    /**
+     * Table :: Inactive Characters
+     * Paged, sorted and searched by the API
+     */
+    const inactiveDataTable = new DataTable(SkillfarmInactiveTable, {
+        serverSide: true,
+        processing: true,
+        ajax: _serverSideAjax(skillfarmUrl, {training: false}),
+        language: aaSkillfarmSettings.dataTables.language,
+        layout: aaSkillfarmSettings.dataTables.layout,
+        ordering: aaSkillfarmSettings.dataTables.ordering,
+        columnControl: aaSkillfarmSettings.dataTables.columnControl,
+        order: [[0, 'asc']],
+        columns: characterColumns,
+        columnDefs: [
+            {
+                targets: [2, 4, 5],
+                orderable: false,
+            },
+        ],
+        initComplete: function () {
+            _bootstrapTooltip({selector: '#skillfarm-inactive'});
+        },
+        drawCallback: function () {
+            _bootstrapTooltip({selector: '#skillfarm-inactive'});
+        },
+        rowCallback: function (row, data, index) {
+            const details = data && data.details;
+            _highlightCharacterRow(row, details);
+
+            if (details && details.is_read === true) {
+                $(row).addClass('opacity-25');
             }
-        })
-        .catch((error) => {
-            console.error('Error fetching Skillfarm DataTable:', error);
-        });
+        },
+    });
 
     /**
      * SlimSelect :: Skillset
@@ -316,16 +486,8 @@ $(document).ready(() => {
             })
                 .then((data) => {
                     if (data.success === true) {
-                        fetchGet({
-                            url: aaSkillfarmSettings.url.Skillfarm.replace('12345', aaSkillfarmSettings.characterPk)
-                        })
-                            .then((newData) => {
-                                _reloadSkillFarmDataTable(newData);
-                                modalRequestSwitchNotification.modal('hide');
-                            })
-                            .catch((error) => {
-                                console.error('Error fetching Skillfarm DataTable:', error);
-                            });
+                        _reloadSkillFarmDataTable();
+                        modalRequestSwitchNotification.modal('hide');
                     }
                 })
                 .catch((error) => {
@@ -352,16 +514,8 @@ $(document).ready(() => {
             })
                 .then((data) => {
                     if (data.success === true) {
-                        fetchGet({
-                            url: aaSkillfarmSettings.url.Skillfarm.replace('12345', aaSkillfarmSettings.characterPk)
-                        })
-                            .then((newData) => {
-                                _reloadSkillFarmDataTable(newData);
-                                modalRequestDelete.modal('hide');
-                            })
-                            .catch((error) => {
-                                console.error('Error fetching Skillfarm DataTable:', error);
-                            });
+                        _reloadSkillFarmDataTable();
+                        modalRequestDelete.modal('hide');
                     }
                 })
                 .catch((error) => {
@@ -433,16 +587,8 @@ $(document).ready(() => {
             })
                 .then((data) => {
                     if (data.success === true) {
-                        fetchGet({
-                            url: aaSkillfarmSettings.url.Skillfarm.replace('12345', aaSkillfarmSettings.characterPk)
-                        })
-                            .then((newData) => {
-                                _reloadSkillFarmDataTable(newData);
-                                modalRequestEditSkillsetup.modal('hide');
-                            })
-                            .catch((error) => {
-                                console.error('Error fetching Skillfarm DataTable:', error);
-                            });
+                        _reloadSkillFarmDataTable();
+                        modalRequestEditSkillsetup.modal('hide');
                     }
                 })
                 .catch((error) => {
@@ -473,16 +619,8 @@ $(document).ready(() => {
             })
                 .then((data) => {
                     if (data.success === true) {
-                        fetchGet({
-                            url: aaSkillfarmSettings.url.Skillfarm.replace('12345', aaSkillfarmSettings.characterPk)
-                        })
-                            .then((newData) => {
-                                _reloadSkillFarmDataTable(newData);
-                                modalRequestMarkAsRead.modal('hide');
-                            })
-                            .catch((error) => {
-                                console.error('Error fetching Skillfarm DataTable:', error);
-                            });
+                        _reloadSkillFarmDataTable();
+                        modalRequestMarkAsRead.modal('hide');
                     }
                 })
                 .catch((error) => {
@@ -2,7 +2,9 @@
 
 # Standard Library
 import inspect
+from collections import defaultdict
 from collections.abc import Callable
+from typing import Any
 
 # Third Party
 import requests
@@ -10,6 +12,8 @@ from celery import Task, chain, shared_task
 
 # Django
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models import F, Value
 from django.db.utils import Error
 from django.utils import timezone
 from django.utils.html import format_html
@@ -21,13 +25,29 @@ from allianceauth.services.tasks import QueueOnce
 
 # AA Skillfarm
 from skillfarm import __title__, app_settings
+from skillfarm.errors import DownTimeError
 from skillfarm.helpers.discord import send_user_notification
+from skillfarm.helpers.esi_fetch import fetch_characters_sections
+from skillfarm.helpers.task_lanes import TaskLane, get_lane_options
+from skillfarm.models.general import UpdateSectionResult
 from skillfarm.models.helpers.update_manager import CharacterUpdateSection
 from skillfarm.models.prices import EveTypePrice
 from skillfarm.models.skillfarmaudit import (
+    CharacterSkill,
+    CharacterSkillqueueEntry,
+    CharacterUpdateStatus,
     SkillFarmAudit,
+    SkillFarmSetup,
+)
+from skillfarm.providers import (
+    AppLogger,
+    esi_breaker,
+    get_esi_downtime_countdown,
+    get_esi_retry_info,
+    get_retry_countdown,
+    is_esi_daily_downtime,
+    retry_task_on_esi_error,
 )
-from skillfarm.providers import AppLogger, retry_task_on_esi_error
 
 logger = AppLogger(my_logger=get_extension_logger(__name__), prefix=__title__)
 
@@ -58,13 +78,55 @@ def update_all_skillfarm(runs: int = 0, force_refresh=False):
     # Disable characters with no owner
     SkillFarmAudit.objects.disable_characters_with_no_owner()
 
-    characters = SkillFarmAudit.objects.select_related("character").filter(active=True)
-    for character in characters:
-        update_character.apply_async(
-            args=[character.pk], kwargs={"force_refresh": force_refresh}
-        )
+    characters = SkillFarmAudit.objects.filter(active=True)
+
+    # Schedule the updates past ESI's daily downtime instead of retrying them
+    countdown = get_esi_downtime_countdown()
+
+    if force_refresh:
+        for character_pk in characters.values_list("pk", flat=True):
+            update_character.apply_async(
+                args=[character_pk],
+                kwargs={"force_refresh": force_refresh},
+                countdown=countdown,
+                **get_lane_options(TaskLane.SCHEDULED),
+            )
+            runs = runs + 1
+        logger.info("Queued %s Skillfarm Updates", runs)
+        return
+
+    if esi_breaker.is_open():
+        logger.info("ESI circuit breaker is open. Skipping Skillfarm Updates")
+        return
+
+    # Only queue the sections which are stale, batched per set of sections
+    stale_sections = characters.stale_sections()
+
+    # Characters without a token never reach a worker
+    without_token = set(
+        characters.filter(pk__in=stale_sections.keys())
+        .filter_without_token()
+        .values_list("pk", flat=True)
+    )
+    _mark_token_errors(list(without_token))
+
+    sections_character_pks = defaultdict(list)
+    for character_pk, sections in stale_sections.items():
+        if character_pk in without_token:
+            continue
+        sections_character_pks[tuple(sections)].append(character_pk)
         runs = runs + 1
 
+    batch_size = app_settings.SKILLFARM_TASKS_BATCH_SIZE
+    for sections, character_pks in sections_character_pks.items():
+        for i in range(0, len(character_pks), batch_size):
+            update_characters_sections.apply_async(
+                args=[list(sections), character_pks[i : i + batch_size]],
+                kwargs={"force_refresh": force_refresh},
+                countdown=countdown,
+                **get_lane_options(TaskLane.SCHEDULED),
+            )
+
     logger.info("Queued %s Skillfarm Updates", runs)
 
 
@@ -73,6 +135,7 @@ def update_character(
     self: Task,  # pylint: disable=unused-argument
     character_pk: int,
     force_refresh=False,
+    lane: str = TaskLane.SCHEDULED,
 ) -> bool:
     """
     Update a SkillFarmAudit character by queuing necessary section updates.
@@ -80,6 +143,7 @@ def update_character(
     Args:
         character_pk (int): Primary key of the SkillFarmAudit character to update.
         force_refresh (bool): If True, forces a refresh of all sections.
+        lane (str): TaskLane the section updates are queued in.
 
     Returns:
         bool: True if updates were queued, False otherwise.
@@ -95,9 +159,6 @@ def update_character(
         )
         return False
 
-    que = []
-    priority = 7
-
     logger.debug(
         "Processing Audit Updates for %s", format(character.character.character_name)
     )
@@ -112,9 +173,8 @@ def update_character(
         logger.info("No updates needed for %s", character.character.character_name)
         return False
 
-    sections = CharacterUpdateSection.get_sections()
-
-    for section in sections:
+    sections = []
+    for section in CharacterUpdateSection.get_sections():
         # Skip sections that are not in the needs_update list
         if not force_refresh and not needs_update.for_section(section):
             logger.debug(
@@ -123,22 +183,48 @@ def update_character(
                 section,
             )
             continue
+        sections.append(section)
 
-        task_name = f"update_char_{section}"
-        task = globals().get(task_name)
-        que.append(
-            task.si(character.pk, force_refresh=force_refresh).set(priority=priority)
-        )
-
-    chain(que).apply_async()
+    _enqueue_character_sections(
+        character.pk, sections, force_refresh=force_refresh, lane=lane
+    )
     logger.debug(
         "Queued %s Audit Updates for %s",
-        len(que),
+        len(sections),
         character.character.character_name,
     )
     return True
 
 
+def _enqueue_character_sections(
+    character_pk: int,
+    sections: list[str],
+    force_refresh: bool = False,
+    lane: str = TaskLane.SCHEDULED,
+) -> None:
+    """
+    Queue the section update tasks for a character, scheduled past ESI's daily downtime.
+
+    The sections are independent ESI endpoints, so they are queued as independent
+    tasks and run in parallel. Each section holds its own once lock and writes its
+    own update status, the aggregate status is derived from them on read, so a
+    section that is already queued does not hold back the other sections.
+    """
+    options = get_lane_options(lane)
+    que = []
+    for section in sections:
+        task_name = f"update_char_{section}"
+        task = globals().get(task_name)
+        que.append(task.si(character_pk, force_refresh=force_refresh).set(**options))
+    countdown = get_esi_downtime_countdown()
+
+    if app_settings.SKILLFARM_PARALLEL_SECTIONS:
+        for signature in que:
+            signature.apply_async(countdown=countdown)
+        return
+    chain(que).apply_async(countdown=countdown)
+
+
 @shared_task(**TASK_DEFAULTS_BIND_ONCE_CHARACTER)
 def update_char_skills(self: Task, character_pk: int, force_refresh: bool):
     return _update_character_section(
@@ -187,9 +273,224 @@ def _update_character_section(
         result = character.update_manager.perform_update_status(
             section, method, **kwargs
         )
+    # Store the farm state first, the section log invalidates the API cache
+    SkillFarmAudit.objects.filter(pk=character.pk).update_farm_state()
     character.update_manager.update_section_log(section, result)
 
 
+@shared_task(**TASK_DEFAULTS_BIND_ONCE)
+def update_characters_sections(
+    self: Task,
+    sections: list[str],
+    character_pks: list[int],
+    force_refresh: bool = False,
+):
+    return _update_characters_sections(
+        task=self,
+        sections=sections,
+        character_pks=character_pks,
+        force_refresh=force_refresh,
+    )
+
+
+def _update_characters_sections(
+    task: Task, sections: list[str], character_pks: list[int], force_refresh: bool
+):
+    """
+    Update the given sections for a batch of characters.
+
+    ESI data of all sections is fetched concurrently and then written per
+    section for all characters in one transaction. Characters hitting a
+    retryable ESI error are handed over to their own section task, so they
+    keep the per character retry behaviour.
+    """
+    sections = [CharacterUpdateSection(section) for section in sections]
+    characters = list(
+        SkillFarmAudit.objects.select_related("character").filter(
+            pk__in=character_pks, active=True
+        )
+    )
+    if not characters:
+        return
+
+    # Safety net, the dispatchers already schedule the tasks past the downtime
+    if is_esi_daily_downtime():
+        raise task.retry(
+            countdown=get_retry_countdown(
+                get_esi_downtime_countdown(), task.request.retries
+            ),
+            exc=DownTimeError("ESI is in daily downtime"),
+        )
+
+    tokens = SkillFarmAudit.get_tokens(characters)
+    _mark_token_errors(
+        [character.pk for character in characters if character.pk not in tokens]
+    )
+    characters = [character for character in characters if character.pk in tokens]
+    if not characters:
+        return
+
+    for section in sections:
+        CharacterUpdateStatus.objects.bulk_reset(
+            [character.pk for character in characters], section
+        )
+
+    logger.debug(
+        "Fetching %s for %s characters",
+        ", ".join(str(section.label) for section in sections),
+        len(characters),
+    )
+    fetched = fetch_characters_sections(
+        characters, sections, force_refresh=force_refresh, tokens=tokens
+    )
+
+    for section in sections:
+        _store_characters_section(
+            task, section, characters, fetched[section], force_refresh
+        )
+
+
+def _mark_token_errors(character_pks: list[int]) -> None:
+    """Mark characters without a valid token, so they are skipped until the next forced update."""
+    if not character_pks:
+        return
+    logger.info("Marking %s characters without a valid token", len(character_pks))
+    CharacterUpdateStatus.objects.bulk_update_token_error(
+        character_pks,
+        f"TokenError: Token does not exist with scopes {SkillFarmAudit.get_esi_scopes()}",
+    )
+
+
+def _store_characters_section(
+    task: Task,
+    section: CharacterUpdateSection,
+    characters: list[SkillFarmAudit],
+    fetched: dict[SkillFarmAudit, Any],
+    force_refresh: bool,
+):
+    """Write the prefetched ESI data of a section for a batch of characters."""
+    manager = SkillFarmAudit.get_section_manager(section)
+
+    # pylint: disable=unused-argument
+    def prefetched(character: SkillFarmAudit, force_refresh: bool = False):
+        data = fetched[character]
+        if isinstance(data, Exception):
+            raise data
+        return data
+
+    previous_digests = CharacterUpdateStatus.objects.get_payload_digests(
+        section, [character.pk for character in characters]
+    )
+    results: dict[SkillFarmAudit, UpdateSectionResult] = {}
+    retry_characters = []
+    retry_exc = None
+    for character in characters:
+        try:
+            results[character] = character.update_manager.update_section_if_changed(
+                section=section,
+                fetch_func=prefetched,
+                force_refresh=force_refresh,
+                previous_digest=previous_digests.get(character.pk, ""),
+            )
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            if get_esi_retry_info(exc) is not None:
+                retry_characters.append(character)
+                retry_exc = retry_exc or exc
+                continue
+            error_message = f"{type(exc).__name__}: {str(exc)}"
+            logger.error(
+                "%s: %s: Error during update status: %s",
+                character,
+                section.label,
+                error_message,
+            )
+            CharacterUpdateStatus.objects.bulk_update_error(
+                section, [character.pk], error_message
+            )
+
+    if retry_characters:
+        # ESI is limited or down, hand these over to single tasks
+        _retry_characters_section(
+            task,
+            section,
+            retry_characters,
+            force_refresh,
+            retry_exc,
+            *get_esi_retry_info(retry_exc),
+        )
+
+    if not results:
+        return
+
+    changed_items = {
+        character: result.data
+        for character, result in results.items()
+        if result.is_changed
+    }
+    try:
+        with transaction.atomic():
+            if changed_items:
+                changed_rows = manager._bulk_update_or_create_objs(changed_items)
+                results = {
+                    character: result._replace(
+                        changed_rows=changed_rows.get(character.pk, 0)
+                    )
+                    for character, result in results.items()
+                }
+            CharacterUpdateStatus.objects.bulk_update_section_log(
+                section,
+                {character.pk: result for character, result in results.items()},
+            )
+            SkillFarmAudit.objects.filter(
+                pk__in=[character.pk for character in results]
+            ).update_farm_state()
+    except Error as exc:
+        error_message = f"{type(exc).__name__}: {str(exc)}"
+        logger.error(
+            "%s: Error during batch update status: %s", section.label, error_message
+        )
+        CharacterUpdateStatus.objects.bulk_update_error(
+            section, [character.pk for character in results], error_message
+        )
+        raise exc
+
+    logger.info(
+        "%s Update run completed for %s characters (%s changed, %s rows written)",
+        section.label,
+        len(results),
+        len(changed_items),
+        sum(result.changed_rows or 0 for result in results.values()),
+    )
+
+
+def _retry_characters_section(
+    task: Task,
+    section: CharacterUpdateSection,
+    characters: list[SkillFarmAudit],
+    force_refresh: bool,
+    exc: Exception,
+    retry_after: float,
+    issue: str,
+) -> None:
+    """Queue the single character section task for each character after a retryable ESI error."""
+    countdown = get_retry_countdown(retry_after, task.request.retries)
+    logger.warning(
+        "ESI Error encountered: %s. Retrying %s characters after %.2f seconds. Issue: %s",
+        str(exc),
+        len(characters),
+        countdown,
+        issue,
+    )
+    section_task = globals().get(f"update_char_{section}")
+    for character in characters:
+        section_task.apply_async(
+            args=[character.pk],
+            kwargs={"force_refresh": force_refresh},
+            countdown=countdown,
+            **get_lane_options(TaskLane.SCHEDULED),
+        )
+
+
 # pylint: disable=too-many-locals
 @shared_task(**TASK_DEFAULTS_ONCE)
 def check_skillfarm_notifications(runs: int = 0):
@@ -217,23 +518,29 @@ def check_skillfarm_notifications(runs: int = 0):
             main_to_alts[main_character] = []
         main_to_alts[main_character].append(character)
 
+    # Only characters with extraction ready skills in their farm state or with a
+    # skillqueue are queried, queue entries may have finished since the last update
+    extraction_skill_names = _get_extraction_skill_names(
+        [
+            alt
+            for alts in main_to_alts.values()
+            for alt in alts
+            if alt.notification
+            and (
+                alt.extraction_ready_count
+                or alt.extraction_ready_in_queue
+                or alt.queue_finish_at is not None
+            )
+        ]
+    )
+
     for main_character, alts in main_to_alts.items():
         msg_items = []
         for alt in alts:
             alt: SkillFarmAudit
 
             if alt.notification:
-                skill_names = []
-                skillqueue_extractions = alt.skillfarm_skillqueue.extractions(
-                    alt
-                ).values_list("eve_type__name", flat=True)
-                skill_names.extend(skillqueue_extractions)
-
-                skills_extractions = alt.skillfarm_skills.extractions(alt).values_list(
-                    "eve_type__name", flat=True
-                )
-                skill_names.extend(skills_extractions)
-
+                skill_names = extraction_skill_names.get(alt.pk, [])
                 if len(skill_names) > 0:
                     # Create and Add Notification Message
                     msg = alt._generate_notification(skill_names)
@@ -258,12 +565,15 @@ def check_skillfarm_notifications(runs: int = 0):
                 "Following Skills have finished training: \n{}", notifiy_message
             )
 
-            send_user_notification.delay(
-                user_id=main_character.character_ownership.user.id,
-                title=title,
-                message=full_message,
-                embed_message=True,
-                level="warning",
+            send_user_notification.apply_async(
+                kwargs={
+                    "user_id": main_character.character_ownership.user.id,
+                    "title": title,
+                    "message": full_message,
+                    "embed_message": True,
+                    "level": "warning",
+                },
+                **get_lane_options(TaskLane.NOTIFICATIONS),
             )
             runs = runs + 1
 
@@ -277,6 +587,45 @@ def check_skillfarm_notifications(runs: int = 0):
     logger.info("Queued %s Skillfarm Notifications", runs)
 
 
+def _get_extraction_skill_names(
+    characters: list[SkillFarmAudit],
+) -> dict[int, list[str]]:
+    """
+    Return the names of the extraction ready skills for many characters.
+
+    The finished skillqueue entries and the trained skills of all characters
+    are loaded with one query and matched against the skillsets afterwards.
+
+    Returns:
+        dict[int, list[str]]: Mapping of character pk to skill names, skillqueue first.
+    """
+    if not characters:
+        return {}
+    character_pks = [character.pk for character in characters]
+    skillsets = {
+        character_pk: set(skillset_type_ids or [])
+        for character_pk, skillset_type_ids in SkillFarmSetup.objects.filter(
+            character_id__in=character_pks, skillset__isnull=False
+        ).values_list("character_id", "skillset_type_ids")
+    }
+    skillqueue = CharacterSkillqueueEntry.objects.filter(
+        character_id__in=skillsets.keys(),
+        finish_date__gt=F("start_date"),
+        finish_date__lt=timezone.now(),
+        finished_level=5,
+    ).values_list("character_id", "eve_type_id", "eve_type__name", Value(0))
+    skills = CharacterSkill.objects.filter(
+        character_id__in=skillsets.keys(), trained_skill_level=5
+    ).values_list("character_id", "eve_type_id", "eve_type__name", Value(1))
+
+    rows = sorted(skillqueue.union(skills, all=True), key=lambda row: (row[0], row[3]))
+    skill_names = defaultdict(list)
+    for character_pk, eve_type_id, name, __ in rows:
+        if eve_type_id in skillsets[character_pk]:
+            skill_names[character_pk].append(name)
+    return skill_names
+
+
 @shared_task(**TASK_DEFAULTS_ONCE)
 def update_all_prices():
     prices = EveTypePrice.objects.all()
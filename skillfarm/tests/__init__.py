@@ -2,6 +2,7 @@
 import socket
 
 # Django
+from django.core.cache import cache
 from django.test import RequestFactory, TestCase
 
 # AA Skillfarm
@@ -96,3 +97,8 @@ class SkillFarmTestCase(NoSocketsTestCase):
         # User without Access to Skillfarm
         cls.no_permission_user = UserMainFactory(permissions__=[])
         cls.no_perm_character = cls.no_permission_user.profile.main_character
+
+    def setUp(self):
+        super().setUp()
+        # Cached API responses and visibility scopes outlive the test data
+        cache.clear()
@@ -0,0 +1,59 @@
+# Django
+from django.utils import timezone
+
+# AA Skillfarm
+from skillfarm.api.helpers.paging import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+)
+from skillfarm.api.schema import TableQuery
+from skillfarm.models.skillfarmaudit import SkillFarmAudit
+from skillfarm.tests import SkillFarmTestCase
+from skillfarm.tests.testdata.factory import SkillFarmAuditFactory
+
+MODULE_PATH = "skillfarm.api.helpers.paging"
+
+
+class TestPaging(SkillFarmTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        now = timezone.now()
+        cls.audit_early = SkillFarmAuditFactory(
+            user=cls.user, queue_finish_at=now + timezone.timedelta(hours=1)
+        )
+        cls.audit_late = SkillFarmAuditFactory(
+            user=cls.superuser, queue_finish_at=now + timezone.timedelta(hours=2)
+        )
+
+    def test_should_decode_encoded_cursor(self):
+        """
+        Test should decode the sort value and the pk of an encoded cursor.
+        """
+        self.assertEqual(decode_cursor(encode_cursor("Alpha", 7)), ("Alpha", 7))
+
+    def test_should_raise_on_invalid_cursor(self):
+        """
+        Test should raise InvalidCursorError for a tampered cursor.
+        """
+        with self.assertRaises(InvalidCursorError):
+            decode_cursor(encode_cursor("Alpha", 7)[:-4])
+
+    def test_should_reverse_prefixed_order_field(self):
+        """
+        Test should sort a field with a leading "-" against the column direction.
+        """
+        # when
+        page = paginate(
+            SkillFarmAudit.objects.all(),
+            TableQuery(order="progress", direction="asc"),
+            search_fields=["character__character_name"],
+            order_fields={"progress": ["-queue_finish_at"]},
+            cursor_field="character__character_name",
+        )
+        # then
+        self.assertEqual(page.rows, [self.audit_late, self.audit_early])
+        self.assertEqual(page.records_filtered, 2)
+        self.assertIsNone(page.next_cursor)
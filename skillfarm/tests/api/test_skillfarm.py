@@ -1,17 +1,23 @@
 # Standard Library
 from http import HTTPStatus
+from unittest.mock import patch
 
 # Django
 from django.urls import reverse
+from django.utils import timezone
 
 # AA Skillfarm
 from skillfarm.models.helpers.update_manager import CharacterUpdateSection
+from skillfarm.models.skillfarmaudit import SkillFarmAudit
 from skillfarm.tests import SkillFarmTestCase
 from skillfarm.tests.testdata.factory import (
+    CharacterSkillqueueEntryFactory,
     CharacterUpdateStatusFactory,
+    EveCharacterFactory,
     SkillFarmAuditFactory,
     SkillFarmSetupFactory,
 )
+from skillfarm.tests.testdata.utils import add_alt_character_to_user
 
 MODULE_PATH = "skillfarm.api.helpers."
 API_URL = "skillfarm:api"
@@ -143,3 +149,309 @@ class TestApiEndpoints(SkillFarmTestCase):
 
         # Expected Result
         self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN)
+
+
+@patch("skillfarm.models.skillfarmaudit.render_to_string")
+@patch(MODULE_PATH + "core.render_to_string")
+class TestApiDataEndpoints(SkillFarmTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.audit = SkillFarmAuditFactory(user=cls.user)
+        CharacterSkillqueueEntryFactory(
+            character=cls.audit,
+            start_date=timezone.now() - timezone.timedelta(hours=1),
+            finish_date=timezone.now() + timezone.timedelta(hours=1),
+        )
+        SkillFarmAudit.objects.filter(pk=cls.audit.pk).update_farm_state()
+
+    def test_overview_data_should_return_characters(
+        self, mock_render, mock_render_model
+    ):
+        """
+        Test should return the overview as structured data without rendering templates.
+        """
+        # given
+        url = reverse(f"{API_URL}:get_character_overview_data")
+        self.client.force_login(self.user)
+        # when
+        response = self.client.get(url)
+        # then
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        character = response.json()["characters"][0]
+        self.assertEqual(
+            character["character"]["character_id"],
+            self.user_character.character_id,
+        )
+        self.assertIn("portrait_url", character)
+        mock_render.assert_not_called()
+        mock_render_model.assert_not_called()
+
+    def test_details_data_should_return_characters(
+        self, mock_render, mock_render_model
+    ):
+        """
+        Test should return the details as structured data without rendering templates.
+        """
+        # given
+        url = reverse(
+            f"{API_URL}:get_details_data",
+            kwargs={"character_id": self.user_character.character_id},
+        )
+        self.client.force_login(self.user)
+        # when
+        response = self.client.get(url)
+        # then
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        data = response.json()
+        self.assertEqual(data["inactive_characters"], [])
+        details = data["active_characters"][0]["details"]
+        self.assertEqual(details["update_status"], "incomplete")
+        self.assertTrue(details["is_training"])
+        self.assertFalse(details["extraction_ready"])
+        self.assertFalse(details["is_filter"])
+        self.assertIsInstance(details["progress"], float)
+        mock_render.assert_not_called()
+        mock_render_model.assert_not_called()
+
+    def test_details_data_should_return_403_forbidden(self, _, __):
+        """
+        Test should return 403 FORBIDDEN for details data API endpoint.
+        """
+        # given
+        url = reverse(
+            f"{API_URL}:get_details_data",
+            kwargs={"character_id": self.user_character.character_id},
+        )
+        self.client.force_login(self.no_permission_user)
+        # when
+        response = self.client.get(url)
+        # then
+        self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN)
+
+
+class TestDetailsQueryBudget(SkillFarmTestCase):
+    # Session, user, permission and alt lookups plus the batched farm queries
+    QUERY_BUDGET = 18
+
+    def setUp(self):
+        super().setUp()
+        self.now = timezone.now()
+        self.url = reverse(
+            f"{API_URL}:get_details",
+            kwargs={"character_id": self.user_character.character_id},
+        )
+        self.client.force_login(self.user)
+        self._add_farm_character(SkillFarmAuditFactory(user=self.user))
+
+    def _add_farm_character(self, audit: SkillFarmAudit):
+        CharacterSkillqueueEntryFactory(
+            character=audit,
+            start_date=self.now - timezone.timedelta(hours=1),
+            finish_date=self.now + timezone.timedelta(hours=1),
+        )
+        for section in CharacterUpdateSection.get_sections():
+            CharacterUpdateStatusFactory(
+                character=audit,
+                section=section,
+                is_success=True,
+                has_token_error=False,
+                last_update_finished_at=self.now,
+            )
+        SkillFarmSetupFactory(character=audit)
+        SkillFarmAudit.objects.filter(pk=audit.pk).update_farm_state()
+
+    def _add_alts(self, count: int):
+        for _ in range(count):
+            eve_character = EveCharacterFactory()
+            add_alt_character_to_user(
+                user=self.user, character_id=eve_character.character_id
+            )
+            self._add_farm_character(
+                SkillFarmAuditFactory(user=self.user, character=eve_character)
+            )
+
+    def test_should_stay_in_budget_with_one_character(self):
+        """
+        Test should load the details of one character within the query budget.
+        """
+        # when
+        with self.assertNumQueries(self.QUERY_BUDGET):
+            response = self.client.get(self.url)
+        # then
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(len(response.json()["active_characters"]), 1)
+
+    def test_should_stay_in_budget_with_many_alts(self):
+        """
+        Test should load the details of many alts with the same number of queries.
+        """
+        # given
+        self._add_alts(10)
+        # when
+        with self.assertNumQueries(self.QUERY_BUDGET):
+            response = self.client.get(self.url)
+        # then
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(len(response.json()["active_characters"]), 11)
+
+
+class TestApiPageEndpoints(SkillFarmTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.now = timezone.now()
+        cls.audits = [SkillFarmAuditFactory(user=cls.user)]
+        for character_name in [
+            "Alpha Skillfarm",
+            "Bravo Skillfarm",
+            "Charlie Skillfarm",
+            "Delta Skillfarm",
+        ]:
+            eve_character = EveCharacterFactory(character_name=character_name)
+            add_alt_character_to_user(
+                user=cls.user, character_id=eve_character.character_id
+            )
+            cls.audits.append(
+                SkillFarmAuditFactory(user=cls.user, character=eve_character)
+            )
+        # Only the first alt is training
+        CharacterSkillqueueEntryFactory(
+            character=cls.audits[1],
+            start_date=cls.now - timezone.timedelta(hours=1),
+            finish_date=cls.now + timezone.timedelta(hours=1),
+        )
+        SkillFarmAudit.objects.update_farm_state()
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse(
+            f"{API_URL}:get_details_page",
+            kwargs={"character_id": self.user_character.character_id},
+        )
+        self.client.force_login(self.user)
+
+    def _names(self, response) -> list[str]:
+        return [
+            row["character"]["character_name"] for row in response.json()["characters"]
+        ]
+
+    def test_should_return_page(self):
+        """
+        Test should return only the requested page of the characters.
+        """
+        # when
+        response = self.client.get(
+            self.url, {"start": 1, "length": 2, "search": "skillfarm"}
+        )
+        # then
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json()["records_total"], 5)
+        self.assertEqual(response.json()["records_filtered"], 4)
+        self.assertEqual(
+            self._names(response), ["Bravo Skillfarm", "Charlie Skillfarm"]
+        )
+
+    def test_should_search_and_order(self):
+        """
+        Test should filter by the search and sort by the requested column.
+        """
+        # when
+        response = self.client.get(
+            self.url,
+            {"search": "skillfarm", "order": "character_name", "direction": "desc"},
+        )
+        # then
+        self.assertEqual(response.json()["records_filtered"], 4)
+        self.assertEqual(
+            self._names(response),
+            [
+                "Delta Skillfarm",
+                "Charlie Skillfarm",
+                "Bravo Skillfarm",
+                "Alpha Skillfarm",
+            ],
+        )
+
+    def test_should_filter_training(self):
+        """
+        Test should return the characters with and without active training separately.
+        """
+        # when
+        active = self.client.get(self.url, {"training": True})
+        inactive = self.client.get(self.url, {"training": False})
+        # then
+        self.assertEqual(self._names(active), ["Alpha Skillfarm"])
+        self.assertEqual(active.json()["records_total"], 1)
+        self.assertEqual(inactive.json()["records_total"], 4)
+        self.assertNotIn("Alpha Skillfarm", self._names(inactive))
+
+    def test_should_page_with_cursor(self):
+        """
+        Test should return all characters exactly once when paging by cursor.
+        """
+        # given
+        names = []
+        params = {"length": 2, "search": "skillfarm"}
+        # when
+        while True:
+            response = self.client.get(self.url, params)
+            names += self._names(response)
+            next_cursor = response.json()["next_cursor"]
+            if next_cursor is None:
+                break
+            params["cursor"] = next_cursor
+        # then
+        self.assertEqual(
+            names,
+            [
+                "Alpha Skillfarm",
+                "Bravo Skillfarm",
+                "Charlie Skillfarm",
+                "Delta Skillfarm",
+            ],
+        )
+
+    def test_should_not_shift_cursor_page_on_insert(self):
+        """
+        Test should not repeat a character when a character is added between two pages.
+        """
+        # given
+        first = self.client.get(self.url, {"length": 2, "search": "skillfarm"})
+        eve_character = EveCharacterFactory(character_name="Aaron Skillfarm")
+        add_alt_character_to_user(
+            user=self.user, character_id=eve_character.character_id
+        )
+        SkillFarmAuditFactory(user=self.user, character=eve_character)
+        # when
+        second = self.client.get(
+            self.url,
+            {"length": 2, "search": "skillfarm", "cursor": first.json()["next_cursor"]},
+        )
+        # then
+        self.assertEqual(self._names(second), ["Charlie Skillfarm", "Delta Skillfarm"])
+
+    def test_should_reject_invalid_cursor(self):
+        """
+        Test should return 400 for a cursor that can not be decoded.
+        """
+        # when
+        response = self.client.get(self.url, {"cursor": "invalid"})
+        # then
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_should_return_overview_page(self):
+        """
+        Test should return a page of the visible main characters.
+        """
+        # given
+        self.client.force_login(self.superuser)
+        url = reverse(f"{API_URL}:get_character_overview_page")
+        # when
+        response = self.client.get(url, {"length": 1})
+        # then
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(len(response.json()["characters"]), 1)
+        self.assertGreater(response.json()["records_total"], 1)
+        self.assertIsNotNone(response.json()["next_cursor"])
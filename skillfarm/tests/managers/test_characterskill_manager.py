@@ -1,13 +1,22 @@
 # Standard Library
 from http import HTTPStatus
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 # Third Party
 import pook
 
+# Alliance Auth (External Libs)
+from eve_sde.models.types import ItemType as EveType
+
 # AA Skillfarm
+from skillfarm.helpers.eve_types import eve_type_resolver
+from skillfarm.models.skillfarmaudit import CharacterSkill
 from skillfarm.tests import SkillFarmTestCase
-from skillfarm.tests.testdata.factory import SkillFarmAuditFactory
+from skillfarm.tests.testdata.factory import (
+    CharacterSkillFactory,
+    SkillFarmAuditFactory,
+)
 
 MODULE_PATH = "skillfarm.managers.characterskill"
 
@@ -46,7 +55,8 @@ class TestCharacterSkillManager(SkillFarmTestCase):
                 "unallocated_sp": 250000,
             },
         )
-        self.skillfarm_audit.update_skills()
+        result = self.skillfarm_audit.update_skills()
+        self.assertEqual(result.changed_rows, 2)
         self.assertSetEqual(
             set(
                 self.skillfarm_audit.skillfarm_skills.all().values_list(
@@ -64,3 +74,66 @@ class TestCharacterSkillManager(SkillFarmTestCase):
         self.assertEqual(obj.active_skill_level, 2)
         self.assertEqual(obj.skillpoints_in_skill, 4000)
         self.assertEqual(obj.trained_skill_level, 4)
+
+    def test_should_upsert_skills_and_delete_obsolete(self):
+        # given
+        CharacterSkillFactory(
+            character=self.skillfarm_audit,
+            eve_type=EveType.objects.get(id=1),
+            active_skill_level=1,
+            skillpoints_in_skill=250,
+            trained_skill_level=1,
+        )
+        CharacterSkillFactory(
+            character=self.skillfarm_audit, eve_type=EveType.objects.get(id=2)
+        )
+        skills = SimpleNamespace(
+            skills=[
+                SimpleNamespace(
+                    skill_id=1,
+                    active_skill_level=3,
+                    skillpoints_in_skill=40000,
+                    trained_skill_level=3,
+                )
+            ]
+        )
+        eve_type_resolver.resolve_ids([1])
+        # when
+        with self.assertNumQueries(5):  # savepoint, select, delete, upsert, release
+            changed_rows = CharacterSkill.objects._bulk_update_or_create_objs(
+                {self.skillfarm_audit: [skills]}
+            )
+        # then
+        self.assertEqual(changed_rows, {self.skillfarm_audit.pk: 2})
+        obj = self.skillfarm_audit.skillfarm_skills.get()
+        self.assertEqual(obj.eve_type_id, 1)
+        self.assertEqual(obj.active_skill_level, 3)
+        self.assertEqual(obj.skillpoints_in_skill, 40000)
+        self.assertEqual(obj.trained_skill_level, 3)
+
+    def test_should_not_write_unchanged_skills(self):
+        # given
+        CharacterSkillFactory(
+            character=self.skillfarm_audit,
+            eve_type=EveType.objects.get(id=1),
+            active_skill_level=3,
+            skillpoints_in_skill=40000,
+            trained_skill_level=3,
+        )
+        skills = SimpleNamespace(
+            skills=[
+                SimpleNamespace(
+                    skill_id=1,
+                    active_skill_level=3,
+                    skillpoints_in_skill=40000,
+                    trained_skill_level=3,
+                )
+            ]
+        )
+        # when
+        with self.assertNumQueries(3):  # savepoint, select, release
+            changed_rows = CharacterSkill.objects._bulk_update_or_create_objs(
+                {self.skillfarm_audit: [skills]}
+            )
+        # then
+        self.assertEqual(changed_rows, {})
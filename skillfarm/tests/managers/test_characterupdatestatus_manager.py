@@ -0,0 +1,202 @@
+# Standard Library
+from unittest.mock import patch
+
+# Django
+from django.utils import timezone
+
+# AA Skillfarm
+from skillfarm.models.general import UpdateSectionResult
+from skillfarm.models.helpers.update_manager import CharacterUpdateSection
+from skillfarm.models.skillfarmaudit import CharacterUpdateStatus
+from skillfarm.tests import SkillFarmTestCase
+from skillfarm.tests.testdata.factory import (
+    CharacterSkillqueueEntryFactory,
+    CharacterUpdateStatusFactory,
+    SkillFarmAuditFactory,
+)
+
+MODULE_PATH = "skillfarm.managers.characterupdatestatus"
+
+
+@patch(MODULE_PATH + ".app_settings.SKILLFARM_MAX_UPDATE_INTERVAL", 360)
+class TestCharacterUpdateStatusNextDueAt(SkillFarmTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+    def setUp(self):
+        super().setUp()
+        self.character = SkillFarmAuditFactory(user=self.user)
+        self.now = timezone.now()
+        CharacterUpdateStatusFactory(
+            character=self.character,
+            section=CharacterUpdateSection.SKILLQUEUE,
+            is_success=None,
+            error_message="",
+            has_token_error=False,
+            last_run_at=self.now,
+            last_run_finished_at=None,
+        )
+
+    def _update_section_log(self, **kwargs):
+        result = UpdateSectionResult(is_changed=True, is_updated=True, **kwargs)
+        CharacterUpdateStatus.objects.bulk_update_section_log(
+            CharacterUpdateSection.SKILLQUEUE, {self.character.pk: result}
+        )
+        return CharacterUpdateStatus.objects.get(
+            character=self.character, section=CharacterUpdateSection.SKILLQUEUE
+        )
+
+    def _add_skillqueue_entry(self, finish_date):
+        CharacterSkillqueueEntryFactory(
+            character=self.character,
+            start_date=self.now - timezone.timedelta(hours=1),
+            finish_date=finish_date,
+        )
+
+    def test_should_be_due_when_next_skill_finishes(self):
+        # given
+        finish_date = self.now + timezone.timedelta(hours=2)
+        self._add_skillqueue_entry(finish_date)
+        # when
+        status = self._update_section_log()
+        # then
+        self.assertEqual(status.next_due_at, finish_date)
+
+    def test_should_not_be_due_before_stale_time(self):
+        # given
+        self._add_skillqueue_entry(self.now + timezone.timedelta(minutes=5))
+        # when
+        status = self._update_section_log()
+        # then
+        self.assertGreaterEqual(
+            status.next_due_at, self.now + timezone.timedelta(minutes=30)
+        )
+        self.assertLess(status.next_due_at, self.now + timezone.timedelta(minutes=35))
+
+    def test_should_be_due_after_max_interval(self):
+        # given
+        self._add_skillqueue_entry(self.now + timezone.timedelta(days=9))
+        # when
+        status = self._update_section_log()
+        # then
+        self.assertGreaterEqual(
+            status.next_due_at, self.now + timezone.timedelta(minutes=360)
+        )
+        self.assertLess(status.next_due_at, self.now + timezone.timedelta(minutes=365))
+
+    def test_should_be_due_after_max_interval_without_training(self):
+        # when
+        status = self._update_section_log()
+        # then
+        self.assertGreaterEqual(
+            status.next_due_at, self.now + timezone.timedelta(minutes=360)
+        )
+
+    def test_should_store_payload_digest(self):
+        # when
+        status = self._update_section_log(payload_digest="abc")
+        # then
+        self.assertEqual(status.payload_digest, "abc")
+        self.assertEqual(
+            CharacterUpdateStatus.objects.get_payload_digests(
+                CharacterUpdateSection.SKILLQUEUE, [self.character.pk]
+            ),
+            {self.character.pk: "abc"},
+        )
+
+    def test_should_not_schedule_token_error(self):
+        # when
+        status = self._update_section_log(has_token_error=True)
+        # then
+        self.assertIsNone(status.next_due_at)
+
+
+class TestCharacterUpdateStatusFilterFresh(SkillFarmTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+    def _create_status(self, **kwargs):
+        character = SkillFarmAuditFactory(user=self.user)
+        params = {
+            "section": CharacterUpdateSection.SKILLS,
+            "is_success": True,
+            "error_message": "",
+            "has_token_error": False,
+            "last_run_at": timezone.now() - timezone.timedelta(hours=2),
+            "last_run_finished_at": timezone.now() - timezone.timedelta(hours=2),
+            "last_update_at": timezone.now() - timezone.timedelta(hours=2),
+            "last_update_finished_at": timezone.now() - timezone.timedelta(hours=2),
+        }
+        params.update(kwargs)
+        return CharacterUpdateStatusFactory(character=character, **params)
+
+    def test_should_be_fresh_before_next_due_at(self):
+        # given
+        status = self._create_status(
+            next_due_at=timezone.now() + timezone.timedelta(hours=1)
+        )
+        # when/then
+        self.assertEqual(list(CharacterUpdateStatus.objects.filter_fresh()), [status])
+        self.assertFalse(status.need_update())
+
+    def test_should_be_due_after_next_due_at(self):
+        # given
+        status = self._create_status(
+            last_run_finished_at=timezone.now(),
+            next_due_at=timezone.now() - timezone.timedelta(minutes=1),
+        )
+        # when/then
+        self.assertEqual(list(CharacterUpdateStatus.objects.filter_fresh()), [])
+        self.assertTrue(status.need_update())
+
+    def test_should_use_stale_time_without_next_due_at(self):
+        # given
+        status = self._create_status()
+        # when/then
+        self.assertEqual(list(CharacterUpdateStatus.objects.filter_fresh()), [])
+        self.assertTrue(status.need_update())
+
+
+class TestCharacterUpdateStatusBatchStatus(SkillFarmTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+    def test_should_return_status_per_character(self):
+        # given
+        character_ok = SkillFarmAuditFactory(user=self.user)
+        character_error = SkillFarmAuditFactory(user=self.superuser)
+        for section in CharacterUpdateSection.get_sections():
+            CharacterUpdateStatusFactory(
+                character=character_ok,
+                section=section,
+                is_success=True,
+                has_token_error=False,
+                last_update_finished_at=timezone.now(),
+            )
+        CharacterUpdateStatusFactory(
+            character=character_error,
+            section=CharacterUpdateSection.SKILLS,
+            is_success=False,
+            has_token_error=False,
+            last_update_finished_at=None,
+        )
+        # when
+        statuses = CharacterUpdateStatus.objects.get_statuses()
+        last_update_statuses = CharacterUpdateStatus.objects.last_update_statuses()
+        # then
+        self.assertEqual(
+            statuses,
+            {
+                character_ok.pk: character_ok.skillfarm_update_status.get_status(),
+                character_error.pk: character_error.skillfarm_update_status.get_status(),
+            },
+        )
+        self.assertEqual(
+            last_update_statuses,
+            {
+                character_ok.pk: character_ok.skillfarm_update_status.last_update_status()
+            },
+        )
@@ -1,17 +1,27 @@
+# Standard Library
+from unittest.mock import patch
+
 # Django
+from django.core.cache.backends.locmem import LocMemCache
 from django.utils import timezone
 
 # Alliance Auth
 from allianceauth.eveonline.models import EveCharacter
 
+# Alliance Auth (External Libs)
+from eve_sde.models import ItemType
+
 # AA Skillfarm
 from skillfarm.models.helpers.update_manager import CharacterUpdateSection, UpdateStatus
 from skillfarm.models.skillfarmaudit import SkillFarmAudit
 from skillfarm.tests import SkillFarmTestCase
 from skillfarm.tests.testdata.factory import (
+    CharacterSkillFactory,
+    CharacterSkillqueueEntryFactory,
     CharacterUpdateStatusFactory,
     EveCharacterFactory,
     SkillFarmAuditFactory,
+    SkillFarmSetupFactory,
     UserMainFactory,
 )
 from skillfarm.tests.testdata.utils import (
@@ -135,6 +145,198 @@ class TestCharacterAnnotateTotalUpdateStatus(SkillFarmTestCase):
         )
 
 
+class TestSkillfarmAuditStaleSections(SkillFarmTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+    def _create_status(self, character, section, **kwargs):
+        params = {
+            "is_success": True,
+            "error_message": "",
+            "has_token_error": False,
+            "last_run_at": timezone.now(),
+            "last_run_finished_at": timezone.now(),
+            "last_update_at": timezone.now(),
+            "last_update_finished_at": timezone.now(),
+        }
+        params.update(kwargs)
+        return CharacterUpdateStatusFactory(
+            character=character, section=section, **params
+        )
+
+    def test_should_return_all_sections_without_status(self):
+        # given
+        character = SkillFarmAuditFactory(user=self.user)
+        # when
+        result = SkillFarmAudit.objects.stale_sections()
+        # then
+        self.assertEqual(result, {character.pk: CharacterUpdateSection.get_sections()})
+
+    def test_should_skip_fresh_sections(self):
+        # given
+        character = SkillFarmAuditFactory(user=self.user)
+        self._create_status(character, CharacterUpdateSection.SKILLS)
+        # when
+        result = SkillFarmAudit.objects.stale_sections()
+        # then
+        self.assertEqual(result, {character.pk: [CharacterUpdateSection.SKILLQUEUE]})
+
+    def test_should_return_stale_and_failed_sections(self):
+        # given
+        character = SkillFarmAuditFactory(user=self.user)
+        self._create_status(
+            character,
+            CharacterUpdateSection.SKILLS,
+            last_run_finished_at=timezone.now() - timezone.timedelta(hours=1),
+        )
+        self._create_status(
+            character, CharacterUpdateSection.SKILLQUEUE, is_success=False
+        )
+        # when
+        result = SkillFarmAudit.objects.stale_sections()
+        # then
+        self.assertEqual(result, {character.pk: CharacterUpdateSection.get_sections()})
+
+    def test_should_ignore_token_errors(self):
+        # given
+        character = SkillFarmAuditFactory(user=self.user)
+        for section in CharacterUpdateSection.get_sections():
+            self._create_status(
+                character, section, is_success=False, has_token_error=True
+            )
+        # when
+        result = SkillFarmAudit.objects.stale_sections()
+        # then
+        self.assertEqual(result, {})
+
+    def test_should_match_need_update(self):
+        # given
+        character = SkillFarmAuditFactory(user=self.user)
+        CharacterUpdateStatusFactory(
+            character=character, section=CharacterUpdateSection.SKILLS
+        )
+        CharacterUpdateStatusFactory(
+            character=character, section=CharacterUpdateSection.SKILLQUEUE
+        )
+        expected = [
+            section
+            for section, needs_update in character.update_manager.calc_update_needed().section_map.items()
+            if needs_update
+        ]
+        # when
+        result = SkillFarmAudit.objects.stale_sections()
+        # then
+        self.assertEqual(result.get(character.pk, []), expected)
+
+
+class TestSkillfarmAuditUpdateFarmState(SkillFarmTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.skill_1, cls.skill_2 = ItemType.objects.filter(group__category__id=16)[:2]
+
+    def setUp(self):
+        super().setUp()
+        self.character = SkillFarmAuditFactory(user=self.user)
+        self.now = timezone.now()
+
+    def test_should_store_farm_state(self):
+        """
+        Test should store the farm state computed from skills and skillqueue.
+        """
+        # given
+        SkillFarmSetupFactory(
+            character=self.character, skillset=[self.skill_1.name, self.skill_2.name]
+        )
+        CharacterSkillFactory(
+            character=self.character,
+            eve_type=self.skill_1,
+            trained_skill_level=5,
+            skillpoints_in_skill=1_000,
+        )
+        CharacterSkillFactory(
+            character=self.character,
+            eve_type=self.skill_2,
+            trained_skill_level=4,
+            skillpoints_in_skill=500,
+        )
+        CharacterSkillqueueEntryFactory(
+            character=self.character,
+            eve_type=self.skill_2,
+            finished_level=5,
+            start_date=self.now - timezone.timedelta(days=2),
+            finish_date=self.now - timezone.timedelta(days=1),
+        )
+        CharacterSkillqueueEntryFactory(
+            character=self.character,
+            eve_type=self.skill_1,
+            start_date=self.now - timezone.timedelta(days=1),
+            finish_date=self.now + timezone.timedelta(days=1),
+        )
+        # when
+        result = SkillFarmAudit.objects.filter(pk=self.character.pk).update_farm_state()
+        # then
+        self.assertEqual(result, 1)
+        self.character.refresh_from_db()
+        self.assertTrue(self.character.is_training)
+        self.assertTrue(self.character.is_training_active)
+        self.assertEqual(
+            self.character.queue_finish_at, self.now + timezone.timedelta(days=1)
+        )
+        self.assertEqual(self.character.extraction_ready_count, 1)
+        self.assertEqual(self.character.extraction_ready_in_queue, 1)
+        self.assertEqual(self.character.total_sp, 1_500)
+        self.assertTrue(self.character.has_skillset)
+
+    def test_should_reset_farm_state(self):
+        """
+        Test should reset the farm state of a character without data.
+        """
+        # given
+        SkillFarmAudit.objects.filter(pk=self.character.pk).update(
+            is_training=True,
+            queue_finish_at=self.now,
+            extraction_ready_count=2,
+            extraction_ready_in_queue=1,
+            total_sp=100,
+            has_skillset=True,
+        )
+        # when
+        SkillFarmAudit.objects.filter(pk=self.character.pk).update_farm_state()
+        # then
+        self.character.refresh_from_db()
+        self.assertFalse(self.character.is_training)
+        self.assertIsNone(self.character.queue_finish_at)
+        self.assertEqual(self.character.extraction_ready_count, 0)
+        self.assertEqual(self.character.extraction_ready_in_queue, 0)
+        self.assertEqual(self.character.total_sp, 0)
+        self.assertFalse(self.character.has_skillset)
+
+    def test_should_not_count_extractions_without_skillset(self):
+        """
+        Test should not count level 5 skills when the character has no skillset.
+        """
+        # given
+        CharacterSkillFactory(
+            character=self.character, eve_type=self.skill_1, trained_skill_level=5
+        )
+        # when
+        SkillFarmAudit.objects.filter(pk=self.character.pk).update_farm_state()
+        # then
+        self.character.refresh_from_db()
+        self.assertEqual(self.character.extraction_ready_count, 0)
+        self.assertFalse(self.character.has_skillset)
+
+    def test_should_return_zero_for_empty_queryset(self):
+        """
+        Test should not run any update for an empty queryset.
+        """
+        # when/then
+        with self.assertNumQueries(0):
+            self.assertEqual(SkillFarmAudit.objects.none().update_farm_state(), 0)
+
+
 class TestSkillfarmAuditVisibleTo(SkillFarmTestCase):
     @classmethod
     def setUpClass(cls):
@@ -223,3 +425,107 @@ class TestSkillfarmAuditVisibleEveCharacter(SkillFarmTestCase):
         qs = SkillFarmAudit.objects.visible_eve_characters(other_user)
         # then
         self.assertEqual(list(qs), list(eve_characters))
+
+
+class TestSkillfarmAuditCanView(SkillFarmTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+    def test_should_view_own_character(self):
+        """
+        Test should allow the owner to view the own characters.
+        """
+        # given
+        character = EveCharacterFactory()
+        add_alt_character_to_user(user=self.user, character_id=character.character_id)
+        # when/then
+        self.assertTrue(
+            SkillFarmAudit.objects.can_view(self.user, character.character_id)
+        )
+        self.assertTrue(
+            SkillFarmAudit.objects.can_view(self.user, self.user_character.character_id)
+        )
+
+    def test_should_not_view_character_of_other_user(self):
+        """
+        Test should not allow a user to view characters of other users.
+        """
+        self.assertFalse(
+            SkillFarmAudit.objects.can_view(
+                self.user, self.superuser_character.character_id
+            )
+        )
+
+    def test_should_view_corporation_character_with_corp_access(self):
+        """
+        Test should allow corp access users to view characters of the own corporation.
+        """
+        # given
+        corp_character = EveCharacterFactory(corporation=self.corp)
+        corp_user = UserMainFactory(
+            permissions__=["skillfarm.basic_access", "skillfarm.corp_access"],
+            main_character__character=EveCharacterFactory(corporation=self.corp),
+        )
+        # when/then
+        self.assertTrue(
+            SkillFarmAudit.objects.can_view(corp_user, corp_character.character_id)
+        )
+        self.assertFalse(
+            SkillFarmAudit.objects.can_view(
+                corp_user, self.superuser_character.character_id
+            )
+        )
+
+    def test_should_view_all_characters_as_admin(self):
+        """
+        Test should allow admins and superusers to view all existing characters.
+        """
+        # given
+        admin = UserMainFactory(
+            permissions__=["skillfarm.basic_access", "skillfarm.admin_access"]
+        )
+        # when/then
+        self.assertTrue(
+            SkillFarmAudit.objects.can_view(admin, self.user_character.character_id)
+        )
+        self.assertTrue(
+            SkillFarmAudit.objects.can_view(
+                self.superuser, self.user_character.character_id
+            )
+        )
+        self.assertFalse(SkillFarmAudit.objects.can_view(self.superuser, 1))
+
+    def test_should_check_with_one_query(self):
+        """
+        Test should check the visibility with one query independent of the number of characters.
+        """
+        # given
+        for _ in range(5):
+            EveCharacterFactory()
+        # when/then
+        with self.assertNumQueries(1):
+            SkillFarmAudit.objects.can_view(
+                self.superuser, self.user_character.character_id
+            )
+
+    def test_should_check_own_character_without_query(self):
+        """
+        Test should check an owned character against the visibility scope without a query.
+        """
+        # given
+        with (
+            patch("skillfarm.helpers.visibility.cache", LocMemCache("can_view", {})),
+            patch(
+                "skillfarm.helpers.visibility.app_settings.SKILLFARM_VISIBILITY_CACHE_TIMEOUT",
+                60,
+            ),
+        ):
+            SkillFarmAudit.objects.can_view(self.user, self.user_character.character_id)
+            # when/then
+            with self.assertNumQueries(0):
+                self.assertTrue(
+                    SkillFarmAudit.objects.can_view(
+                        self.user, self.user_character.character_id
+                    )
+                )
@@ -1,10 +1,21 @@
+# Standard Library
+from types import SimpleNamespace
+
 # Third Party
 import pook
 
+# Django
+from django.utils import timezone
+
 # AA Skillfarm
+from skillfarm.helpers.eve_types import eve_type_resolver
 from skillfarm.models.prices import EveType
+from skillfarm.models.skillfarmaudit import CharacterSkillqueueEntry
 from skillfarm.tests import SkillFarmTestCase
-from skillfarm.tests.testdata.factory import SkillFarmAuditFactory
+from skillfarm.tests.testdata.factory import (
+    CharacterSkillqueueEntryFactory,
+    SkillFarmAuditFactory,
+)
 
 MODULE_PATH = "skillfarm.managers.skillqueue"
 
@@ -69,3 +80,87 @@ class TestSkillQueueManager(SkillFarmTestCase):
         self.assertEqual(obj.level_start_sp, 4000)
         self.assertEqual(obj.level_end_sp, 16000)
         self.assertEqual(obj.finished_level, 4)
+
+
+class TestSkillQueueManagerMerge(SkillFarmTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.skillfarm_audit = SkillFarmAuditFactory(user=cls.user)
+        cls.start_date = timezone.now().replace(microsecond=0)
+
+    def setUp(self):
+        super().setUp()
+        self.entries = [
+            CharacterSkillqueueEntryFactory(
+                character=self.skillfarm_audit,
+                eve_type=EveType.objects.get(id=skill_id),
+                queue_position=position,
+                finish_date=self.start_date + timezone.timedelta(days=position + 1),
+                finished_level=5,
+                level_end_sp=512000,
+                level_start_sp=128000,
+                start_date=self.start_date + timezone.timedelta(days=position),
+                training_start_sp=128000,
+            )
+            for position, skill_id in enumerate([1, 2])
+        ]
+        eve_type_resolver.resolve_ids([1, 2])
+
+    def _entry(self, obj, **kwargs):
+        values = {
+            "skill_id": obj.eve_type_id,
+            "queue_position": obj.queue_position,
+            "finish_date": obj.finish_date,
+            "finished_level": obj.finished_level,
+            "level_end_sp": obj.level_end_sp,
+            "level_start_sp": obj.level_start_sp,
+            "start_date": obj.start_date,
+            "training_start_sp": obj.training_start_sp,
+        }
+        values.update(kwargs)
+        return SimpleNamespace(**values)
+
+    def test_should_not_write_unchanged_queue(self):
+        # given
+        queue = [self._entry(obj) for obj in self.entries]
+        # when
+        with self.assertNumQueries(3):  # savepoint, select, release
+            changed_rows = CharacterSkillqueueEntry.objects._bulk_update_or_create_objs(
+                {self.skillfarm_audit: queue}
+            )
+        # then
+        self.assertEqual(changed_rows, {})
+
+    def test_should_merge_changed_entries_and_delete_tail(self):
+        # given
+        queue = [self._entry(self.entries[0], training_start_sp=200000)]
+        # when
+        changed_rows = CharacterSkillqueueEntry.objects._bulk_update_or_create_objs(
+            {self.skillfarm_audit: queue}
+        )
+        # then
+        self.assertEqual(changed_rows, {self.skillfarm_audit.pk: 2})
+        obj = self.skillfarm_audit.skillfarm_skillqueue.get()
+        self.assertEqual(obj.pk, self.entries[0].pk)
+        self.assertEqual(obj.training_start_sp, 200000)
+
+    def test_should_insert_new_positions(self):
+        # given
+        queue = [self._entry(obj) for obj in self.entries]
+        queue.append(self._entry(self.entries[1], queue_position=2, skill_id=1))
+        # when
+        changed_rows = CharacterSkillqueueEntry.objects._bulk_update_or_create_objs(
+            {self.skillfarm_audit: queue}
+        )
+        # then
+        self.assertEqual(changed_rows, {self.skillfarm_audit.pk: 1})
+        self.assertEqual(
+            list(
+                self.skillfarm_audit.skillfarm_skillqueue.order_by(
+                    "queue_position"
+                ).values_list("eve_type_id", flat=True)
+            ),
+            [1, 2, 1],
+        )
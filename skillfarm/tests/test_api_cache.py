@@ -0,0 +1,453 @@
+# Standard Library
+import json
+import time
+from http import HTTPStatus
+from unittest.mock import MagicMock, patch
+
+# Third Party
+from ninja import Schema
+
+# Django
+from django.core.cache.backends.locmem import LocMemCache
+from django.urls import reverse
+
+# Alliance Auth (External Libs)
+from eve_sde.models.types import ItemType as EveType
+
+# AA Skillfarm
+from skillfarm.api.skillfarm import SkillFarmDetailsResponse
+from skillfarm.helpers.api_cache import ApiResponseCache
+from skillfarm.models.general import UpdateSectionResult
+from skillfarm.models.helpers.update_manager import CharacterUpdateSection
+from skillfarm.models.skillfarmaudit import SkillFarmAudit
+from skillfarm.tests import SkillFarmTestCase
+from skillfarm.tests.testdata.factory import (
+    EveCharacterFactory,
+    SkillFarmAuditFactory,
+    UserMainFactory,
+)
+from skillfarm.tests.testdata.utils import add_alt_character_to_user
+
+MODULE_PATH = "skillfarm.helpers.api_cache"
+
+
+def patch_local_cache(test_case: SkillFarmTestCase) -> None:
+    """Replace the Django cache with an empty local memory cache."""
+    local_cache = LocMemCache("api_cache", {})
+    local_cache.clear()
+    patcher = patch(MODULE_PATH + ".cache", local_cache)
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
+
+
+class DummySchema(Schema):
+    value: int
+
+
+@patch(MODULE_PATH + ".app_settings.SKILLFARM_API_CACHE_TIMEOUT", 60)
+class TestApiResponseCache(SkillFarmTestCase):
+    def setUp(self):
+        super().setUp()
+        patch_local_cache(self)
+        self.api_cache = ApiResponseCache()
+        self.compute = MagicMock(return_value=DummySchema(value=1))
+
+    def _get_or_set(self, user_id=1, scope="owner:1"):
+        return self.api_cache.get_or_set(
+            endpoint="details",
+            user_id=user_id,
+            target=1001,
+            scope=scope,
+            compute=self.compute,
+        )
+
+    def test_should_serve_cached_response(self):
+        """
+        Test should compute the response once and serve it from the cache.
+        """
+        # when
+        first = self._get_or_set()
+        second = self._get_or_set()
+        # then
+        self.assertEqual(first, DummySchema(value=1))
+        self.assertEqual(second, {"value": 1})
+        self.compute.assert_called_once()
+
+    def test_should_cache_per_user(self):
+        """
+        Test should not share a cached response between users.
+        """
+        # when
+        self._get_or_set(user_id=1)
+        self._get_or_set(user_id=2)
+        # then
+        self.assertEqual(self.compute.call_count, 2)
+
+    def test_should_recompute_after_bump(self):
+        """
+        Test should recompute the response after its scope has been bumped.
+        """
+        # given
+        self._get_or_set()
+        # when
+        self.api_cache.bump("owner:1")
+        self._get_or_set()
+        # then
+        self.assertEqual(self.compute.call_count, 2)
+
+    def test_should_keep_other_scopes(self):
+        """
+        Test should keep the cached responses of other scopes on a bump.
+        """
+        # given
+        self._get_or_set()
+        # when
+        self.api_cache.bump("owner:2")
+        self._get_or_set()
+        # then
+        self.compute.assert_called_once()
+
+    def test_should_not_cache_when_disabled(self):
+        """
+        Test should compute every response when the cache is disabled.
+        """
+        # when
+        with patch(MODULE_PATH + ".app_settings.SKILLFARM_API_CACHE_TIMEOUT", 0):
+            self._get_or_set()
+            self._get_or_set()
+        # then
+        self.assertEqual(self.compute.call_count, 2)
+
+
+@patch(MODULE_PATH + ".app_settings.SKILLFARM_API_CACHE_TIMEOUT", 60)
+class TestApiCacheInvalidation(SkillFarmTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.audit = SkillFarmAuditFactory(user=cls.user)
+
+    def setUp(self):
+        super().setUp()
+        patch_local_cache(self)
+        self.url = reverse(
+            "skillfarm:api:get_details",
+            kwargs={"character_id": self.user_character.character_id},
+        )
+        self.client.force_login(self.user)
+
+    def test_should_bump_owner_scope_after_commit(self):
+        """
+        Test should bump the scope of the owner once the transaction is committed.
+        """
+        # given
+        api_cache = ApiResponseCache()
+        scope = api_cache.owner_scope(self.user.pk)
+        version = api_cache.get_version(scope)
+        # when
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            SkillFarmAudit.objects.filter(pk=self.audit.pk).invalidate_api_cache()
+            self.assertEqual(api_cache.get_version(scope), version)
+        # then
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(api_cache.get_version(scope), version + 1)
+
+    @patch("skillfarm.api.skillfarm.get_details_response")
+    def test_should_serve_details_from_cache(self, mock_get_details_response):
+        """
+        Test should serve repeated details requests from the cache.
+        """
+        # given
+        mock_get_details_response.return_value = SkillFarmDetailsResponse()
+        # when
+        self.client.get(self.url)
+        response = self.client.get(self.url)
+        # then
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        mock_get_details_response.assert_called_once()
+
+    @patch("skillfarm.api.skillfarm.get_details_response")
+    def test_should_invalidate_details_on_mark_as_read(self, mock_get_details_response):
+        """
+        Test should recompute the details after a character has been marked as read.
+        """
+        # given
+        mock_get_details_response.return_value = SkillFarmDetailsResponse()
+        self.client.get(self.url)
+        # when
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse(
+                    "skillfarm:mark_as_read",
+                    kwargs={"character_id": self.user_character.character_id},
+                )
+            )
+        self.client.get(self.url)
+        # then
+        self.assertEqual(mock_get_details_response.call_count, 2)
+
+
+@patch(MODULE_PATH + ".app_settings.SKILLFARM_API_CACHE_TIMEOUT", 60)
+@patch("skillfarm.api.skillfarm.get_details_response")
+class TestApiConditionalGet(SkillFarmTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.audit = SkillFarmAuditFactory(user=cls.user)
+
+    def setUp(self):
+        super().setUp()
+        patch_local_cache(self)
+        # Start of an ETag window, so the requests of a test share the window
+        window = ApiResponseCache.ETAG_WINDOW
+        self.now = time.time() // window * window
+        patcher = patch(MODULE_PATH + ".time.time", return_value=self.now)
+        self.mock_time = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.url = reverse(
+            "skillfarm:api:get_details",
+            kwargs={"character_id": self.user_character.character_id},
+        )
+        self.client.force_login(self.user)
+
+    def test_should_return_etag(self, mock_get_details_response):
+        """
+        Test should return an ETag that forces the browser to revalidate.
+        """
+        # given
+        mock_get_details_response.return_value = SkillFarmDetailsResponse()
+        # when
+        response = self.client.get(self.url)
+        # then
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(response.has_header("ETag"))
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertIn("private", response["Cache-Control"])
+
+    def test_should_return_not_modified(self, mock_get_details_response):
+        """
+        Test should answer a matching If-None-Match without building the response.
+        """
+        # given
+        mock_get_details_response.return_value = SkillFarmDetailsResponse()
+        etag = self.client.get(self.url)["ETag"]
+        mock_get_details_response.reset_mock()
+        # when
+        response = self.client.get(self.url, headers={"If-None-Match": etag})
+        # then
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+        mock_get_details_response.assert_not_called()
+
+    def test_should_match_weak_etag(self, mock_get_details_response):
+        """
+        Test should answer the weakened ETag of a compressed response with 304.
+        """
+        # given
+        mock_get_details_response.return_value = SkillFarmDetailsResponse()
+        etag = self.client.get(self.url)["ETag"]
+        # when
+        response = self.client.get(self.url, headers={"If-None-Match": f"W/{etag}"})
+        # then
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_should_return_new_etag_after_change(self, mock_get_details_response):
+        """
+        Test should return the full response after a character has been changed.
+        """
+        # given
+        mock_get_details_response.return_value = SkillFarmDetailsResponse()
+        etag = self.client.get(self.url)["ETag"]
+        # when
+        with self.captureOnCommitCallbacks(execute=True):
+            SkillFarmAudit.objects.filter(pk=self.audit.pk).invalidate_api_cache()
+        response = self.client.get(self.url, headers={"If-None-Match": etag})
+        # then
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_should_return_not_modified_when_disabled(self, mock_get_details_response):
+        """
+        Test should answer a matching If-None-Match while the response cache is disabled.
+        """
+        # given
+        mock_get_details_response.return_value = SkillFarmDetailsResponse()
+        # when
+        with patch(MODULE_PATH + ".app_settings.SKILLFARM_API_CACHE_TIMEOUT", 0):
+            etag = self.client.get(self.url)["ETag"]
+            response = self.client.get(self.url, headers={"If-None-Match": etag})
+        # then
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_should_keep_etag_within_window(self, mock_get_details_response):
+        """
+        Test should answer with 304 within the ETag window while the character has not changed.
+        """
+        # given
+        mock_get_details_response.return_value = SkillFarmDetailsResponse()
+        etag = self.client.get(self.url)["ETag"]
+        # when
+        self.mock_time.return_value = self.now + ApiResponseCache.ETAG_WINDOW - 1
+        response = self.client.get(self.url, headers={"If-None-Match": etag})
+        # then
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_should_return_new_etag_after_window(self, mock_get_details_response):
+        """
+        Test should return the full response after the ETag window, relative times and progress have changed.
+        """
+        # given
+        mock_get_details_response.return_value = SkillFarmDetailsResponse()
+        etag = self.client.get(self.url)["ETag"]
+        # when
+        self.mock_time.return_value = self.now + ApiResponseCache.ETAG_WINDOW
+        response = self.client.get(self.url, headers={"If-None-Match": etag})
+        # then
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class TestApiEndpointCacheInvalidation(SkillFarmTestCase):
+    """Test that changes of a character invalidate its cached API responses."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.audit = SkillFarmAuditFactory(user=cls.user)
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse(
+            "skillfarm:api:get_details_data",
+            kwargs={"character_id": self.user_character.character_id},
+        )
+        self.client.force_login(self.user)
+
+    def _get_characters(self, response) -> list[dict]:
+        data = response.json()
+        return data["active_characters"] + data["inactive_characters"]
+
+    def test_should_remove_deleted_character(self):
+        """
+        Test should not serve a deleted character from the cache.
+        """
+        # given
+        self.assertEqual(len(self._get_characters(self.client.get(self.url))), 1)
+        # when
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse(
+                    "skillfarm:delete_character",
+                    kwargs={"character_id": self.user_character.character_id},
+                )
+            )
+        response = self.client.get(self.url)
+        # then
+        self.assertEqual(self._get_characters(response), [])
+
+    def test_should_remove_transferred_character(self):
+        """
+        Test should not serve a character from the cache that moved to another user.
+        """
+        # given
+        character = EveCharacterFactory()
+        ownership = add_alt_character_to_user(
+            user=self.user, character_id=character.character_id
+        )
+        SkillFarmAuditFactory(user=self.user, character=character)
+        self.assertEqual(len(self._get_characters(self.client.get(self.url))), 2)
+        # when
+        with self.captureOnCommitCallbacks(execute=True):
+            ownership.delete()
+            add_alt_character_to_user(
+                user=UserMainFactory(), character_id=character.character_id
+            )
+        response = self.client.get(self.url)
+        # then
+        self.assertEqual(len(self._get_characters(response)), 1)
+
+    def test_should_show_changed_skillset(self):
+        """
+        Test should not serve the old skillset filter from the cache.
+        """
+        # given
+        skill = EveType.objects.filter(group__category__id=16).first()
+        characters = self._get_characters(self.client.get(self.url))
+        self.assertFalse(characters[0]["details"]["is_filter"])
+        # when
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse(
+                    "skillfarm:edit_skillsetup",
+                    kwargs={"character_id": self.user_character.character_id},
+                ),
+                data=json.dumps({"selected_skills": [skill.name]}),
+                content_type="application/json",
+            )
+        characters = self._get_characters(self.client.get(self.url))
+        # then
+        self.assertTrue(characters[0]["details"]["is_filter"])
+
+    def test_should_show_section_update(self):
+        """
+        Test should answer with the new update status after a section update.
+        """
+        # given
+        first = self.client.get(self.url)
+        # when
+        with self.captureOnCommitCallbacks(execute=True):
+            for section in CharacterUpdateSection.get_sections():
+                self.audit.update_manager.update_section_log(
+                    CharacterUpdateSection(section),
+                    UpdateSectionResult(is_changed=True, is_updated=True),
+                )
+        response = self.client.get(self.url, headers={"If-None-Match": first["ETag"]})
+        # then
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertNotEqual(
+            self._get_characters(response)[0]["details"]["update_status"],
+            self._get_characters(first)[0]["details"]["update_status"],
+        )
+
+
+class TestApiOverviewCacheInvalidation(SkillFarmTestCase):
+    """Test that visibility changes invalidate the cached overview."""
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("skillfarm:api:get_character_overview_data")
+        self.client.force_login(self.superuser)
+
+    def _get_character_names(self) -> list[str]:
+        response = self.client.get(self.url)
+        return [
+            character["character"]["character_name"]
+            for character in response.json()["characters"]
+        ]
+
+    def test_should_show_new_main_character(self):
+        """
+        Test should list the main character of a new user.
+        """
+        # given
+        self._get_character_names()
+        # when
+        with self.captureOnCommitCallbacks(execute=True):
+            user = UserMainFactory()
+        # then
+        self.assertIn(
+            user.profile.main_character.character_name, self._get_character_names()
+        )
+
+    def test_should_show_renamed_main_character(self):
+        """
+        Test should list the new name of a main character.
+        """
+        # given
+        self._get_character_names()
+        # when
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user_character.character_name = "Renamed Main"
+            self.user_character.save()
+        # then
+        self.assertIn("Renamed Main", self._get_character_names())
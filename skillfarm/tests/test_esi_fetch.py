@@ -0,0 +1,114 @@
+# Standard Library
+from unittest.mock import patch
+
+# Alliance Auth
+from esi.errors import TokenError
+from esi.exceptions import ESIErrorLimitException
+
+# AA Skillfarm
+from skillfarm.helpers.esi_fetch import fetch_characters_sections
+from skillfarm.models.helpers.update_manager import CharacterUpdateSection
+from skillfarm.tests import SkillFarmTestCase
+from skillfarm.tests.testdata.factory import SkillFarmAuditFactory
+
+MODULE_PATH = "skillfarm.helpers.esi_fetch"
+
+
+@patch(MODULE_PATH + ".SkillFarmAudit.get_tokens")
+@patch("skillfarm.managers.skillqueue.SkillqueueManager._fetch_esi_items")
+@patch("skillfarm.managers.characterskill.SkillManager._fetch_esi_items")
+class TestFetchCharactersSections(SkillFarmTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.skillfarm_audit = SkillFarmAuditFactory(user=cls.user)
+        cls.skillfarm_audit_2 = SkillFarmAuditFactory(user=cls.superuser)
+
+    def test_should_fetch_all_sections(
+        self, mock_fetch_skills, mock_fetch_skillqueue, __
+    ):
+        """
+        Test should fetch every section for every character.
+        """
+        # given
+        mock_fetch_skills.return_value = ["skills"]
+        mock_fetch_skillqueue.return_value = ["skillqueue"]
+        characters = [self.skillfarm_audit, self.skillfarm_audit_2]
+        # when
+        result = fetch_characters_sections(
+            characters, CharacterUpdateSection.get_sections()
+        )
+        # then
+        self.assertEqual(
+            result,
+            {
+                CharacterUpdateSection.SKILLS: {
+                    character: ["skills"] for character in characters
+                },
+                CharacterUpdateSection.SKILLQUEUE: {
+                    character: ["skillqueue"] for character in characters
+                },
+            },
+        )
+        self.assertEqual(mock_fetch_skills.call_count, 2)
+        self.assertEqual(mock_fetch_skillqueue.call_count, 2)
+
+    def test_should_return_token_error_for_all_sections(
+        self, mock_fetch_skills, mock_fetch_skillqueue, mock_get_tokens
+    ):
+        """
+        Test should return a token error for each section without fetching.
+        """
+        # given
+        mock_get_tokens.return_value = {}
+        # when
+        result = fetch_characters_sections(
+            [self.skillfarm_audit], CharacterUpdateSection.get_sections()
+        )
+        # then
+        for section in CharacterUpdateSection.get_sections():
+            self.assertIsInstance(result[section][self.skillfarm_audit], TokenError)
+        mock_fetch_skills.assert_not_called()
+        mock_fetch_skillqueue.assert_not_called()
+
+    def test_should_use_prefetched_tokens(
+        self, mock_fetch_skills, mock_fetch_skillqueue, mock_get_tokens
+    ):
+        """
+        Test should pass the prefetched token to the section fetchers.
+        """
+        # given
+        token = self.user.token_set.first()
+        # when
+        fetch_characters_sections(
+            [self.skillfarm_audit],
+            [CharacterUpdateSection.SKILLS],
+            tokens={self.skillfarm_audit.pk: token},
+        )
+        # then
+        mock_get_tokens.assert_not_called()
+        mock_fetch_skills.assert_called_once_with(
+            character=self.skillfarm_audit, force_refresh=False, token=token
+        )
+
+    def test_should_stop_after_retryable_error(
+        self, mock_fetch_skills, mock_fetch_skillqueue, __
+    ):
+        """
+        Test should not start further requests after a retryable ESI error.
+        """
+        # given
+        error = ESIErrorLimitException(reset=60)
+        mock_fetch_skills.side_effect = error
+        # when
+        result = fetch_characters_sections(
+            [self.skillfarm_audit, self.skillfarm_audit_2],
+            [CharacterUpdateSection.SKILLS],
+            limit=1,
+        )
+        # then
+        self.assertEqual(mock_fetch_skills.call_count, 1)
+        self.assertEqual(
+            list(result[CharacterUpdateSection.SKILLS].values()), [error, error]
+        )
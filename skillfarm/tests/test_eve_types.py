@@ -0,0 +1,58 @@
+# Alliance Auth (External Libs)
+from eve_sde.models import EveSDE
+
+# AA Skillfarm
+from skillfarm.helpers.eve_types import EveTypeResolver, eve_type_resolver
+from skillfarm.tests import SkillFarmTestCase
+
+
+class TestEveTypeResolver(SkillFarmTestCase):
+    def setUp(self):
+        super().setUp()
+        self.resolver = EveTypeResolver()
+
+    def test_should_resolve_all_ids_with_one_query(self):
+        # when/then
+        with self.assertNumQueries(1):
+            self.assertEqual(self.resolver.resolve_ids([1, 2]), {1, 2})
+
+    def test_should_resolve_cached_ids_without_query(self):
+        # given
+        self.resolver.resolve_ids([1, 2])
+        # when/then
+        with self.assertNumQueries(0):
+            self.assertEqual(self.resolver.resolve_ids([1, 2]), {1, 2})
+
+    def test_should_skip_unknown_ids(self):
+        # when
+        result = self.resolver.resolve_ids([1, 999_999_999])
+        # then
+        self.assertEqual(result, {1})
+
+    def test_should_evict_least_recently_used_ids(self):
+        # given
+        resolver = EveTypeResolver(maxsize=1)
+        # when
+        resolver.resolve_ids([1])
+        resolver.resolve_ids([2])
+        # then
+        with self.assertNumQueries(1):
+            resolver.resolve_ids([1])
+
+    def test_should_clear_on_sde_reload(self):
+        # given
+        eve_type_resolver.resolve_ids([1])
+        # when
+        EveSDE.get_solo().save()
+        # then
+        with self.assertNumQueries(1):
+            eve_type_resolver.resolve_ids([1])
+
+    def test_should_clear_on_sde_reload_in_other_process(self):
+        # given
+        self.resolver.resolve_ids([1])
+        # when
+        EveTypeResolver.bump_version()
+        # then
+        with self.assertNumQueries(1):
+            self.resolver.resolve_ids([1])
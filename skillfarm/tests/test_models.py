@@ -8,16 +8,23 @@ from django.utils import timezone
 from esi.errors import TokenError
 from esi.exceptions import HTTPServerError
 
+# Alliance Auth (External Libs)
+from eve_sde.models.types import ItemType as EveType
+
 # AA Skillfarm
 from skillfarm.models.general import UpdateSectionResult
 from skillfarm.models.helpers.update_manager import CharacterUpdateSection
 from skillfarm.models.skillfarmaudit import (
+    CharacterSkill,
     CharacterUpdateStatus,
+    SkillFarmAudit,
 )
 from skillfarm.tests import SkillFarmTestCase
 from skillfarm.tests.testdata.factory import (
+    CharacterSkillFactory,
     CharacterUpdateStatusFactory,
     SkillFarmAuditFactory,
+    SkillFarmSetupFactory,
 )
 
 MODULE_PATH = "skillfarm.models.skillfarmaudit"
@@ -123,6 +130,20 @@ class TestSkillfarmModel(SkillFarmTestCase):
         with self.assertRaises(TokenError):
             self.no_token_audit.get_token()
 
+    def test_get_tokens_should_return_valid_tokens_only(self):
+        """
+        Test should return the tokens of characters with a valid token only.
+        """
+        # Test Action
+        no_token_audit = SkillFarmAuditFactory(user__main_character__scopes=[])
+        tokens = SkillFarmAudit.get_tokens([self.skillfarm_audit, no_token_audit])
+        # Expected Result
+        self.assertEqual(list(tokens), [self.skillfarm_audit.pk])
+        self.assertEqual(
+            tokens[self.skillfarm_audit.pk].character_id,
+            self.skillfarm_audit.character.character_id,
+        )
+
     def test_perform_update_status(self):
         """
         Test the perform_update_status method for token error scenario.
@@ -212,3 +233,66 @@ class TestSkillfarmModel(SkillFarmTestCase):
         )
         self.assertFalse(status_obj.is_success)
         self.assertFalse(status_obj.has_token_error)
+
+
+class TestSkillFarmSetupModel(SkillFarmTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.skill_1, cls.skill_2 = EveType.objects.filter(group__category__id=16)[:2]
+
+    def setUp(self):
+        super().setUp()
+        self.skillfarm_audit = SkillFarmAuditFactory(user=self.user)
+
+    def test_should_store_skillset_type_ids(self):
+        """
+        Test should store the type ids of the skillset on save.
+        """
+        # when
+        setup = SkillFarmSetupFactory(
+            character=self.skillfarm_audit,
+            skillset=[self.skill_2.name, self.skill_1.name, "Unknown Skill"],
+        )
+        # then
+        self.assertEqual(
+            setup.skillset_type_ids, sorted([self.skill_1.id, self.skill_2.id])
+        )
+
+    def test_should_clear_skillset_type_ids(self):
+        """
+        Test should clear the type ids when the skillset is removed.
+        """
+        # given
+        setup = SkillFarmSetupFactory(
+            character=self.skillfarm_audit, skillset=[self.skill_1.name]
+        )
+        # when
+        setup.skillset = None
+        setup.save(update_fields=["skillset"])
+        # then
+        setup.refresh_from_db()
+        self.assertEqual(setup.skillset_type_ids, [])
+
+    def test_should_match_extractions_by_type_id(self):
+        """
+        Test should match the extraction ready skills by type id.
+        """
+        # given
+        SkillFarmSetupFactory(
+            character=self.skillfarm_audit, skillset=[self.skill_1.name]
+        )
+        skill = CharacterSkillFactory(
+            character=self.skillfarm_audit,
+            eve_type=self.skill_1,
+            trained_skill_level=5,
+        )
+        CharacterSkillFactory(
+            character=self.skillfarm_audit,
+            eve_type=self.skill_2,
+            trained_skill_level=5,
+        )
+        # when
+        result = CharacterSkill.objects.extractions(self.skillfarm_audit)
+        # then
+        self.assertEqual(list(result), [skill])
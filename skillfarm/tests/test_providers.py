@@ -1,9 +1,11 @@
 """Tests for the providers module."""
 
 # Standard Library
+import time
 from unittest.mock import MagicMock, patch
 
 # Django
+from django.core.cache.backends.locmem import LocMemCache
 from django.test import override_settings
 from django.utils import timezone
 
@@ -16,8 +18,15 @@ from esi.exceptions import (
 )
 
 # AA Skillfarm
-from skillfarm.errors import DownTimeError
-from skillfarm.providers import esi, retry_task_on_esi_error
+from skillfarm.errors import DownTimeError, ESICircuitOpenError
+from skillfarm.providers import (
+    ESICircuitBreaker,
+    ESIRateGovernor,
+    esi,
+    get_esi_downtime_countdown,
+    is_esi_daily_downtime,
+    retry_task_on_esi_error,
+)
 from skillfarm.tests import NoSocketsTestCase
 
 MODULE_PATH = "skillfarm.providers"
@@ -248,4 +257,209 @@ class TestRetryTaskOnESIError(NoSocketsTestCase):
             self.assertEqual(
                 str(call_kwargs["exc"]), str(DownTimeError("ESI is in daily downtime"))
             )
-            self.assertEqual(call_kwargs["countdown"], 603)
+            # Retried right after the downtime instead of a fixed timer
+            self.assertEqual(call_kwargs["countdown"], 604)
+
+
+@patch(MODULE_PATH + ".cache", new_callable=lambda: LocMemCache("governor", {}))
+class TestESIRateGovernor(NoSocketsTestCase):
+    """Tests for the ESIRateGovernor."""
+
+    def setUp(self):
+        super().setUp()
+        LocMemCache("governor", {}).clear()
+
+    def test_should_acquire_within_rate(self, __):
+        """
+        Test should acquire a slot without waiting while the bucket has tokens.
+        """
+        # given
+        governor = ESIRateGovernor(rate=2, error_budget_min=10)
+        # when
+        with patch(MODULE_PATH + ".time.sleep") as mock_sleep:
+            governor.acquire()
+            governor.acquire()
+        # then
+        mock_sleep.assert_not_called()
+
+    def test_should_wait_when_bucket_is_empty(self, __):
+        """
+        Test should wait for the next second when the bucket is empty.
+        """
+        # given
+        governor = ESIRateGovernor(rate=1, error_budget_min=10)
+        clock = [100.5]
+
+        def sleep(seconds):
+            clock[0] += seconds
+
+        # when
+        with patch(MODULE_PATH + ".time.time", side_effect=lambda: clock[0]):
+            with patch(MODULE_PATH + ".time.sleep", side_effect=sleep) as mock_sleep:
+                governor.acquire()
+                governor.acquire()
+        # then
+        mock_sleep.assert_called_once()
+        self.assertAlmostEqual(mock_sleep.call_args[0][0], 0.5)
+
+    def test_should_pause_on_low_error_budget(self, __):
+        """
+        Test should pause all requests when the error budget is nearly used up.
+        """
+        # given
+        governor = ESIRateGovernor(rate=0, error_budget_min=10)
+        # when
+        governor.update_from_headers(
+            {"X-ESI-Error-Limit-Remain": "5", "X-ESI-Error-Limit-Reset": "30"}
+        )
+        # then
+        with self.assertRaises(ESIErrorLimitException) as context:
+            governor.acquire()
+        self.assertGreater(context.exception.reset, 29)
+
+    def test_should_not_pause_with_error_budget_left(self, __):
+        """
+        Test should not pause requests while enough error budget is left.
+        """
+        # given
+        governor = ESIRateGovernor(rate=0, error_budget_min=10)
+        # when
+        governor.update_from_headers(
+            {"X-ESI-Error-Limit-Remain": "90", "X-ESI-Error-Limit-Reset": "30"}
+        )
+        # then
+        governor.acquire()
+        self.assertEqual(governor.get_pause(), 0)
+
+
+@patch(MODULE_PATH + ".cache", new_callable=lambda: LocMemCache("breaker", {}))
+class TestESICircuitBreaker(NoSocketsTestCase):
+    """Tests for the ESICircuitBreaker."""
+
+    def setUp(self):
+        super().setUp()
+        LocMemCache("breaker", {}).clear()
+        self.breaker = ESICircuitBreaker(threshold=2, cooldown=60, probe_interval=10)
+
+    def _fail(self):
+        with self.assertRaises(HTTPServerError):
+            with self.breaker.guard():
+                raise HTTPServerError(503, {}, b"")
+
+    def test_should_open_after_threshold(self, __):
+        """
+        Test should open the breaker after the threshold of outage errors.
+        """
+        # when
+        self._fail()
+        self.assertFalse(self.breaker.is_open())
+        self._fail()
+        # then
+        self.assertTrue(self.breaker.is_open())
+        with self.assertRaises(ESICircuitOpenError):
+            with self.breaker.guard():
+                self.fail("Request should not be sent")
+
+    def test_should_not_count_client_errors(self, __):
+        """
+        Test should not count errors which are no ESI outage.
+        """
+        # when
+        for _ in range(3):
+            with self.assertRaises(HTTPClientError):
+                with self.breaker.guard():
+                    raise HTTPClientError(404, {}, b"")
+        # then
+        self.assertFalse(self.breaker.is_open())
+
+    def test_should_admit_one_probe_when_half_open(self, __):
+        """
+        Test should admit one probe request per interval when half-open.
+        """
+        # given
+        self._fail()
+        self._fail()
+        # when
+        with patch(MODULE_PATH + ".time.time", return_value=time.time() + 61):
+            self.breaker.before_request()
+            # then
+            with self.assertRaises(ESICircuitOpenError) as context:
+                self.breaker.before_request()
+        self.assertEqual(context.exception.reset, 10)
+
+    def test_should_close_after_successful_probe(self, __):
+        """
+        Test should close the breaker after a successful probe.
+        """
+        # given
+        self._fail()
+        self._fail()
+        # when
+        with patch(MODULE_PATH + ".time.time", return_value=time.time() + 61):
+            with self.breaker.guard():
+                pass
+        # then
+        self.assertIsNone(LocMemCache("breaker", {}).get(self.breaker.STATE_KEY))
+        self.breaker.before_request()
+
+    def test_should_reopen_after_failed_probe(self, __):
+        """
+        Test should open the breaker again after a failed probe.
+        """
+        # given
+        self._fail()
+        self._fail()
+        # when
+        with patch(MODULE_PATH + ".time.time", return_value=time.time() + 61):
+            self._fail()
+        # then
+        self.assertTrue(self.breaker.is_open())
+
+    def test_should_retry_task_when_open(self, __):
+        """
+        Test should retry the task with the remaining open time.
+        """
+        # given
+        task = MagicMock()
+        task.request.retries = 0
+        task.retry = MagicMock(side_effect=Exception("Retry called"))
+        # when
+        with self.assertRaises(Exception):
+            with retry_task_on_esi_error(task):
+                raise ESICircuitOpenError(reset=30)
+        # then
+        self.assertEqual(task.retry.call_args[1]["countdown"], 31)
+
+
+class TestESIDailyDowntime(NoSocketsTestCase):
+    """Tests for the ESI daily downtime helpers."""
+
+    def setUp(self):
+        self.today = timezone.now()
+
+    def _now(self, hour, minute, second=0):
+        return self.today.replace(
+            hour=hour, minute=minute, second=second, microsecond=0
+        )
+
+    def test_should_detect_downtime(self):
+        with patch(MODULE_PATH + ".timezone.now") as mock_now:
+            for hour, minute, expected in [
+                (10, 59, False),
+                (11, 0, True),
+                (11, 15, True),
+                (11, 16, False),
+            ]:
+                mock_now.return_value = self._now(hour, minute)
+                with self.subTest(time=f"{hour}:{minute}"):
+                    self.assertEqual(is_esi_daily_downtime(), expected)
+
+    def test_should_return_countdown_until_downtime_end(self):
+        with patch(MODULE_PATH + ".timezone.now") as mock_now:
+            mock_now.return_value = self._now(11, 14, 30)
+            self.assertEqual(get_esi_downtime_countdown(), 31)
+
+    def test_should_return_no_countdown_outside_downtime(self):
+        with patch(MODULE_PATH + ".timezone.now") as mock_now:
+            mock_now.return_value = self._now(12, 0)
+            self.assertEqual(get_esi_downtime_countdown(), 0)
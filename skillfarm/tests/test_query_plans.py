@@ -0,0 +1,93 @@
+# Standard Library
+from unittest import skipUnless
+
+# Django
+from django.db import connection
+
+# Alliance Auth (External Libs)
+from eve_sde.models.types import ItemType as EveType
+
+# AA Skillfarm
+from skillfarm.models.skillfarmaudit import CharacterUpdateStatus
+from skillfarm.tests import SkillFarmTestCase
+from skillfarm.tests.testdata.factory import (
+    CharacterSkillFactory,
+    SkillFarmAuditFactory,
+    SkillFarmSetupFactory,
+)
+
+
+@skipUnless(
+    connection.vendor == "sqlite",
+    "The MySQL optimizer may choose another index or a full scan on small tables",
+)
+class TestHotFilterQueryPlans(SkillFarmTestCase):
+    """Query plan regression tests for the composite indexes of the hot filters."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.skillfarm_audit = SkillFarmAuditFactory(user=cls.user)
+        skills = list(EveType.objects.filter(group__category__id=16)[:100])
+        # A large skillset of mostly untrained skills, the extraction lookup
+        # then selects far fewer rows by level than by skill
+        for i, skill in enumerate(skills):
+            CharacterSkillFactory(
+                character=cls.skillfarm_audit,
+                eve_type=skill,
+                trained_skill_level=5 if i % 20 == 0 else i % 5,
+            )
+        SkillFarmSetupFactory(
+            character=cls.skillfarm_audit, skillset=[skill.name for skill in skills]
+        )
+
+    def assertUsesIndex(self, plan: str, *index_names: str):
+        """Assert that the query plan uses one of the given indexes."""
+        self.assertTrue(
+            any(index_name in plan for index_name in index_names),
+            f"None of {index_names} used by query plan: {plan}",
+        )
+
+    def test_skill_in_training_should_use_index(self):
+        """
+        Test should use the training index for the skill in training lookup.
+        """
+        # when
+        plan = self.skillfarm_audit.skillfarm_skillqueue.skill_in_training().explain()
+        # then
+        self.assertUsesIndex(plan, "skillfarm_sq_training_idx")
+
+    def test_skillqueue_extractions_should_use_index(self):
+        """
+        Test should use the extraction index for the skillqueue extraction lookup.
+        """
+        # when
+        plan = self.skillfarm_audit.skillfarm_skillqueue.extractions(
+            self.skillfarm_audit
+        ).explain()
+        # then
+        self.assertUsesIndex(plan, "skillfarm_sq_extraction_idx")
+
+    def test_skill_extractions_should_use_index(self):
+        """
+        Test should use the extraction index for the skill extraction lookup.
+        """
+        # when
+        plan = self.skillfarm_audit.skillfarm_skills.extractions(
+            self.skillfarm_audit
+        ).explain()
+        # then
+        self.assertUsesIndex(plan, "skillfarm_skill_extraction_idx")
+
+    def test_total_update_status_should_use_index(self):
+        """
+        Test should use the status index for the total update status.
+        """
+        # when
+        plan = (
+            CharacterUpdateStatus.objects.filter(character=self.skillfarm_audit)
+            .annotate_total_update_status()
+            .explain()
+        )
+        # then
+        self.assertUsesIndex(plan, "skillfarm_status_total_idx")
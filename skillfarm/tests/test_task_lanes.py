@@ -0,0 +1,33 @@
+# Standard Library
+from unittest.mock import patch
+
+# AA Skillfarm
+from skillfarm.helpers.task_lanes import TaskLane, get_lane_options, route_task
+from skillfarm.tests import NoSocketsTestCase
+
+MODULE_PATH = "skillfarm.helpers.task_lanes"
+
+
+@patch(
+    MODULE_PATH + ".app_settings.SKILLFARM_TASK_QUEUES",
+    {"interactive": "skillfarm_interactive", "prices": ""},
+)
+class TestTaskLanes(NoSocketsTestCase):
+    def test_should_return_queue_and_priority(self):
+        self.assertEqual(
+            get_lane_options(TaskLane.INTERACTIVE),
+            {"priority": 3, "queue": "skillfarm_interactive"},
+        )
+
+    def test_should_use_default_queue_without_configured_queue(self):
+        self.assertEqual(get_lane_options(TaskLane.SCHEDULED), {"priority": 7})
+        self.assertEqual(get_lane_options(TaskLane.PRICES), {"priority": 8})
+
+    def test_should_route_skillfarm_tasks(self):
+        self.assertEqual(
+            route_task("skillfarm.tasks.check_skillfarm_notifications", [], {}, {}),
+            {"priority": 5},
+        )
+
+    def test_should_not_route_other_tasks(self):
+        self.assertIsNone(route_task("eve_sde.tasks.check_for_sde_updates", [], {}, {}))
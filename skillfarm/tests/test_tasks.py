@@ -1,20 +1,29 @@
 # Standard Library
+from http import HTTPStatus
 from unittest.mock import patch
 
+# Third Party
+import pook
+
 # Django
 from django.db import models
 from django.db.utils import Error
 from django.test import override_settings
 from django.utils import timezone
 
+# Alliance Auth
+from allianceauth.eveonline.models import Token
+from esi.exceptions import ESIErrorLimitException
+
 # AA Skillfarm
 from skillfarm import tasks
 from skillfarm.models.helpers.update_manager import CharacterUpdateSection
 from skillfarm.models.prices import EveTypePrice
-from skillfarm.models.skillfarmaudit import SkillFarmAudit
+from skillfarm.models.skillfarmaudit import CharacterUpdateStatus, SkillFarmAudit
 from skillfarm.tests import SkillFarmTestCase
 from skillfarm.tests.testdata.factory import (
     CharacterSkillFactory,
+    CharacterSkillqueueEntryFactory,
     CharacterUpdateStatusFactory,
     EveTypePriceFactory,
     SkillFarmAuditFactory,
@@ -28,6 +37,7 @@ TASK_PATH = "skillfarm.tasks"
     CELERY_ALWAYS_EAGER=True,
     CELERY_EAGER_PROPAGATES_EXCEPTIONS=True,
 )
+@patch(TASK_PATH + ".update_characters_sections", spec=True)
 @patch(TASK_PATH + ".update_character", spec=True)
 class TestUpdateAllSkillfarm(SkillFarmTestCase):
     """Test the update_all_skillfarm task."""
@@ -38,16 +48,334 @@ class TestUpdateAllSkillfarm(SkillFarmTestCase):
 
         cls.skillfarm_audit = SkillFarmAuditFactory(user=cls.user)
 
-    def test_should_update_all_skillfarm(self, mock_update_all_skillfarm):
+    def _set_fresh_status(self, sections):
+        for section in sections:
+            CharacterUpdateStatusFactory(
+                character=self.skillfarm_audit,
+                section=section,
+                is_success=True,
+                error_message="",
+                has_token_error=False,
+                last_run_at=timezone.now(),
+                last_run_finished_at=timezone.now(),
+                last_update_at=timezone.now(),
+                last_update_finished_at=timezone.now(),
+            )
+
+    def test_should_update_all_skillfarm(
+        self, mock_update_character, mock_update_characters_sections
+    ):
         """
-            Test should start update_character for each SkillFarmAudit.
-        :return:
-        :rtype:
+        Test should start update_character for each SkillFarmAudit on force refresh.
         """
         # when
+        tasks.update_all_skillfarm(force_refresh=True)
+        # then
+        mock_update_character.apply_async.assert_called_once_with(
+            args=[self.skillfarm_audit.pk],
+            kwargs={"force_refresh": True},
+            countdown=0,
+            priority=7,
+        )
+        mock_update_characters_sections.apply_async.assert_not_called()
+
+    def test_should_queue_stale_sections_only(
+        self, mock_update_character, mock_update_characters_sections
+    ):
+        """
+        Test should queue only the stale sections as batch without update_character.
+        """
+        # given
+        self._set_fresh_status([CharacterUpdateSection.SKILLS])
+        # when
         tasks.update_all_skillfarm()
         # then
-        self.assertTrue(mock_update_all_skillfarm.apply_async.called)
+        mock_update_character.apply_async.assert_not_called()
+        mock_update_characters_sections.apply_async.assert_called_once_with(
+            args=[[CharacterUpdateSection.SKILLQUEUE], [self.skillfarm_audit.pk]],
+            kwargs={"force_refresh": False},
+            priority=7,
+            countdown=0,
+        )
+
+    @patch(TASK_PATH + ".app_settings.SKILLFARM_TASKS_BATCH_SIZE", 1)
+    def test_should_split_batches(
+        self, mock_update_character, mock_update_characters_sections
+    ):
+        """
+        Test should split the stale characters into batches.
+        """
+        # given
+        SkillFarmAuditFactory(user=self.superuser)
+        # when
+        tasks.update_all_skillfarm()
+        # then
+        self.assertEqual(mock_update_characters_sections.apply_async.call_count, 2)
+
+    def test_should_group_characters_by_stale_sections(
+        self, mock_update_character, mock_update_characters_sections
+    ):
+        """
+        Test should queue one batch per set of stale sections.
+        """
+        # given
+        skillfarm_audit_2 = SkillFarmAuditFactory(user=self.superuser)
+        self._set_fresh_status([CharacterUpdateSection.SKILLS])
+        # when
+        tasks.update_all_skillfarm()
+        # then
+        self.assertCountEqual(
+            [
+                call.kwargs["args"]
+                for call in mock_update_characters_sections.apply_async.call_args_list
+            ],
+            [
+                [[CharacterUpdateSection.SKILLQUEUE], [self.skillfarm_audit.pk]],
+                [CharacterUpdateSection.get_sections(), [skillfarm_audit_2.pk]],
+            ],
+        )
+
+    def test_should_mark_characters_without_token(
+        self, mock_update_character, mock_update_characters_sections
+    ):
+        """
+        Test should mark characters without token and not queue them.
+        """
+        # given
+        skillfarm_audit_2 = SkillFarmAuditFactory(user=self.superuser)
+        for token in Token.objects.filter(
+            character_id=skillfarm_audit_2.character.character_id
+        ):
+            token.scopes.clear()
+        # when
+        tasks.update_all_skillfarm()
+        # then
+        mock_update_characters_sections.apply_async.assert_called_once_with(
+            args=[CharacterUpdateSection.get_sections(), [self.skillfarm_audit.pk]],
+            kwargs={"force_refresh": False},
+            priority=7,
+            countdown=0,
+        )
+        statuses = skillfarm_audit_2.skillfarm_update_status.all()
+        self.assertEqual(len(statuses), 2)
+        self.assertTrue(all(status.has_token_error for status in statuses))
+
+    def test_should_mark_characters_with_expired_token(
+        self, mock_update_character, mock_update_characters_sections
+    ):
+        """
+        Test should mark characters whose token expired and can not be refreshed.
+        """
+        # given
+        skillfarm_audit_2 = SkillFarmAuditFactory(user=self.superuser)
+        Token.objects.filter(
+            character_id=skillfarm_audit_2.character.character_id
+        ).update(
+            created=timezone.now() - timezone.timedelta(days=1), refresh_token=None
+        )
+        # when
+        tasks.update_all_skillfarm()
+        # then
+        mock_update_characters_sections.apply_async.assert_called_once_with(
+            args=[CharacterUpdateSection.get_sections(), [self.skillfarm_audit.pk]],
+            kwargs={"force_refresh": False},
+            priority=7,
+            countdown=0,
+        )
+        statuses = skillfarm_audit_2.skillfarm_update_status.all()
+        self.assertTrue(all(status.has_token_error for status in statuses))
+
+    @patch(TASK_PATH + ".esi_breaker.is_open", return_value=True)
+    def test_should_not_queue_while_esi_breaker_is_open(
+        self, __, mock_update_character, mock_update_characters_sections
+    ):
+        """
+        Test should not queue any update while the ESI circuit breaker is open.
+        """
+        # when
+        tasks.update_all_skillfarm()
+        # then
+        mock_update_characters_sections.apply_async.assert_not_called()
+
+    @patch(TASK_PATH + ".get_esi_downtime_countdown", return_value=120)
+    def test_should_schedule_past_daily_downtime(
+        self, __, mock_update_character, mock_update_characters_sections
+    ):
+        """
+        Test should schedule the updates after ESI's daily downtime.
+        """
+        # when
+        tasks.update_all_skillfarm()
+        tasks.update_all_skillfarm(force_refresh=True)
+        # then
+        self.assertEqual(
+            mock_update_characters_sections.apply_async.call_args.kwargs["countdown"],
+            120,
+        )
+        self.assertEqual(
+            mock_update_character.apply_async.call_args.kwargs["countdown"], 120
+        )
+
+    def test_should_not_queue_fresh_characters(
+        self, mock_update_character, mock_update_characters_sections
+    ):
+        """
+        Test should not queue anything when all sections are fresh.
+        """
+        # given
+        self._set_fresh_status(CharacterUpdateSection.get_sections())
+        # when
+        tasks.update_all_skillfarm()
+        # then
+        mock_update_character.apply_async.assert_not_called()
+        mock_update_characters_sections.apply_async.assert_not_called()
+
+
+@override_settings(
+    CELERY_ALWAYS_EAGER=True,
+    CELERY_EAGER_PROPAGATES_EXCEPTIONS=True,
+)
+@patch(TASK_PATH + ".SkillFarmAudit.get_tokens")
+class TestUpdateCharactersSections(SkillFarmTestCase):
+    """Test the update_characters_sections task."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        cls.skillfarm_audit = SkillFarmAuditFactory(user=cls.user)
+        cls.skillfarm_audit_2 = SkillFarmAuditFactory(user=cls.superuser)
+        cls.token = cls.user.token_set.first()
+
+    def _tokens(self) -> dict:
+        return {
+            self.skillfarm_audit.pk: self.token,
+            self.skillfarm_audit_2.pk: self.token,
+        }
+
+    def _skills_response(self, skill_id: int) -> dict:
+        return {
+            "skills": [
+                {
+                    "skill_id": skill_id,
+                    "trained_skill_level": 5,
+                    "active_skill_level": 5,
+                    "skillpoints_in_skill": 256000,
+                },
+            ],
+            "total_sp": 75000000,
+            "unallocated_sp": 0,
+        }
+
+    @pook.on
+    @patch("skillfarm.helpers.esi_fetch.app_settings.SKILLFARM_ESI_CONCURRENCY", 1)
+    def test_should_update_all_characters(self, mock_get_tokens):
+        """
+        Test should store the skills and the update status for each character.
+        """
+        # given
+        mock_get_tokens.return_value = self._tokens()
+        for audit, skill_id in [
+            (self.skillfarm_audit, 1),
+            (self.skillfarm_audit_2, 2),
+        ]:
+            pook.get(
+                f"https://esi.evetech.net/characters/{audit.character.character_id}/skills",
+                reply=HTTPStatus.OK,
+                response_json=self._skills_response(skill_id),
+            )
+        # when
+        tasks.update_characters_sections(
+            [CharacterUpdateSection.SKILLS],
+            [self.skillfarm_audit.pk, self.skillfarm_audit_2.pk],
+            force_refresh=True,
+        )
+        # then
+        for audit, skill_id in [
+            (self.skillfarm_audit, 1),
+            (self.skillfarm_audit_2, 2),
+        ]:
+            self.assertEqual(
+                list(audit.skillfarm_skills.values_list("eve_type_id", flat=True)),
+                [skill_id],
+            )
+            status = CharacterUpdateStatus.objects.get(
+                character=audit, section=CharacterUpdateSection.SKILLS
+            )
+            self.assertTrue(status.is_success)
+            self.assertIsNotNone(status.last_update_finished_at)
+
+    @patch("skillfarm.helpers.esi_fetch.app_settings.SKILLFARM_ESI_CONCURRENCY", 1)
+    @patch(TASK_PATH + ".update_char_skills", spec=True)
+    @patch("skillfarm.managers.characterskill.SkillManager._fetch_esi_items")
+    def test_should_hand_over_characters_on_esi_error(
+        self, mock_fetch, mock_update_char_skills, mock_get_tokens
+    ):
+        """
+        Test should queue single character tasks after a retryable ESI error.
+        """
+        # given
+        mock_get_tokens.return_value = self._tokens()
+        mock_fetch.side_effect = ESIErrorLimitException(reset=60)
+        # when
+        tasks.update_characters_sections(
+            [CharacterUpdateSection.SKILLS],
+            [self.skillfarm_audit.pk, self.skillfarm_audit_2.pk],
+        )
+        # then
+        self.assertEqual(mock_fetch.call_count, 1)
+        self.assertEqual(mock_update_char_skills.apply_async.call_count, 2)
+
+    @patch("skillfarm.managers.characterskill.SkillManager._fetch_esi_items")
+    def test_should_record_error_per_character(self, mock_fetch, mock_get_tokens):
+        """
+        Test should record an error only for the failing character.
+        """
+        # given
+        mock_get_tokens.return_value = self._tokens()
+        mock_fetch.side_effect = [ValueError("Broken"), []]
+        # when
+        tasks.update_characters_sections(
+            [CharacterUpdateSection.SKILLS],
+            [self.skillfarm_audit.pk, self.skillfarm_audit_2.pk],
+        )
+        # then
+        statuses = dict(
+            CharacterUpdateStatus.objects.filter(
+                section=CharacterUpdateSection.SKILLS
+            ).values_list("character_id", "is_success")
+        )
+        self.assertEqual(len(statuses), 2)
+        self.assertEqual(sorted(statuses.values()), [False, True])
+        self.assertFalse(
+            CharacterUpdateStatus.objects.filter(
+                section=CharacterUpdateSection.SKILLS, last_run_finished_at=None
+            ).exists()
+        )
+
+    @patch("skillfarm.managers.characterskill.SkillManager._fetch_esi_items")
+    def test_should_skip_characters_without_token(self, mock_fetch, mock_get_tokens):
+        """
+        Test should mark characters without token and not fetch them.
+        """
+        # given
+        mock_get_tokens.return_value = {self.skillfarm_audit.pk: self.token}
+        mock_fetch.return_value = []
+        # when
+        tasks.update_characters_sections(
+            [CharacterUpdateSection.SKILLS],
+            [self.skillfarm_audit.pk, self.skillfarm_audit_2.pk],
+        )
+        # then
+        mock_fetch.assert_called_once()
+        self.assertEqual(
+            set(
+                self.skillfarm_audit_2.skillfarm_update_status.values_list(
+                    "has_token_error", flat=True
+                )
+            ),
+            {True},
+        )
 
 
 @override_settings(
@@ -102,6 +430,7 @@ class TestUpdateCharacter(SkillFarmTestCase):
             self.skillfarm_audit.character.character_name,
         )
 
+    @patch(TASK_PATH + ".app_settings.SKILLFARM_PARALLEL_SECTIONS", False)
     def test_update_character_should_update(self, mock_logger, mock_chain):
         """
         Test should update character if updates are needed.
@@ -123,6 +452,56 @@ class TestUpdateCharacter(SkillFarmTestCase):
         tasks.update_character(self.skillfarm_audit.pk)
         # then
         mock_chain.assert_called_once()
+        mock_chain.return_value.apply_async.assert_called_once_with(countdown=0)
+
+    @patch(TASK_PATH + ".update_char_skillqueue", spec=True)
+    @patch(TASK_PATH + ".update_char_skills", spec=True)
+    def test_update_character_should_run_sections_in_parallel(
+        self, mock_update_char_skills, mock_update_char_skillqueue, __, mock_chain
+    ):
+        """
+        Test should queue each section as independent task.
+        """
+        # when
+        tasks.update_character(self.skillfarm_audit.pk, force_refresh=True)
+        # then
+        mock_chain.assert_not_called()
+        for mock_task in [mock_update_char_skills, mock_update_char_skillqueue]:
+            mock_task.si.return_value.set.return_value.apply_async.assert_called_once_with(
+                countdown=0
+            )
+
+    @patch(TASK_PATH + ".update_char_skillqueue.apply_async")
+    def test_update_character_should_run_sections_if_one_is_rejected(
+        self, mock_skillqueue_apply_async, __, mock_chain
+    ):
+        """
+        Test should still queue the other sections when the once lock of a section is held.
+        """
+        # given
+        once_backend = tasks.update_char_skills.once_backend
+        lock_key = tasks.update_char_skills.get_key(
+            kwargs={"character_pk": self.skillfarm_audit.pk, "force_refresh": True}
+        )
+        once_backend.clear_lock(lock_key)
+        once_backend.raise_or_lock(lock_key, timeout=60)
+        self.addCleanup(once_backend.clear_lock, lock_key)
+        # when
+        tasks.update_character(self.skillfarm_audit.pk, force_refresh=True)
+        # then
+        mock_skillqueue_apply_async.assert_called_once()
+
+    @patch(TASK_PATH + ".app_settings.SKILLFARM_PARALLEL_SECTIONS", False)
+    def test_update_character_should_chain_sections_when_disabled(
+        self, mock_logger, mock_chain
+    ):
+        """
+        Test should queue the sections as chain when parallel sections are disabled.
+        """
+        # when
+        tasks.update_character(self.skillfarm_audit.pk, force_refresh=True)
+        # then
+        mock_chain.assert_called_once()
 
 
 @patch(TASK_PATH + ".SkillFarmAudit.objects.filter", spec=True)
@@ -191,6 +570,7 @@ class TestCheckSkillfarmNotification(SkillFarmTestCase):
             character=self.skillfarm_audit,
             skillset=[skill.eve_type.name],
         )
+        self.skillfarm_audit.extraction_ready_count = 1
 
         audits = [self.skillfarm_audit]
         self._set_notification_status(audits, True)
@@ -206,6 +586,78 @@ class TestCheckSkillfarmNotification(SkillFarmTestCase):
             self.assertTrue(audit.notification_sent)
             self.assertIsNotNone(audit.last_notification)
 
+    def test_should_not_query_characters_without_ready_skills(self, mock_audit_filter):
+        """
+        Test should not query the skills of characters without extraction ready skills.
+        """
+        # given
+        self.skillfarm_audit.extraction_ready_count = 0
+        self.skillfarm_audit.extraction_ready_in_queue = 0
+        self.skillfarm_audit.queue_finish_at = None
+        self.skillfarm_audit.notification_sent = False
+        audits = [self.skillfarm_audit]
+        self._set_notification_status(audits, True)
+        mock_audit_filter.return_value = audits
+        # when
+        with patch(
+            TASK_PATH + "._get_extraction_skill_names",
+            wraps=tasks._get_extraction_skill_names,
+        ) as mock_get_extraction_skill_names:
+            tasks.check_skillfarm_notifications()
+        # then
+        mock_get_extraction_skill_names.assert_called_once_with([])
+        self.assertFalse(self.skillfarm_audit.notification_sent)
+
+    def test_should_notify_queue_skills_finished_after_the_last_update(
+        self, mock_audit_filter
+    ):
+        """
+        Test should notify skills of the skillqueue that finished after the farm state was computed.
+        """
+        # given
+        now = timezone.now()
+        entry = CharacterSkillqueueEntryFactory(
+            character=self.skillfarm_audit,
+            start_date=now - timezone.timedelta(days=2),
+            finish_date=now - timezone.timedelta(hours=1),
+            finished_level=5,
+        )
+        SkillFarmSetupFactory(
+            character=self.skillfarm_audit, skillset=[entry.eve_type.name]
+        )
+        # Farm state of the last update, before the skill finished
+        self.skillfarm_audit.extraction_ready_count = 0
+        self.skillfarm_audit.extraction_ready_in_queue = 0
+        self.skillfarm_audit.queue_finish_at = entry.finish_date
+        self.skillfarm_audit.notification_sent = False
+        audits = [self.skillfarm_audit]
+        self._set_notification_status(audits, True)
+        mock_audit_filter.return_value = audits
+        # when
+        tasks.check_skillfarm_notifications()
+        # then
+        self.assertTrue(self.skillfarm_audit.notification_sent)
+        self.assertIsNotNone(self.skillfarm_audit.last_notification)
+
+    def test_should_load_skill_names_of_all_characters_at_once(self, mock_audit_filter):
+        """
+        Test should load the extraction ready skills of all characters with a constant number of queries.
+        """
+        # given
+        expected = {}
+        for audit in [self.skillfarm_audit, self.skillfarm_audit_3]:
+            skill = CharacterSkillFactory(character=audit, trained_skill_level=5)
+            CharacterSkillFactory(character=audit, trained_skill_level=4)
+            SkillFarmSetupFactory(character=audit, skillset=[skill.eve_type.name])
+            expected[audit.pk] = [skill.eve_type.name]
+        # when
+        with self.assertNumQueries(2):
+            skill_names = tasks._get_extraction_skill_names(
+                [self.skillfarm_audit, self.skillfarm_audit_3]
+            )
+        # then
+        self.assertEqual(skill_names, expected)
+
     @patch(TASK_PATH + ".logger", spec=True)
     def test_notifiaction_no_main_should_return_false(
         self, mock_logger, mock_audit_filter
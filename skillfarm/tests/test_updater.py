@@ -14,6 +14,7 @@ from skillfarm.models.general import UpdateSectionResult, _NeedsUpdate
 from skillfarm.models.helpers.update_manager import (
     CharacterUpdateSection,
     UpdateManager,
+    get_payload_digest,
 )
 from skillfarm.models.skillfarmaudit import CharacterUpdateStatus
 from skillfarm.tests import SkillFarmTestCase
@@ -217,6 +218,62 @@ class TestUpdateManager(SkillFarmTestCase):
         self.assertFalse(result.is_changed)
         self.assertFalse(result.is_updated)
 
+    def test_update_section_if_changed_same_payload(self):
+        """
+        Test the update_section_if_changed method skips an unchanged payload.
+        """
+        # Test Data
+        self.audit = SkillFarmAuditFactory(user=self.user)
+        manager = self.updater(
+            character=self.audit,
+            update_section=CharacterUpdateSection,
+            update_status=CharacterUpdateStatus,
+        )
+        CharacterUpdateStatusFactory(
+            character=self.audit,
+            section=CharacterUpdateSection.SKILLS,
+            error_message="",
+            payload_digest=get_payload_digest({"key": "value"}),
+        )
+
+        def mock_fetch_func(character=None, force_refresh=False):
+            return {"key": "value"}
+
+        # Test Action
+        result = manager.update_section_if_changed(
+            section=CharacterUpdateSection.SKILLS,
+            fetch_func=mock_fetch_func,
+            force_refresh=True,
+        )
+
+        # Expected Results
+        self.assertFalse(result.is_changed)
+        self.assertFalse(result.is_updated)
+        self.assertIsNone(result.data)
+
+    def test_update_section_log_should_store_payload_digest(self):
+        """
+        Test the update_section_log method stores the digest of a changed payload.
+        """
+        # Test Data
+        self.audit = SkillFarmAuditFactory(user=self.user)
+        manager = self.updater(
+            character=self.audit,
+            update_section=CharacterUpdateSection,
+            update_status=CharacterUpdateStatus,
+        )
+        result = UpdateSectionResult(
+            is_changed=True, is_updated=True, payload_digest="abc"
+        )
+
+        # Test Action
+        manager.update_section_log(CharacterUpdateSection.SKILLS, result)
+
+        # Expected Results
+        self.assertEqual(
+            manager.get_payload_digest(CharacterUpdateSection.SKILLS), "abc"
+        )
+
     def test_update_section_log_is_updated(self):
         """
         Test the update_section_log method for an updated section.
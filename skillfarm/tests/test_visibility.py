@@ -0,0 +1,158 @@
+# Standard Library
+from unittest.mock import patch
+
+# Django
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache.backends.locmem import LocMemCache
+
+# AA Skillfarm
+from skillfarm.helpers.visibility import VisibilityScope, VisibilityScopeCache
+from skillfarm.models.skillfarmaudit import SkillFarmAudit
+from skillfarm.tests import SkillFarmTestCase
+from skillfarm.tests.testdata.factory import EveCharacterFactory, UserMainFactory
+from skillfarm.tests.testdata.utils import add_alt_character_to_user
+
+MODULE_PATH = "skillfarm.helpers.visibility"
+
+
+def patch_local_cache(test_case: SkillFarmTestCase) -> None:
+    """Replace the Django cache with an empty local memory cache."""
+    local_cache = LocMemCache("visibility", {})
+    local_cache.clear()
+    patcher = patch(MODULE_PATH + ".cache", local_cache)
+    patcher.start()
+    test_case.addCleanup(patcher.stop)
+
+
+class TestVisibilityScope(SkillFarmTestCase):
+    def test_should_compute_owned_characters(self):
+        """
+        Test should compute the owned characters of a user without corporation access.
+        """
+        # given
+        character = EveCharacterFactory()
+        add_alt_character_to_user(user=self.user, character_id=character.character_id)
+        # when
+        scope = VisibilityScopeCache.compute(self.user)
+        # then
+        self.assertEqual(
+            scope,
+            VisibilityScope(
+                character_ids=frozenset(
+                    [self.user_character.character_id, character.character_id]
+                )
+            ),
+        )
+
+    def test_should_compute_see_all_for_superuser(self):
+        """
+        Test should let superusers see all characters.
+        """
+        self.assertTrue(VisibilityScopeCache.compute(self.superuser).see_all)
+
+    def test_should_filter_nothing_without_characters(self):
+        """
+        Test should filter all rows for an empty scope.
+        """
+        # given
+        scope = VisibilityScope()
+        # when/then
+        self.assertFalse(scope.filter(SkillFarmAudit.objects.all()).exists())
+
+
+@patch(MODULE_PATH + ".app_settings.SKILLFARM_VISIBILITY_CACHE_TIMEOUT", 60)
+class TestVisibilityScopeCache(SkillFarmTestCase):
+    def setUp(self):
+        super().setUp()
+        patch_local_cache(self)
+        self.visibility_cache = VisibilityScopeCache()
+        self.corp_access = Permission.objects.get(
+            content_type__app_label="skillfarm", codename="corp_access"
+        )
+
+    def _get_scope(self, user):
+        # Load the user again, like a new request does
+        return self.visibility_cache.get(User.objects.get(pk=user.pk))
+
+    def test_should_serve_cached_scope(self):
+        """
+        Test should compute the scope once and serve it without queries.
+        """
+        # given
+        scope = self._get_scope(self.user)
+        user = User.objects.get(pk=self.user.pk)
+        # when/then
+        with self.assertNumQueries(0):
+            self.assertEqual(self.visibility_cache.get(user), scope)
+
+    def test_should_invalidate_on_new_character(self):
+        """
+        Test should add a newly owned character to the scope.
+        """
+        # given
+        self._get_scope(self.user)
+        character = EveCharacterFactory()
+        # when
+        add_alt_character_to_user(user=self.user, character_id=character.character_id)
+        # then
+        self.assertIn(character.character_id, self._get_scope(self.user).character_ids)
+
+    def test_should_invalidate_on_user_permission(self):
+        """
+        Test should add the corporation after the user got corporation access.
+        """
+        # given
+        self._get_scope(self.user)
+        # when
+        self.user.user_permissions.add(self.corp_access)
+        # then
+        self.assertEqual(
+            self._get_scope(self.user).corporation_ids,
+            frozenset([self.user_character.corporation_id]),
+        )
+
+    def test_should_invalidate_all_on_group_permission(self):
+        """
+        Test should recompute the scope of all users when a group permission changes.
+        """
+        # given
+        group = Group.objects.create(name="Skillfarm Corp")
+        self.user.groups.add(group)
+        self._get_scope(self.user)
+        # when
+        group.permissions.add(self.corp_access)
+        # then
+        self.assertEqual(
+            self._get_scope(self.user).corporation_ids,
+            frozenset([self.user_character.corporation_id]),
+        )
+
+    def test_should_invalidate_on_main_character_change(self):
+        """
+        Test should recompute the scope when the main character is removed.
+        """
+        # given
+        self._get_scope(self.user)
+        # when
+        self.user.profile.main_character = None
+        self.user.profile.save()
+        # then
+        self.assertEqual(self._get_scope(self.user), VisibilityScope())
+
+    def test_should_not_cache_when_disabled(self):
+        """
+        Test should compute the scope on every call when the cache is disabled.
+        """
+        # given
+        user = UserMainFactory(permissions__=["skillfarm.basic_access"])
+        self._get_scope(user)
+        character = EveCharacterFactory()
+        # when
+        with patch(MODULE_PATH + ".app_settings.SKILLFARM_VISIBILITY_CACHE_TIMEOUT", 0):
+            with patch(MODULE_PATH + ".visibility_cache.invalidate"):
+                add_alt_character_to_user(
+                    user=user, character_id=character.character_id
+                )
+            scope = self._get_scope(user)
+        # then
+        self.assertIn(character.character_id, scope.character_ids)
@@ -64,3 +64,23 @@ class TestAddCharView(SkillFarmTestCase):
                 character__character_id=self.user.profile.main_character.character_id
             ).exists()
         )
+
+    @patch(
+        "skillfarm.helpers.task_lanes.app_settings.SKILLFARM_TASK_QUEUES",
+        {"interactive": "skillfarm_interactive"},
+    )
+    def test_add_char_should_queue_interactive(self, mock_tasks, mock_messages):
+        """
+        Test should queue the first update in the interactive lane.
+        """
+        # given
+        token = self.user.token_set.get(
+            character_id=self.user.profile.main_character.character_id
+        )
+        # when
+        self._add_character(self.user, token)
+        # then
+        call_kwargs = mock_tasks.update_character.apply_async.call_args.kwargs
+        self.assertEqual(call_kwargs["queue"], "skillfarm_interactive")
+        self.assertEqual(call_kwargs["priority"], 3)
+        self.assertEqual(call_kwargs["kwargs"]["lane"], "interactive")
@@ -85,6 +85,8 @@ class TestSkillSetView(SkillFarmTestCase):
             response_data["message"],
             f"{self.skillfarm_audit.character.character_name} Skillset successfully updated",
         )
+        self.skillfarm_audit.refresh_from_db()
+        self.assertTrue(self.skillfarm_audit.has_skillset)
 
     def test_skillset_no_permission(self):
         """
@@ -11,6 +11,7 @@ from allianceauth.eveonline.models import EveCharacter
 # AA Skillfarm
 from skillfarm import __app_name__
 from skillfarm.app_settings import SKILLFARM_APP_NAME
+from skillfarm.helpers.task_lanes import TaskLane, get_lane_options
 from skillfarm.models.skillfarmaudit import SkillFarmAudit
 from skillfarm.tasks import update_character
 
@@ -21,9 +22,12 @@ def _add_character_charaudit(request, token):
         character=EveCharacter.objects.get_character_by_id(token.character_id),
         defaults={"name": token.character_name},
     )[0]
+    SkillFarmAudit.objects.filter(pk=skillfarm.pk).invalidate_api_cache()
 
     update_character.apply_async(
-        args=[skillfarm.pk], kwargs={"force_refresh": True}, priority=6
+        args=[skillfarm.pk],
+        kwargs={"force_refresh": True, "lane": TaskLane.INTERACTIVE},
+        **get_lane_options(TaskLane.INTERACTIVE),
     )
 
 
@@ -20,6 +20,7 @@ from esi.decorators import token_required
 # AA Skillfarm
 from skillfarm import __title__, forms, tasks
 from skillfarm.api.helpers.core import get_skillfarm_character
+from skillfarm.helpers.task_lanes import TaskLane, get_lane_options
 from skillfarm.models.prices import EveTypePrice
 from skillfarm.models.skillfarmaudit import SkillFarmAudit, SkillFarmSetup
 from skillfarm.providers import AppLogger
@@ -67,7 +68,8 @@ def admin(request):
         if request.POST.get("run_char_updates"):
             messages.info(request, _("Queued Update All Characters"))
             update_all_skillfarm.apply_async(
-                kwargs={"force_refresh": force_refresh}, priority=7
+                kwargs={"force_refresh": force_refresh},
+                **get_lane_options(TaskLane.SCHEDULED),
             )
     return render(request, "skillfarm/admin.html", context=context)
 
@@ -91,7 +93,12 @@ def add_char(request, token):
     char = SkillFarmAudit.objects.update_or_create(
         character=character, defaults={"name": token.character_name}
     )[0]
-    tasks.update_character.apply_async(args=[char.pk], kwargs={"force_refresh": True})
+    SkillFarmAudit.objects.filter(pk=char.pk).invalidate_api_cache()
+    tasks.update_character.apply_async(
+        args=[char.pk],
+        kwargs={"force_refresh": True, "lane": TaskLane.INTERACTIVE},
+        **get_lane_options(TaskLane.INTERACTIVE),
+    )
 
     msg = format_lazy(
         _("{character_name} successfully added or updated to Skillfarm System"),
@@ -114,6 +121,7 @@ def switch_notification(request, character_id: int):
     character = SkillFarmAudit.objects.get(character__character_id=character_id)
     character.notification = not character.notification
     character.save()
+    SkillFarmAudit.objects.filter(pk=character.pk).invalidate_api_cache()
     msg = _("Notification successfully updated")
     return JsonResponse({"success": True, "message": msg}, status=200, safe=False)
 
@@ -130,6 +138,7 @@ def delete_character(request, character_id: int):
         return JsonResponse({"success": False, "message": msg}, status=403, safe=False)
 
     character = SkillFarmAudit.objects.get(character__character_id=character_id)
+    SkillFarmAudit.objects.filter(pk=character.pk).invalidate_api_cache()
     character.delete()
     msg = format_lazy(
         _("{character_name} successfully deleted"),
@@ -152,6 +161,7 @@ def mark_as_read(request, character_id: int):
     character = SkillFarmAudit.objects.get(character__character_id=character_id)
     character.is_read = not character.is_read
     character.save()
+    SkillFarmAudit.objects.filter(pk=character.pk).invalidate_api_cache()
     msg = format_lazy(
         _("{character_name} successfully toggled Mark as Read"),
         character_name=character.character.character_name,
@@ -177,6 +187,8 @@ def edit_skillsetup(request, character_id: int):
     SkillFarmSetup.objects.update_or_create(
         character=character, defaults={"skillset": skillset_list}
     )
+    SkillFarmAudit.objects.filter(pk=character.pk).update_farm_state()
+    SkillFarmAudit.objects.filter(pk=character.pk).invalidate_api_cache()
 
     msg = format_lazy(
         _("{character_name} Skillset successfully updated"),